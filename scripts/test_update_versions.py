@@ -0,0 +1,762 @@
+"""Testes do update_versions.py (python -m pytest scripts -q)"""
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from aiohttp.test_utils import make_mocked_request
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import update_versions  # noqa: E402
+
+
+def test_single_flight_waiter_cancelled_keeps_shared_result():
+    """Cancelar um aguardante não cancela o resultado do dono nem dos demais"""
+    async def scenario():
+        flight = update_versions.SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "ok"
+
+        url = "https://example.invalid/file.zip"
+        owner = asyncio.ensure_future(flight.run("HEAD", url, factory))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(flight.run("HEAD", url, factory))
+        waiter = asyncio.ensure_future(flight.run("HEAD", url, factory))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        release.set()
+
+        assert await owner == "ok"
+        assert await waiter == "ok"
+        assert cancelled.cancelled()
+        assert calls == 1
+
+    asyncio.run(scenario())
+
+
+class CountingSet(set):
+    """Conjunto que conta as consultas de pertinência"""
+    lookups = 0
+
+    def __contains__(self, item):
+        CountingSet.lookups += 1
+        return super().__contains__(item)
+
+
+def test_invalid_url_filter_scales_to_50k_results():
+    """Filtro por conjunto: 50 mil resultados e 50 mil entradas do provider, uma consulta por entrada"""
+    count = 50_000
+    cs_content = [{'version': f"1.{i // 100}.{i % 100}", 'url': f"https://example.invalid/{i}.zip"} for i in range(count)]
+    results = {}
+    for i, item in enumerate(cs_content):
+        result = update_versions.UrlCheckResult(item['url'])
+        result.is_valid = i % 10 != 0
+        result.is_unknown = i % 20 == 0
+        results[item['url']] = result
+
+    invalid = CountingSet(update_versions.invalid_result_urls(results))
+    CountingSet.lookups = 0
+    kept = update_versions.remove_entries(cs_content, invalid)
+
+    assert len(invalid) == count // 20
+    assert len(kept) == count - count // 20
+    assert CountingSet.lookups == count
+
+
+def test_failure_cache_rewrite_scales_to_50k_entries(tmp_path, monkeypatch):
+    """Regravação do cache de falhas com 50 mil entradas atualiza cada entrada no lugar"""
+    monkeypatch.setattr(update_versions, "CACHE_PATH", tmp_path)
+    count = 50_000
+    failures = [{'version': f"1.{i // 100}.{i % 100}", 'url': f"https://example.invalid/{i}.zip",
+                 'ErrorClass': 'http', 'StatusCode': 404} for i in range(count)]
+
+    update_versions.save_failed_versions_cache("scale", failures)
+    update_versions.save_failed_versions_cache("scale", failures[::-1])
+
+    entries = update_versions.load_failed_versions_file("scale")
+    assert len(entries) == count
+    assert [entry['Url'] for entry in entries] == [failure['url'] for failure in failures]
+    assert all(entry['Attempts'] == 2 for entry in entries)
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    """Caches, histórico e estado da execução em um diretório temporário"""
+    for name, file_name in (("CACHE_PATH", ""), ("HISTORY_DB_FILE", "history.sqlite3"),
+                            ("REDIRECT_CACHE_FILE", "redirects.json"), ("RUN_JOURNAL_FILE", "journal.jsonl"),
+                            ("LISTING_CACHE_FILE", "listings.json")):
+        monkeypatch.setattr(update_versions, name, tmp_path / file_name if file_name else tmp_path)
+    monkeypatch.setattr(update_versions, "_validation_history", None)
+    monkeypatch.setattr(update_versions, "_redirect_cache", None)
+    monkeypatch.setattr(update_versions, "_listing_cache", None)
+    monkeypatch.setattr(update_versions, "_single_flight", update_versions.SingleFlight())
+    update_versions.apply_network_profile()
+    update_versions.set_run_deadline(update_versions.RunDeadline())
+    yield tmp_path
+    if update_versions._validation_history:
+        update_versions._validation_history.close()
+
+
+def test_results_keyed_by_url_in_original_order(isolated, monkeypatch):
+    """Resultados por URL, na ordem original; URLs repetidas são verificadas uma vez"""
+    calls = []
+
+    async def fake_check(url):
+        calls.append(url)
+        result = update_versions.UrlCheckResult(url)
+        result.is_valid = True
+        result.status_code = 200
+        return result
+
+    monkeypatch.setattr(update_versions, "_test_url_valid_async", fake_check)
+    urls = [f"https://example.invalid/{i}.zip" for i in (3, 1, 2, 1, 3, 0)]
+
+    results = asyncio.run(update_versions.test_urls_parallel_async(urls))
+
+    assert list(results) == [f"https://example.invalid/{i}.zip" for i in (3, 1, 2, 0)]
+    assert all(url == result.url and result.is_valid for url, result in results.items())
+    assert sorted(calls) == sorted(set(urls))
+
+
+def test_confirm_failures_stops_at_dead_host(monkeypatch):
+    """Host sem resposta na confirmação: abre o circuito e as URLs restantes ficam desconhecidas"""
+    update_versions.apply_network_profile()
+    calls = []
+
+    async def fake_confirm(url):
+        calls.append(url)
+        result = update_versions.UrlCheckResult(url)
+        result.error_class = "timeout"
+        result.status_code = 408
+        return result
+
+    monkeypatch.setattr(update_versions, "_confirm_url", fake_confirm)
+    failures = []
+    for i in range(6):
+        result = update_versions.UrlCheckResult(f"https://dead.invalid/{i}.zip")
+        result.error_class = "timeout"
+        failures.append(result)
+
+    confirmed = asyncio.run(update_versions.confirm_failures(failures))
+
+    assert len(calls) == 2
+    assert len(confirmed) == 6
+    assert all(confirmed[f"https://dead.invalid/{i}.zip"].is_unknown for i in range(2, 6))
+    assert update_versions.get_host_limiter().breaker.has_tripped("dead.invalid")
+
+
+def test_validate_urls_stream_keeps_queue_bounded_for_lists(monkeypatch):
+    """Listas em memória não entram inteiras na fila justa"""
+    update_versions.apply_network_profile()
+    sizes = []
+    original_put = update_versions.HostFairQueue.put
+
+    async def tracking_put(self, url):
+        await original_put(self, url)
+        sizes.append((self._size, self.pull_ahead_size))
+
+    async def fake_check(url):
+        await asyncio.sleep(0)
+        result = update_versions.UrlCheckResult(url)
+        result.is_valid = True
+        return result
+
+    monkeypatch.setattr(update_versions.HostFairQueue, "put", tracking_put)
+    monkeypatch.setattr(update_versions, "test_url_valid_async", fake_check)
+    urls = [f"https://a.invalid/{i}.zip" for i in range(2000)] + [f"https://b.invalid/{i}.zip" for i in range(2000)]
+    seen = []
+
+    stats = asyncio.run(update_versions.validate_urls_stream(urls, lambda result: seen.append(result.url)))
+
+    assert stats['valid'] == len(urls)
+    assert sorted(seen) == sorted(urls)
+    assert max(size for size, _ in sizes) <= sizes[0][1] < len(urls)
+
+
+def test_iter_json_array_yields_elements_as_they_arrive():
+    """Array JSON interpretado aos poucos, qualquer que seja a quebra das linhas"""
+    text = '[\n{"version": "v2.0.0"},\n{"version": "v1.0.0", "files": ["win-x64-zip"]}\n]\n'
+    for size in (1, 3, len(text)):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert list(update_versions.iter_json_array(chunks)) == [
+            {"version": "v2.0.0"}, {"version": "v1.0.0", "files": ["win-x64-zip"]}]
+
+    consumed = []
+
+    def lines():
+        for line in text.splitlines(keepends=True):
+            consumed.append(line)
+            yield line
+
+    first = next(update_versions.iter_json_array(lines()))
+    assert first == {"version": "v2.0.0"}
+    assert len(consumed) == 2
+
+
+def test_iter_github_releases_fetches_pages_on_demand(monkeypatch):
+    """Páginas da API do GitHub só são baixadas quando a anterior foi consumida"""
+    per_page = update_versions.GITHUB_RELEASES_PER_PAGE
+    fetched = []
+
+    def fake_fetch(url, timeout=None):
+        fetched.append(url)
+        page = int(url.rsplit("page=", 1)[1])
+        releases = [{"tag_name": f"v{page}.{i}.0", "prerelease": i == 0} for i in range(per_page)]
+        return json.dumps(releases).encode("utf-8"), None, 200
+
+    monkeypatch.setattr(update_versions, "fetch_github_releases", fake_fetch)
+    monkeypatch.setattr(update_versions.time, "sleep", lambda seconds: None)
+
+    releases = update_versions.iter_github_releases("https://api.github.invalid/releases")
+    assert next(releases)["tag_name"] == "v1.1.0"
+    assert len(fetched) == 1
+
+    remaining = list(releases)
+    assert len(fetched) == update_versions.GITHUB_RELEASES_MAX_PAGES
+    assert len(remaining) == update_versions.GITHUB_RELEASES_MAX_PAGES * (per_page - 1) - 1
+
+
+def test_checksums_skip_artifacts_on_unreachable_hosts(monkeypatch):
+    """Artefatos com HEAD desconhecido ou circuito aberto não são baixados e contam como não verificados"""
+    update_versions.apply_network_profile()
+    downloads = []
+
+    async def fake_head(url):
+        if "down" in url:
+            return update_versions.circuit_open_result(url)
+        result = update_versions.UrlCheckResult(url)
+        result.is_valid = True
+        result.status_code = 200
+        return result
+
+    async def fake_hash(url, bandwidth):
+        downloads.append(url)
+        return "ab" * 32, 10, {}, ""
+
+    monkeypatch.setattr(update_versions, "test_url_valid_async", fake_head)
+    monkeypatch.setattr(update_versions, "hash_remote_artifact", fake_hash)
+    versions = [{'version': "1.0.0", 'url': "https://down.invalid/1.zip"},
+                {'version': "2.0.0", 'url': "https://up.invalid/2.zip"}]
+    manifest = {'components': {'demo': {"1.0.0": {'url': "https://down.invalid/1.zip", 'sha256': "cd" * 32}}}}
+
+    stats = asyncio.run(update_versions.verify_component_checksums(
+        "demo", versions, manifest, update_versions.BandwidthLimiter()))
+
+    assert downloads == ["https://up.invalid/2.zip"]
+    assert stats['unverified'] == 1 and stats['hashed'] == 1
+    assert manifest['components']['demo']["1.0.0"]['sha256'] == "cd" * 32
+
+
+def test_speculative_probes_respect_circuit_and_failure_cache(isolated, monkeypatch):
+    """Sondagens especulativas passam pelo caminho assíncrono: circuito aberto e cache de falhas são respeitados"""
+    template = update_versions.SPECULATIVE_URL_TEMPLATES["python"]
+    calls = []
+
+    async def fake_check(url):
+        calls.append(url)
+        update_versions.get_host_limiter().breaker.trip(update_versions.host_of(url))
+        result = update_versions.UrlCheckResult(url)
+        result.is_valid = True
+        return result
+
+    async def discover():
+        loop = asyncio.get_event_loop()
+        probe = update_versions.speculative_probe(loop, "python")
+        versions = update_versions.iter_speculative_versions("python", [{'version': "3.12.0"}], probe)
+        return await loop.run_in_executor(None, list, versions)
+
+    monkeypatch.setattr(update_versions, "test_url_valid_async", fake_check)
+    update_versions.save_failed_versions_cache("python", [
+        {'version': "3.12.1", 'url': template("3.12.1"), 'ErrorClass': 'http', 'StatusCode': 404}])
+
+    found = asyncio.run(discover())
+
+    assert calls == [template("3.13.0")]
+    assert found == [{'version': "3.13.0", 'url': template("3.13.0")}]
+
+
+def test_backup_catalog_keeps_pre_restore_under_component(tmp_path, monkeypatch):
+    """Backups pré-restauração ficam no componente real com o tipo; entradas sem arquivo saem da listagem"""
+    monkeypatch.setattr(update_versions, "BACKUP_PATH", tmp_path)
+    monkeypatch.setattr(update_versions, "AVAILABLE_VERSIONS_PATH", tmp_path / "providers")
+    monkeypatch.setattr(update_versions, "_backup_catalog", None)
+    catalog_file = tmp_path / "backup_catalog.jsonl"
+    monkeypatch.setattr(update_versions, "BACKUP_CATALOG_FILE", catalog_file)
+    for name in ("php.json_20240101_120000.bak", "php.json_pre_restore_20240102_120000.bak",
+                 "php.json_20240103_120000.bak"):
+        (tmp_path / name).write_text("[]", encoding="utf-8")
+    # Registro antigo: pré-restauração gravado como componente próprio
+    legacy = {'op': 'add', 'FileName': "php.json_pre_restore_20240102_120000.bak",
+              'Component': "php.json_pre_restore", 'Timestamp': 0.0, 'SizeBytes': 2, 'Source': "php.json"}
+    catalog_file.write_text(json.dumps(legacy) + "\n", encoding="utf-8")
+    catalog = update_versions.get_backup_catalog()
+    catalog.add(tmp_path / "php.json_20240101_120000.bak", "php.json")
+    catalog.add(tmp_path / "php.json_20240103_120000.bak", "php.json")
+    (tmp_path / "php.json_20240103_120000.bak").unlink()
+
+    update_versions.show_backup_info("php")
+
+    backups = update_versions.get_backup_info("php")
+    assert {backup['Component'] for backup in backups} == {"php.json"}
+    assert sorted((backup['FileName'], backup['Kind']) for backup in backups) == [
+        ("php.json_20240101_120000.bak", "update"), ("php.json_pre_restore_20240102_120000.bak", "pre_restore")]
+
+
+def test_network_profiles_only_override_defaults():
+    """Perfis do arquivo só trazem o que difere dos padrões do NetworkProfile"""
+    config = json.loads(update_versions.NETWORK_CONFIG_FILE.read_text(encoding="utf-8"))
+    defaults = update_versions.NetworkProfile.DEFAULTS
+    for name, values in config['profiles'].items():
+        redundant = [key for key, value in values.items()
+                     if key in defaults and json.dumps(value) == json.dumps(defaults[key])]
+        assert not redundant, f"{name}: {redundant}"
+
+        profile = update_versions.load_network_profile(name)
+        assert set(defaults) <= set(profile.values)
+        assert profile.for_host("example.invalid").confirm_total_timeout == defaults['confirm_total_timeout']
+
+    ci = update_versions.load_network_profile("ci")
+    assert ci.max_workers == 32 and ci.discovery_delay == (0, 0)
+
+
+def test_stable_urls_uses_one_query_for_all_urls(isolated, monkeypatch):
+    """URLs estáveis saem de uma única consulta, com as mesmas regras da consulta por URL"""
+    history = update_versions.get_validation_history()
+    now = 1_000_000_000.0
+    clock = [now]
+    monkeypatch.setattr(update_versions.time, "time", lambda: clock[0])
+
+    def check(url, valid, hours_ago):
+        clock[0] = now - hours_ago * 3600
+        result = update_versions.UrlCheckResult(url)
+        result.is_valid = valid
+        result.status_code = 200 if valid else 404
+        history.record(result)
+
+    checks = update_versions.STABLE_MIN_CHECKS
+    for i in range(checks):
+        check("https://a.invalid/stable.zip", True, i + 1)
+        check("https://a.invalid/old.zip", True, update_versions.STABLE_RECHECK_HOURS + i + 1)
+        check("https://a.invalid/recovered.zip", True, i + 1)
+        check("https://a.invalid/broken.zip", i > 0, i + 1)
+    check("https://a.invalid/recovered.zip", False, checks + 1)
+    for i in range(checks - 1):
+        check("https://a.invalid/few.zip", True, i + 1)
+    history.flush()
+    clock[0] = now
+
+    statements = []
+    history._conn.set_trace_callback(statements.append)
+    urls = [f"https://a.invalid/{name}.zip" for name in ("stable", "old", "recovered", "broken", "few", "new")]
+    stable = history.stable_urls(urls)
+
+    assert stable == {"https://a.invalid/stable.zip", "https://a.invalid/recovered.zip"}
+    assert len([sql for sql in statements if sql.lstrip().startswith("SELECT")]) == 2
+
+
+def test_run_journal_keyed_by_mode(isolated, monkeypatch):
+    """Diário do --quick não é retomado por --check-only; --resume com --component é recusado"""
+    monkeypatch.setattr(update_versions, "_quick_versions", 2)
+    quick_mode = update_versions.run_journal_mode(True)
+    journal = update_versions.RunJournal(update_versions.RUN_JOURNAL_FILE)
+    journal.open(quick_mode, False)
+    result = update_versions.UrlCheckResult("https://example.invalid/1.zip")
+    result.is_valid = True
+    result.status_code = 200
+    journal.record_result(result)
+    journal.complete_component("php")
+    journal.close(False)
+
+    monkeypatch.setattr(update_versions, "_quick_versions", 0)
+    assert update_versions.run_journal_mode(True) == "check-only"
+    assert not update_versions.RunJournal(update_versions.RUN_JOURNAL_FILE).open("check-only", True)
+
+    monkeypatch.setattr(update_versions, "_quick_versions", 2)
+    journal = update_versions.RunJournal(update_versions.RUN_JOURNAL_FILE)
+    journal.open(quick_mode, False)
+    journal.complete_component("php")
+    journal.close(False)
+    resumed = update_versions.RunJournal(update_versions.RUN_JOURNAL_FILE)
+    assert resumed.open(update_versions.run_journal_mode(True), True)
+    assert resumed.completed == {"php"}
+    resumed.close(True)
+
+    def args(**values):
+        defaults = {'component': None, 'update_all': False, 'check_only': False}
+        return update_versions.argparse.Namespace(**{**defaults, **values})
+
+    assert update_versions.resume_conflict(args(check_only=True)) == ""
+    assert update_versions.resume_conflict(args(update_all=True, component="php"))
+    assert update_versions.resume_conflict(args())
+
+
+def test_checksum_file_source_parses_sha256sum_lines(monkeypatch):
+    """Arquivo sha256sum: linhas válidas (texto ou binário *) viram artefatos; o resto é ignorado"""
+    digest = "AB" * 32
+    content = (f"{digest}  node-v20.0.0-win-x64.zip\n"
+               f"{'cd' * 32} *node-v20.0.0-x64.msi\r\n"
+               "-----BEGIN PGP SIGNATURE-----\n"
+               f"{'ef' * 31}  curto.zip\n").encode("utf-8")
+    requested = []
+
+    def fake_request(url, max_retries=None, **kwargs):
+        requested.append(url)
+        return content, None, 200
+
+    monkeypatch.setattr(update_versions, "make_http_request", fake_request)
+    source = update_versions.ChecksumFileSource("https://nodejs.org/dist/v20.0.0", "SHASUMS256.txt")
+
+    artifacts = source.load()
+
+    assert requested == ["https://nodejs.org/dist/v20.0.0/SHASUMS256.txt"]
+    assert artifacts == {
+        "https://nodejs.org/dist/v20.0.0/node-v20.0.0-win-x64.zip": {'sha256': "ab" * 32},
+        "https://nodejs.org/dist/v20.0.0/node-v20.0.0-x64.msi": {'sha256': "cd" * 32}}
+    assert source.covers("https://nodejs.org/dist/v20.0.0/node-v20.0.0-win-x64.zip")
+    assert not source.covers("https://nodejs.org/dist/v20.0.0/win-x64/node.exe")
+
+
+def test_index_and_release_sources_parse_manifests(monkeypatch):
+    """index.json do Node e assets do GitHub viram URL -> tamanho/digest; falha de rede vira manifesto vazio"""
+    index = [{'version': "v20.0.0", 'files': ["win-x64-zip", "linux-x64"]}, {'version': "v19.0.0", 'files': ["linux-x64"]}]
+    releases = [{'assets': [
+        {'browser_download_url': "https://github.com/o/r/releases/download/v1/a.zip", 'size': 10, 'digest': "sha256:" + "ab" * 32},
+        {'browser_download_url': "https://github.com/o/r/releases/download/v1/b.zip", 'size': 20}]}]
+    monkeypatch.setattr(update_versions, "make_http_request",
+                        lambda url, **kwargs: (json.dumps(index).encode("utf-8"), None, 200))
+    monkeypatch.setattr(update_versions, "fetch_github_releases",
+                        lambda url, **kwargs: (json.dumps(releases).encode("utf-8"), None, 200))
+
+    assert update_versions.NodeIndexSource().load() == {
+        "https://nodejs.org/dist/v20.0.0/node-v20.0.0-win-x64.zip": {}}
+    assert update_versions.GithubReleaseAssetsSource("o/r").load() == {
+        "https://github.com/o/r/releases/download/v1/a.zip": {'size': 10, 'sha256': "ab" * 32},
+        "https://github.com/o/r/releases/download/v1/b.zip": {'size': 20}}
+
+    monkeypatch.setattr(update_versions, "fetch_github_releases", lambda url, **kwargs: (None, "HTTP 503", 503))
+    assert update_versions.GithubReleaseAssetsSource("o/r").load() == {}
+
+
+def test_directory_listing_matches_files_of_the_directory(isolated, monkeypatch):
+    """Listagem: só arquivos do próprio diretório (links relativos ou absolutos), em blocos de qualquer tamanho"""
+    directory_url = "https://nginx.org/download/"
+    html = ('<html><body><a href="../">../</a><a href="nginx-1.24.0.zip">nginx-1.24.0.zip</a>\n'
+            '<a href="https://nginx.org/download/nginx-1.25.0.zip?x=1#top">abs</a>'
+            '<a href="patches/">patches/</a><a href="https://mirror.invalid/download/other.zip">fora</a>'
+            '<a name="sem-href">x</a></body></html>')
+    for size in (1, 7, len(html)):
+        parser = update_versions._ListingLinkParser(directory_url)
+        for i in range(0, len(html), size):
+            parser.feed(html[i:i + size])
+        parser.close()
+        assert parser.names == {"nginx-1.24.0.zip", "nginx-1.25.0.zip"}
+
+    urls = [f"{directory_url}nginx-1.{i}.0.zip" for i in range(3)] + [
+        "https://nginx.org/download/old/nginx-0.1.zip", "https://example.invalid/files/a.zip",
+        "https://example.invalid/files/b.zip", "https://example.invalid/files/c.zip"]
+    sources = update_versions.build_listing_sources(urls)
+    assert [source.directory_url for source in sources] == [directory_url]
+    assert sources[0].covers(urls[0]) and not sources[0].covers("https://nginx.org/download/old/nginx-0.1.zip")
+
+    # 304: a listagem em cache continua valendo
+    update_versions.get_listing_cache()[directory_url] = {'etag': '"abc"', 'names': ["nginx-1.0.0.zip"]}
+    sent = []
+
+    def not_modified(request, timeout=None):
+        sent.append(request.get_header('If-none-match'))
+        raise update_versions.HTTPError(request.full_url, 304, "Not Modified", {}, None)
+
+    monkeypatch.setattr(update_versions, "urlopen", not_modified)
+    assert sources[0].load() == {f"{directory_url}nginx-1.0.0.zip": {}}
+    assert sent == ['"abc"']
+
+
+def test_hedge_budget_caps_duplicates_at_max_rate():
+    """Hedges nunca passam de max_rate das requisições feitas, inclusive antes das primeiras"""
+    budget = update_versions.HedgeBudget(0.05)
+    assert not budget.try_acquire()
+
+    granted = 0
+    for i in range(1, 1001):
+        budget.note_request()
+        if budget.try_acquire():
+            granted += 1
+        assert budget.issued <= 0.05 * budget.requests
+
+    assert granted == budget.issued == 50
+    assert not update_versions.HedgeBudget(0).try_acquire()
+
+
+def test_hedge_delay_uses_observed_p95():
+    """Atraso do hedge: desligado sem --hedge ou sem amostras; depois o p95 do host, com mínimo"""
+    profile = update_versions.NetworkProfile("test", {'hedge': True, 'hedge_min_samples': 20, 'hedge_min_delay': 0.5}, {})
+    limiter = update_versions.HostLimiter(profile)
+    controller = limiter.controller("a.invalid")
+    for i in range(19):
+        controller.on_success(1.0 + i / 100)
+    assert limiter.hedge_delay("a.invalid") is None
+
+    controller.on_success(1.19)
+    assert limiter.hedge_delay("a.invalid") == pytest.approx(1.19)
+    for _ in range(200):
+        limiter.controller("b.invalid").on_success(0.01)
+    assert limiter.hedge_delay("b.invalid") == 0.5
+
+    profile.values['hedge'] = False
+    assert limiter.hedge_delay("a.invalid") is None
+
+
+def test_redirect_cache_revalidates_final_target(isolated, monkeypatch):
+    """Destino em cache: 304 conta como acerto; falha volta à URL original; destino instável sai do cache"""
+    url = "https://example.invalid/latest.zip"
+    final = "https://cdn.example.invalid/1.0.zip"
+    cache = update_versions.get_redirect_cache()
+    cache.update(url, final, 2, '"v1"', "", 10)
+    responses = {}
+    calls = []
+
+    async def fake_head_request(request_url, settings, target="", validators=None):
+        calls.append(target or request_url)
+        status, timed_out = responses[target or request_url]
+        result = update_versions.UrlCheckResult(request_url)
+        result.status_code = status
+        result.is_valid = status in (200, 304)
+        return result, timed_out
+
+    monkeypatch.setattr(update_versions, "_head_request", fake_head_request)
+    settings = update_versions.get_network_profile().for_host("example.invalid")
+
+    def head():
+        calls.clear()
+        return asyncio.run(update_versions._head_once(url, settings))
+
+    responses.update({final: (304, False), url: (200, False)})
+    result, _ = head()
+    assert calls == [final] and result.status_code == 200 and result.is_valid
+
+    responses[final] = (408, True)
+    result, timed_out = head()
+    assert calls == [final] and timed_out
+    assert cache.get(url)['misses'] == 0
+
+    responses[final] = (404, False)
+    for _ in range(update_versions.RedirectCache.MAX_MISSES):
+        result, _ = head()
+        assert calls == [final, url] and result.is_valid
+    assert cache.get(url) is None
+    head()
+    assert calls == [url]
+
+    # Destino que muda a cada resolução (link assinado) continua fora; o mesmo destino volta ao cache
+    cache.update(url, "https://cdn.example.invalid/1.0.zip?sig=2", 2, "", "", 0)
+    assert cache.get(url) is None
+    cache.update(url, "https://cdn.example.invalid/1.0.zip?sig=2", 2, "", "", 0)
+    cache.save()
+    reloaded = update_versions.RedirectCache(update_versions.REDIRECT_CACHE_FILE).get(url)
+    assert reloaded['final'] == "https://cdn.example.invalid/1.0.zip?sig=2" and reloaded['misses'] == 0
+
+
+def test_run_deadline_cancels_and_restarts(monkeypatch):
+    """Prazo esgotado cancela a etapa (finally roda); restart abre um novo ciclo com o prazo inteiro"""
+    clock = [100.0]
+    monkeypatch.setattr(update_versions.time, "monotonic", lambda: clock[0])
+    deadline = update_versions.RunDeadline(run_seconds=10)
+    cleaned = []
+
+    async def pending_step():
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cleaned.append(True)
+
+    async def scenario():
+        assert await deadline.run(asyncio.sleep(0, result="ok")) == (True, "ok")
+        completed, result = await deadline.run(pending_step(), limit=0)
+        assert (completed, result) == (False, None) and cleaned == [True]
+        assert deadline.exceeded == ["execução"]
+
+        clock[0] += 11
+        assert deadline.run_expired() and deadline.remaining() == 0
+        assert await deadline.run(pending_step()) == (False, None)
+        assert cleaned == [True]
+
+        deadline.restart()
+        assert not deadline.run_expired() and deadline.remaining() == 10
+        assert deadline.exceeded == [] and deadline.skipped == []
+
+    asyncio.run(scenario())
+
+
+def test_run_deadline_interrupt_cancels_running_step():
+    """Ctrl+C (interrupt) cancela a etapa em andamento e as seguintes nem começam"""
+    deadline = update_versions.RunDeadline()
+    started = []
+
+    async def pending_step():
+        started.append(True)
+        await asyncio.Event().wait()
+
+    async def scenario():
+        step = asyncio.ensure_future(deadline.run(pending_step()))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        deadline.interrupt()
+        assert await step == (False, None)
+        assert await deadline.run(pending_step()) == (False, None)
+        await deadline.wait_interrupted()
+
+    asyncio.run(scenario())
+    assert started == [True]
+    assert deadline.interrupted and deadline.exceeded == []
+
+
+def snapshot(created, versions, urls):
+    """Snapshot em memória de um único componente"""
+    return update_versions.SnapshotCatalog({
+        'format': update_versions.SNAPSHOT_FORMAT_VERSION, 'created': created,
+        'components': {'demo': {'fetched': created, 'versions': versions}}, 'urls': urls})
+
+
+def test_snapshot_catalog_round_trip(tmp_path):
+    """Snapshot gravado e relido: versões, verificações e novas versões iguais às do original"""
+    valid = update_versions.UrlCheckResult("https://example.invalid/2.0.zip")
+    valid.is_valid = True
+    valid.status_code = 200
+    valid.content_length = 42
+    missing = update_versions.UrlCheckResult("https://example.invalid/3.0.zip")
+    missing.status_code = 404
+    missing.error_class = "http"
+    versions = [{'version': "1.0", 'url': "https://example.invalid/1.0.zip"},
+                {'version': "2.0", 'url': valid.url}, {'version': "3.0", 'url': missing.url}]
+    urls = {result.url: update_versions.snapshot_check(result, {valid.url: "ab" * 32}) for result in (valid, missing)}
+    path = tmp_path / "snapshots" / "catalog.json.gz"
+
+    snapshot("2024-01-01T00:00:00", versions, urls).save(path)
+    loaded = update_versions.SnapshotCatalog.load(path)
+
+    assert loaded.path == path and not (tmp_path / "snapshots" / "catalog.json.gz.tmp").exists()
+    assert loaded.versions("demo") == versions
+    result = loaded.result_for(valid.url)
+    assert (result.is_valid, result.status_code, result.content_length, result.sha256) == (True, 200, 42, "ab" * 32)
+    assert loaded.result_for(missing.url).error_class == "http"
+    assert loaded.result_for("https://example.invalid/1.0.zip").is_unknown
+    assert loaded.new_versions("demo", [{'version': "1.0"}]) == [{'version': "2.0", 'url': valid.url}]
+
+    (tmp_path / "other.json.gz").write_bytes(b"not gzip")
+    with pytest.raises(ValueError):
+        update_versions.SnapshotCatalog.load(tmp_path / "other.json.gz")
+
+
+def test_diff_snapshots_lists_added_removed_and_changed(capsys):
+    """Diferenças entre snapshots: versões novas, removidas e com verificação alterada"""
+    old = snapshot("2024-01-01", [{'version': "1.0", 'url': "https://e.invalid/1.zip"},
+                                  {'version': "2.0", 'url': "https://e.invalid/2.zip"}],
+                   {"https://e.invalid/1.zip": {'valid': True}, "https://e.invalid/2.zip": {'valid': True, 'size': 1}})
+    new = snapshot("2024-01-02", [{'version': "2.0", 'url': "https://e.invalid/2.zip"},
+                                  {'version': "3.0", 'url': "https://e.invalid/3.zip"}],
+                   {"https://e.invalid/2.zip": {'valid': True, 'size': 2}, "https://e.invalid/3.zip": {'valid': True}})
+
+    update_versions.diff_snapshots(old, new)
+    output = capsys.readouterr().out
+    assert "+ 3.0: https://e.invalid/3.zip" in output
+    assert "- 1.0: https://e.invalid/1.zip" in output
+    assert "~ 2.0: tamanho 1 → 2" in output
+
+    update_versions.diff_snapshots(new, new)
+    assert "Nenhuma diferença" in capsys.readouterr().out
+
+
+def test_catalog_service_etag_and_not_modified(tmp_path):
+    """Respostas levam ETag; If-None-Match igual devolve 304 sem corpo até o provider mudar"""
+    provider = tmp_path / "DemoVersionProvider.cs"
+    provider.write_text('new VersionInfo("1.0.0", "https://example.invalid/1.0.0.zip")', encoding="utf-8")
+    os.utime(provider, (1_000_000, 1_000_000))
+    service = update_versions.CatalogService([("demo", provider)], 60)
+
+    def get(component, etag=""):
+        headers = {'If-None-Match': etag} if etag else {}
+        request = make_mocked_request("GET", f"/providers/{component}", headers=headers, match_info={'component': component})
+        return asyncio.run(service.handle_provider(request))
+
+    first = get("demo")
+    etag = first.headers['ETag']
+    assert first.status == 200 and json.loads(first.body)['versions'][0]['version'] == "1.0.0"
+    assert get("DEMO").headers['ETag'] == etag
+
+    cached = get("demo", etag)
+    assert cached.status == 304 and not cached.body and cached.headers['ETag'] == etag
+    assert get("demo", f'W/"outro", {etag}').status == 304
+
+    provider.write_text('new VersionInfo("1.1.0", "https://example.invalid/1.1.0.zip")', encoding="utf-8")
+    os.utime(provider, (2_000_000, 2_000_000))
+    changed = get("demo", etag)
+    assert changed.status == 200 and changed.headers['ETag'] != etag
+
+    missing = get("outro", etag)
+    assert missing.status == 404 and json.loads(missing.body)['error']
+
+
+def test_parse_daemon_intervals():
+    """COMPONENTE=MINUTOS vira intervalo por componente; formatos e valores inválidos são recusados"""
+    assert update_versions.parse_daemon_intervals([]) == {}
+    assert update_versions.parse_daemon_intervals(["PHP=30", " node = 1.5", "php=45"]) == {'php': 45.0, 'node': 1.5}
+
+    for value in ("php", "php=", "=30", "php=abc", "php=0", "php=-5", "php=inf", "php=nan"):
+        with pytest.raises(ValueError, match="Intervalo inválido"):
+            update_versions.parse_daemon_intervals(["node=60", value])
+
+    scheduler = update_versions.ComponentScheduler(
+        [("php", Path("php.cs")), ("node", Path("node.cs")), ("outro", Path("outro.cs"))],
+        update_versions.parse_daemon_intervals(["php=30"]))
+    assert scheduler.intervals == {
+        'php': 30 * 60, 'node': update_versions.DAEMON_INTERVAL_MINUTES['node'] * 60,
+        'outro': update_versions.DAEMON_DEFAULT_INTERVAL_MINUTES * 60}
+
+
+def versions_of(*names):
+    """Lista de versões do provider a partir dos números"""
+    return [{'version': name, 'url': f"https://example.invalid/{name}.zip"} for name in names]
+
+
+def test_select_quick_versions_keeps_newest_per_series(monkeypatch):
+    """K versões mais novas de cada série major.minor, em ordem crescente"""
+    versions = versions_of("8.2.10", "8.1.2", "8.2.9", "8.1.27", "8.2.1", "7.4.33", "8.1.3")
+
+    selected = update_versions.select_quick_versions(versions, 2)
+
+    assert [v['version'] for v in selected] == ["7.4.33", "8.1.3", "8.1.27", "8.2.9", "8.2.10"]
+    assert [v['version'] for v in update_versions.select_quick_versions(versions, 1)] == ["7.4.33", "8.1.27", "8.2.10"]
+    assert update_versions.select_quick_versions([], 2) == []
+
+    # Muitas séries major.minor: agrupa por major e mantém só as séries mais novas
+    monkeypatch.setattr(update_versions, "QUICK_MAX_SERIES", 3)
+    many = versions_of(*(f"{major}.{minor}.0" for major in range(10, 15) for minor in range(3)))
+    assert [v['version'] for v in update_versions.select_quick_versions(many, 1)] == ["12.2.0", "13.2.0", "14.2.0"]
+
+
+def test_quick_candidates_stop_after_limit():
+    """Descoberta rápida: só versões mais novas que o provider na série, fechando o iterador no limite"""
+    closed = []
+
+    def upstream():
+        try:
+            yield from versions_of("8.2.11", "8.2.10", "8.2.11", "8.1.28", "8.1.20", "7.4.34", "8.3.0", "8.3.1", "8.4.0")
+        finally:
+            closed.append(True)
+
+    existing = versions_of("8.2.10", "8.1.27")
+    candidates = list(update_versions.iter_quick_candidates(upstream, existing, 3))
+
+    assert [v['version'] for v in candidates] == ["8.2.11", "8.1.28", "8.3.0"]
+    assert closed == [True]
@@ -20,8 +20,32 @@ Opções:
     --check-only             Apenas verifica URLs existentes sem atualizar
     --update-all            Atualiza todos os componentes automaticamente
     --clear-cache           Limpa o cache de versões falhadas
+    --retry-transient       Libera falhas transitórias (5xx, timeout, bloqueio) do cache
     --clear-backups         Limpa backups antigos (mais de 30 dias)
     --show-backups          Mostra informações dos backups
+    --reconcile-backups     Reconcilia o catálogo de backups com a pasta de backups
+    --network-profile NOME  Perfil de rede (network_profiles.json): default, ci, polite, aggressive
+    --verify-checksums      Calcula SHA-256 e tamanho dos artefatos e atualiza checksums.json
+    --bandwidth-limit MBPS  Limite total de banda dos downloads em MB/s (0 = sem limite)
+    --mirror DIR            Baixa os artefatos para um espelho local endereçado por conteúdo
+    --mirror-filter REGEX   Espelha apenas as versões que casam com a expressão
+    --results-file ARQUIVO  Grava todos os resultados de verificação em JSON Lines
+    --hedge                 Duplica requisições que passam do p95 de latência do host
+    --speculative           Descobre versões sondando modelos de URL (python, go, mongodb, mysql)
+    --show-history          Mostra URLs instáveis e latência por host do histórico de validações
+    --deadline SEGUNDOS     Tempo máximo da execução; o que não terminar fica como desconhecido
+    --component-deadline SEGUNDOS  Tempo máximo de cada componente
+    --resume                Retoma a varredura (--update-all/--check-only/--quick) interrompida do mesmo modo
+    --snapshot [ARQUIVO]    Grava um snapshot compactado com as versões upstream e verificações
+    --from-snapshot ARQUIVO  Verifica usando um snapshot, sem acesso à rede (implica --check-only)
+    --diff-snapshots A B    Mostra as diferenças entre dois snapshots
+    --serve                 Serviço HTTP local com providers, verificações e novas versões em JSON
+    --serve-host HOST       Endereço do serviço (padrão: 127.0.0.1)
+    --serve-port PORTA      Porta do serviço (padrão: 8780)
+    --refresh-interval MIN  Intervalo de atualização do serviço em minutos (padrão: 60)
+    --daemon                Processo contínuo: verifica e atualiza cada componente no seu intervalo
+    --interval COMP=MIN     Intervalo do daemon para um componente, em minutos (pode repetir)
+    --quick K               Verificação rápida (CI): só as K versões mais novas de cada série
     --help                  Mostra esta ajuda
 
 Exemplos:
@@ -31,9 +55,26 @@ Exemplos:
     python update_versions.py --update-all
     python update_versions.py --clear-cache
     python update_versions.py --component php --clear-cache
+    python update_versions.py --retry-transient
     python update_versions.py --clear-backups
     python update_versions.py --component php --clear-backups
     python update_versions.py --show-backups
+    python update_versions.py --reconcile-backups
+    python update_versions.py --update-all --network-profile polite
+    python update_versions.py --verify-checksums --bandwidth-limit 20
+    python update_versions.py --mirror D:\\mirror --component php --mirror-filter "^8\\."
+    python update_versions.py --check-only --results-file resultados.jsonl
+    python update_versions.py --check-only --hedge
+    python update_versions.py --component python --speculative
+    python update_versions.py --show-history
+    python update_versions.py --check-only --deadline 600 --component-deadline 120
+    python update_versions.py --update-all --resume
+    python update_versions.py --snapshot catalogo.json.gz
+    python update_versions.py --check-only --from-snapshot catalogo.json.gz
+    python update_versions.py --diff-snapshots antigo.json.gz novo.json.gz
+    python update_versions.py --serve --serve-port 8780 --refresh-interval 60
+    python update_versions.py --daemon --interval node=60 --interval phpmyadmin=1440
+    python update_versions.py --quick 2
 """
 
 import os
@@ -43,19 +84,32 @@ import time
 import argparse
 import asyncio
 import aiohttp
+from aiohttp import web
+import abc
+import collections
+import concurrent.futures
+import contextlib
+import contextvars
+import gzip
+import hashlib
+import html.parser
 import http.client
 import http.cookiejar
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable, Iterator
+from urllib.parse import urlparse, urljoin
+import bisect
 import random
 import re
 import shutil
 import signal
+import sqlite3
+import threading
 import urllib.error
 import urllib.parse
 import urllib.request
+import weakref
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
@@ -70,7 +124,75 @@ except ImportError:
 AVAILABLE_VERSIONS_PATH = Path(__file__).parent.parent / "src" / "Shared" / "AvailableVersions" / "Providers"
 BACKUP_PATH = Path(__file__).parent.parent / "src" / "Shared" / "AvailableVersions" / "backup"
 CACHE_PATH = BACKUP_PATH / "cache"
-MAX_WORKERS = 50  # Máximo para performance otimizada
+CHECKSUM_MANIFEST_FILE = Path(__file__).parent.parent / "src" / "Shared" / "AvailableVersions" / "checksums.json"
+HASH_CHUNK_SIZE = 64 * 1024  # Tamanho dos blocos lidos ao calcular hashes em streaming
+LISTING_CACHE_FILE = CACHE_PATH / "listings.json"
+REDIRECT_CACHE_FILE = CACHE_PATH / "redirects.json"
+HISTORY_DB_FILE = CACHE_PATH / "validation_history.sqlite3"
+RUN_JOURNAL_FILE = CACHE_PATH / "run-journal.jsonl"
+SNAPSHOT_FILE = CACHE_PATH / "catalog-snapshot.json.gz"
+SNAPSHOT_FORMAT_VERSION = 1
+HISTORY_RETENTION_DAYS = 180
+REMOVAL_MIN_FAILED_RUNS = 3  # Execuções seguidas com falha antes de remover a URL do provider
+STABLE_MIN_CHECKS = 5  # Verificações válidas seguidas para considerar a URL estável
+STABLE_RECHECK_HOURS = 24  # URLs estáveis só são verificadas de novo após este intervalo
+STABLE_HOST_MAX_ERROR_RATE = 0.05  # Acima disso o host não é considerado estável
+RUN_JOURNAL_MAX_AGE_HOURS = 24  # Diários de varredura mais antigos não são retomados (--resume)
+
+# Serviço local de catálogo (--serve)
+SERVE_DEFAULT_HOST = "127.0.0.1"
+SERVE_DEFAULT_PORT = 8780
+SERVE_REFRESH_MINUTES = 60
+SERVE_MAX_AGE_SECONDS = 60
+
+# Modo rápido (--quick K): só as K versões mais novas de cada série, com prazo abaixo de um minuto
+QUICK_DEADLINE_SECONDS = 50
+QUICK_CANDIDATE_FACTOR = 3  # A descoberta para após K x fator versões candidatas
+QUICK_MAX_SERIES = 12  # Acima disso as séries passam a ser por major, e só as mais novas são mantidas
+QUICK_NETWORK_PROFILE = "ci"
+
+# Modo daemon (--daemon): intervalo em minutos entre as verificações de cada componente
+DAEMON_DEFAULT_INTERVAL_MINUTES = 360
+DAEMON_INTERVAL_MINUTES = {
+    "node": 60,
+    "php": 120,
+    "python": 180,
+    "go": 180,
+    "git": 180,
+    "dbeaver": 720,
+    "composer": 720,
+    "adminer": 1440,
+    "phpcsfixer": 1440,
+    "phpmyadmin": 1440,
+    "wpcli": 1440
+}
+
+# Validade do cache de versões falhadas por classe de erro (horas); reincidências dobram o prazo
+FAILURE_CACHE_TTL_HOURS = {
+    "gone": 30 * 24,    # 404/410: artefato removido do upstream
+    "blocked": 24,      # 401/403/429: proteção anti-bot ou limite de requisições
+    "server": 6,        # 5xx
+    "timeout": 2,
+    "connect": 6,       # DNS, conexão recusada, TLS
+    "other": 7 * 24
+}
+FAILURE_CACHE_MAX_TTL_HOURS = 90 * 24
+FAILURE_CACHE_RETENTION_DAYS = 90  # Entradas expiradas são mantidas para calcular o backoff
+TRANSIENT_FAILURE_CLASSES = {"blocked", "server", "timeout", "connect"}
+
+# Diretórios com listagem de arquivos (uma listagem confirma centenas de URLs)
+DIRECTORY_LISTING_PREFIXES = [
+    "https://nginx.org/download/",
+    "https://windows.php.net/downloads/releases/",
+    "https://nodejs.org/dist/",
+    "https://www.python.org/ftp/python/"
+]
+BACKUP_CATALOG_FILE = BACKUP_PATH / "backup_catalog.jsonl"
+NETWORK_CONFIG_FILE = Path(__file__).parent / "network_profiles.json"
+GITHUB_RELEASES_PER_PAGE = 30  # Releases por página da API do GitHub
+GITHUB_RELEASES_MAX_PAGES = 2  # Páginas consultadas por componente (cada uma conta no limite da API)
+MAX_WORKERS = 50  # Máximo para performance otimizada (padrão quando não há perfil de rede)
+FAIR_QUEUE_PULL_AHEAD = 8  # Fila justa: lê até N x o buffer adiante quando todos os hosts da fila estão saturados
 TIMEOUT_SECONDS = 30
 
 # Headers para evitar detecção como bot - baseados no código C#
@@ -144,6 +266,10 @@ DOMAIN_SPECIFIC_HEADERS = {
 }
 
 class UrlCheckResult:
+    # Registros compactos: verificações com milhões de URLs não carregam um __dict__ por resultado
+    __slots__ = ('url', 'is_valid', 'error_message', 'status_code', 'content_error', 'content_length',
+                 'is_unknown', 'error_class', 'etag', 'last_modified', 'sha256', 'source', 'latency')
+
     def __init__(self, url: str):
         self.url = url
         self.is_valid = False
@@ -151,6 +277,24 @@ class UrlCheckResult:
         self.status_code = 0
         self.content_error = ""  # Erro específico relacionado ao conteúdo/download
         self.content_length = 0
+        self.is_unknown = False  # Host indisponível: não é removida nem entra no cache de falhas
+        self.error_class = ""  # timeout, connect, http, circuit ou other
+        self.etag = ""
+        self.last_modified = ""
+        self.sha256 = ""  # Hash publicado pelo upstream (validação em lote)
+        self.source = "head"  # Origem da confirmação: head, history ou o nome da fonte em lote
+        self.latency = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UrlCheckResult':
+        result = cls(data['url'])
+        for name in cls.__slots__:
+            if name in data:
+                setattr(result, name, data[name])
+        return result
 
 class NewVersionResult:
     def __init__(self, component: str):
@@ -192,6 +336,621 @@ cookie_jar = http.cookiejar.CookieJar()
 opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookie_jar))
 urllib.request.install_opener(opener)
 
+class _SingleFlightOwnerCancelled(Exception):
+    """Sinaliza aos aguardantes que a requisição compartilhada foi cancelada pelo dono"""
+
+class SingleFlight:
+    """Coalescência de requisições idênticas (método + URL) durante uma execução
+
+    A primeira chamada para uma chave executa a requisição; chamadas concorrentes
+    com a mesma chave aguardam o mesmo futuro e recebem o mesmo resultado. Os
+    futuros são de concurrent.futures, então funcionam entre threads e event loops
+    (as buscas síncronas rodam em executores com loops próprios).
+
+    Resultados definitivos ficam memorizados até o fim da execução; falhas
+    transitórias e exceções não são memorizadas, para que uma nova tentativa
+    posterior faça a requisição de novo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, str], concurrent.futures.Future] = {}
+        self._completed: Dict[Tuple[str, str], Any] = {}
+        self.requests = 0
+        self.saved = 0
+
+    def _claim(self, key: Tuple[str, str]) -> Tuple[concurrent.futures.Future, bool]:
+        with self._lock:
+            self.requests += 1
+            if key in self._completed:
+                self.saved += 1
+                future = concurrent.futures.Future()
+                future.set_result(self._completed[key])
+                return future, False
+
+            future = self._inflight.get(key)
+            if future is not None:
+                self.saved += 1
+                return future, False
+
+            future = concurrent.futures.Future()
+            # Futuro "em execução" não pode ser cancelado por um aguardante
+            future.set_running_or_notify_cancel()
+            self._inflight[key] = future
+            return future, True
+
+    def _settle(self, key: Tuple[str, str], future: concurrent.futures.Future, result: Any = None,
+                error: Optional[BaseException] = None, cacheable: bool = False) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is None and cacheable:
+                self._completed[key] = result
+
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def run(self, method: str, url: str, factory, cacheable=lambda result: True) -> Any:
+        """Executa (ou aguarda) a requisição assíncrona identificada por método + URL"""
+        key = (method.upper(), url)
+        while True:
+            future, owner = self._claim(key)
+            if owner:
+                try:
+                    result = await factory()
+                except asyncio.CancelledError:
+                    self._settle(key, future, error=_SingleFlightOwnerCancelled())
+                    raise
+                except BaseException as e:
+                    self._settle(key, future, error=e)
+                    raise
+                self._settle(key, future, result, cacheable=cacheable(result))
+                return result
+
+            try:
+                # shield: cancelar um aguardante não afeta o futuro compartilhado
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _SingleFlightOwnerCancelled:
+                continue
+
+    def run_sync(self, method: str, url: str, factory, cacheable=lambda result: True) -> Any:
+        """Executa (ou aguarda) a requisição síncrona identificada por método + URL"""
+        key = (method.upper(), url)
+        while True:
+            future, owner = self._claim(key)
+            if owner:
+                try:
+                    result = factory()
+                except BaseException as e:
+                    self._settle(key, future, error=e)
+                    raise
+                self._settle(key, future, result, cacheable=cacheable(result))
+                return result
+
+            try:
+                return future.result()
+            except _SingleFlightOwnerCancelled:
+                continue
+
+    def remember(self, method: str, url: str, result: Any) -> None:
+        """Memoriza um resultado obtido por outro caminho (ex: manifesto em lote)"""
+        with self._lock:
+            self._completed[(method.upper(), url)] = result
+
+    def reset(self) -> None:
+        """Descarta os resultados memorizados (nova execução)"""
+        with self._lock:
+            self._completed.clear()
+
+_single_flight = SingleFlight()
+
+def get_single_flight() -> SingleFlight:
+    """Obtém a camada de coalescência de requisições da execução atual"""
+    return _single_flight
+
+class HostSettings:
+    """Configurações de rede efetivas para um host"""
+    def __init__(self, values: Dict):
+        self.max_concurrency = max(1, int(values.get('max_concurrency', values['per_host_concurrency'])))
+        self.connect_timeout = float(values['connect_timeout'])
+        self.read_timeout = float(values['read_timeout'])
+        self.total_timeout = float(values['total_timeout'])
+        self.requests_per_second = float(values['requests_per_second'])
+        # Validação em duas fases: passada rápida e confirmação das falhas
+        self.fast_connect_timeout = float(values['fast_connect_timeout'])
+        self.fast_total_timeout = float(values['fast_total_timeout'])
+        self.confirm_connect_timeout = float(values['confirm_connect_timeout'])
+        self.confirm_total_timeout = float(values['confirm_total_timeout'])
+
+    def client_timeout(self, phase: str = "normal") -> aiohttp.ClientTimeout:
+        """Timeouts separados de conexão, leitura e total para aiohttp (conforme a fase da validação)"""
+        if phase == "fast":
+            return aiohttp.ClientTimeout(total=min(self.total_timeout, self.fast_total_timeout),
+                                         connect=min(self.connect_timeout, self.fast_connect_timeout),
+                                         sock_read=min(self.read_timeout, self.fast_total_timeout))
+        if phase == "confirm":
+            return aiohttp.ClientTimeout(total=max(self.total_timeout, self.confirm_total_timeout),
+                                         connect=max(self.connect_timeout, self.confirm_connect_timeout),
+                                         sock_read=max(self.read_timeout, self.confirm_total_timeout))
+        return aiohttp.ClientTimeout(total=self.total_timeout, connect=self.connect_timeout, sock_read=self.read_timeout)
+
+# Sessão HTTP compartilhada (modo daemon): mantém conexões e DNS quentes entre os ciclos
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+def set_shared_session(session: Optional[aiohttp.ClientSession]) -> None:
+    """Define a sessão HTTP de longa duração usada pelas verificações"""
+    global _shared_session
+    _shared_session = session
+
+@contextlib.asynccontextmanager
+async def http_session(timeout: aiohttp.ClientTimeout):
+    """Sessão para uma verificação: a compartilhada, se houver, ou uma nova (o timeout vai em cada requisição)"""
+    if _shared_session is not None and not _shared_session.closed:
+        yield _shared_session
+    else:
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            yield session
+
+# Fase da validação em andamento (herdada pelas tarefas criadas dentro dela)
+_validation_phase: contextvars.ContextVar = contextvars.ContextVar('validation_phase', default="normal")
+
+@contextlib.contextmanager
+def validation_phase(phase: str):
+    """Executa o bloco em uma fase de validação (fast, confirm ou normal)"""
+    token = _validation_phase.set(phase)
+    try:
+        yield
+    finally:
+        _validation_phase.reset(token)
+
+class NetworkProfile:
+    """Perfil de rede: limites globais, timeouts e ajustes por host
+
+    Os perfis do arquivo de configuração só trazem o que difere de DEFAULTS.
+    """
+    DEFAULTS = {
+        'max_workers': MAX_WORKERS,
+        'per_host_concurrency': 8,
+        'adaptive_concurrency': True,
+        'initial_concurrency': 4,
+        'connect_timeout': 10,
+        'read_timeout': 25,
+        'total_timeout': TIMEOUT_SECONDS,
+        'requests_per_second': 0,
+        'max_retries': 3,
+        'request_delay': (0.1, 0.3),
+        'discovery_delay': (1, 3),
+        'latency_tolerance': 3.0,
+        'error_rate_threshold': 0.25,
+        'decrease_factor': 0.5,
+        'breaker_threshold': 5,
+        'breaker_cooldown': 60,
+        'download_concurrency': 4,
+        'bandwidth_limit_mbps': 0,
+        'mirror_chunk_size_mb': 8,
+        'mirror_chunk_concurrency': 4,
+        'listing_min_urls': 3,
+        # Hedging de HEADs lentos (desligado por padrão)
+        'hedge': False,
+        'hedge_max_rate': 0.05,
+        'hedge_min_samples': 20,
+        'hedge_min_delay': 0.5,
+        # Validação em duas fases: passada rápida e confirmação das falhas
+        'fast_connect_timeout': 3,
+        'fast_total_timeout': 8,
+        'confirm_connect_timeout': 20,
+        'confirm_total_timeout': 90,
+        'confirm_failure_limit': 2
+    }
+
+    def __init__(self, name: str, values: Dict, hosts: Dict[str, Dict]):
+        self.name = name
+        self.values = {**self.DEFAULTS, **values}
+        self.max_workers = max(1, int(self.values['max_workers']))
+        self.max_retries = max(1, int(self.values['max_retries']))
+        self.request_delay = tuple(self.values['request_delay'])
+        self.discovery_delay = tuple(self.values['discovery_delay'])
+        self._hosts = hosts
+        self._host_cache: Dict[str, HostSettings] = {}
+
+    def host_key(self, host: str) -> Optional[str]:
+        """Encontra a entrada de configuração do host (exata ou por sufixo de domínio)"""
+        host = host.lower()
+        if host in self._hosts:
+            return host
+        for key in self._hosts:
+            if host.endswith('.' + key):
+                return key
+        return None
+
+    def for_host(self, host: str) -> HostSettings:
+        """Configurações efetivas do host (perfil + ajustes do host)"""
+        settings = self._host_cache.get(host)
+        if settings is None:
+            values = dict(self.values)
+            key = self.host_key(host)
+            if key:
+                values.update(self._hosts[key])
+            settings = HostSettings(values)
+            self._host_cache[host] = settings
+        return settings
+
+def load_network_profile(name: str = "", config_file: Path = NETWORK_CONFIG_FILE) -> NetworkProfile:
+    """Carrega um perfil de rede do arquivo de configuração"""
+    config = {}
+    if config_file.exists():
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print_colored(f"Erro ao ler configuração de rede ({config_file.name}): {e}", "yellow")
+
+    profiles = config.get('profiles', {})
+    name = name or config.get('default_profile', 'default')
+    if name not in profiles and name != 'default':
+        available = ", ".join(sorted(profiles)) or "default"
+        raise ValueError(f"Perfil de rede '{name}' não encontrado (disponíveis: {available})")
+
+    values = dict(profiles.get(name, {}))
+    hosts = {key.lower(): dict(value) for key, value in config.get('hosts', {}).items()}
+    for key, value in values.pop('hosts', {}).items():
+        hosts.setdefault(key.lower(), {}).update(value)
+
+    return NetworkProfile(name, values, hosts)
+
+def host_of(url: str) -> str:
+    """Extrai o host (minúsculo) de uma URL"""
+    return (urlparse(url).hostname or "").lower()
+
+class AimdController:
+    """Controle adaptativo (AIMD) do limite de concorrência de um host
+
+    O limite cresce de forma aditiva (+1 por janela de limite respostas) enquanto a
+    latência fica próxima da linha de base e a taxa de erros fica baixa, e é
+    reduzido de forma multiplicativa em 429/503/timeouts. O estado é compartilhado
+    entre event loops e threads.
+    """
+    def __init__(self, initial: int, ceiling: int, adaptive: bool = True, latency_tolerance: float = 3.0,
+                 error_rate_threshold: float = 0.25, decrease_factor: float = 0.5):
+        self.ceiling = max(1, ceiling)
+        self.adaptive = adaptive
+        self.limit = float(min(max(1, initial), self.ceiling)) if adaptive else float(self.ceiling)
+        self.latency_tolerance = latency_tolerance
+        self.error_rate_threshold = error_rate_threshold
+        self.decrease_factor = decrease_factor
+        self.latency_ewma: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self._outcomes = collections.deque(maxlen=20)
+        self._latencies = collections.deque(maxlen=200)
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def current_limit(self) -> int:
+        """Limite inteiro de requisições simultâneas no momento"""
+        return max(1, int(self.limit))
+
+    def error_rate(self) -> float:
+        """Fração de erros entre as respostas recentes"""
+        return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def latency_percentile(self, fraction: float, min_samples: int = 20) -> Optional[float]:
+        """Percentil das latências recentes de respostas saudáveis (None sem amostras suficientes)"""
+        with self._lock:
+            if len(self._latencies) < max(1, min_samples):
+                return None
+            samples = sorted(self._latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+    def on_success(self, latency: float) -> None:
+        """Registra uma resposta saudável"""
+        with self._lock:
+            self._outcomes.append(0)
+            self._latencies.append(latency)
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            # A linha de base acompanha a menor latência observada, mas pode subir devagar
+            if self.latency_baseline is None or self.latency_ewma < self.latency_baseline:
+                self.latency_baseline = self.latency_ewma
+            else:
+                self.latency_baseline *= 1.01
+
+            if not self.adaptive:
+                return
+            if self.latency_ewma > self.latency_baseline * self.latency_tolerance:
+                return
+            if self.error_rate() < self.error_rate_threshold:
+                self.limit = min(float(self.ceiling), self.limit + 1.0 / self.limit)
+
+    def on_overload(self) -> None:
+        """Registra 429/503/timeout e reduz o limite de forma multiplicativa"""
+        with self._lock:
+            self._outcomes.append(1)
+            self._decrease()
+
+    def on_error(self) -> None:
+        """Registra outros erros (reduz apenas se a taxa de erros ficar alta)"""
+        with self._lock:
+            self._outcomes.append(1)
+            if self.error_rate() >= self.error_rate_threshold:
+                self._decrease()
+
+    def _decrease(self) -> None:
+        if not self.adaptive:
+            return
+        # Uma redução por janela de latência, para várias falhas simultâneas não zerarem o limite
+        now = time.monotonic()
+        window = self.latency_ewma or 1.0
+        if now - self._last_decrease < window:
+            return
+        self._last_decrease = now
+        self.limit = max(1.0, self.limit * self.decrease_factor)
+
+class AdaptiveGate:
+    """Portão assíncrono que admite requisições até o limite atual do controlador"""
+    def __init__(self, controller: AimdController):
+        self.controller = controller
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        # Na passada rápida o limite é o teto do host; as falhas são confirmadas depois
+        fast = _validation_phase.get() == "fast"
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.in_flight < (self.controller.ceiling if fast else self.controller.current_limit()))
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+class CircuitBreaker:
+    """Circuit breaker por host para falhas de conexão e timeouts
+
+    Após N falhas consecutivas de conexão/timeout o circuito do host abre e as
+    próximas requisições são respondidas imediatamente como "unknown". Depois do
+    tempo de espera o circuito deixa passar novas requisições; uma nova falha o
+    reabre imediatamente.
+    """
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._tripped = set()
+
+    def allow(self, host: str) -> bool:
+        """Indica se uma requisição ao host pode ser feita agora"""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at < self.cooldown:
+                return False
+            # Meio-aberto: libera requisições, mas a próxima falha reabre o circuito
+            del self._opened_at[host]
+            self._failures[host] = self.threshold - 1
+            return True
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        """Registra uma falha de conexão/timeout do host"""
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold and host not in self._opened_at:
+                self._opened_at[host] = time.monotonic()
+                self._tripped.add(host)
+                print_colored(f"\n  ⚠ Circuito aberto para {host} após {failures} falhas consecutivas de conexão/timeout", "yellow")
+
+    def trip(self, host: str) -> None:
+        """Abre o circuito do host imediatamente (host sem resposta na confirmação)"""
+        with self._lock:
+            self._failures[host] = max(self._failures.get(host, 0), self.threshold)
+            if host not in self._opened_at:
+                self._opened_at[host] = time.monotonic()
+                self._tripped.add(host)
+                print_colored(f"\n  ⚠ Circuito aberto para {host}: sem resposta na confirmação", "yellow")
+
+    def is_open(self, host: str) -> bool:
+        """Indica se o circuito do host está aberto agora (sem passar para meio-aberto)"""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            return opened_at is not None and time.monotonic() - opened_at < self.cooldown
+
+    def has_tripped(self, host: str) -> bool:
+        """Indica se o circuito do host abriu em algum momento da execução"""
+        with self._lock:
+            return host in self._tripped
+
+class HedgeBudget:
+    """Limita as requisições duplicadas (hedge) a uma fração das requisições feitas"""
+    def __init__(self, max_rate: float):
+        self.max_rate = max(0.0, max_rate)
+        self.requests = 0
+        self.issued = 0
+        self.won = 0
+        self._lock = threading.Lock()
+
+    def note_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_acquire(self) -> bool:
+        """Reserva um hedge se a taxa máxima ainda não foi atingida"""
+        with self._lock:
+            if self.issued + 1 > self.max_rate * self.requests:
+                return False
+            self.issued += 1
+            return True
+
+    def note_win(self) -> None:
+        with self._lock:
+            self.won += 1
+
+def mark_unknown_if_host_down(result: UrlCheckResult) -> None:
+    """Converte falhas de conexão/timeout em "unknown" quando o circuito do host abriu"""
+    if result.is_valid or result.is_unknown:
+        return
+    if result.error_class in ("timeout", "connect") and get_host_limiter().breaker.has_tripped(host_of(result.url)):
+        result.is_unknown = True
+
+class HostLease:
+    """Vaga ocupada em um host; registra o resultado da requisição no controlador"""
+    def __init__(self, host: str, settings: HostSettings, controller: AimdController):
+        self.host = host
+        self.settings = settings
+        self.controller = controller
+
+    def record(self, status_code: int, latency: float, timed_out: bool = False) -> None:
+        """Alimenta o controlador AIMD com o resultado da requisição"""
+        if timed_out or status_code in (429, 503):
+            self.controller.on_overload()
+        elif status_code == 0 or status_code >= 500:
+            self.controller.on_error()
+        else:
+            self.controller.on_success(latency)
+
+class HostLimiter:
+    """Limites de concorrência e de taxa por host
+
+    A concorrência assíncrona de cada host é controlada por um AimdController
+    (limitado pelo max_concurrency configurado) através de portões criados por event
+    loop (as buscas síncronas rodam em threads com loops próprios). O estado dos
+    controladores e a reserva de janelas de taxa são compartilhados entre loops e
+    threads.
+    """
+    def __init__(self, profile: NetworkProfile):
+        self.profile = profile
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+        self._controllers: Dict[str, AimdController] = {}
+        self._gates = weakref.WeakKeyDictionary()
+        self._sync_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.breaker = CircuitBreaker(
+            threshold=int(profile.values['breaker_threshold']),
+            cooldown=float(profile.values['breaker_cooldown'])
+        )
+        self.hedging = HedgeBudget(float(profile.values['hedge_max_rate']))
+
+    def controller(self, host: str) -> AimdController:
+        """Controlador AIMD do host"""
+        with self._lock:
+            controller = self._controllers.get(host)
+            if controller is None:
+                values = self.profile.values
+                controller = AimdController(
+                    initial=int(values['initial_concurrency']),
+                    ceiling=self.profile.for_host(host).max_concurrency,
+                    adaptive=bool(values['adaptive_concurrency']),
+                    latency_tolerance=float(values['latency_tolerance']),
+                    error_rate_threshold=float(values['error_rate_threshold']),
+                    decrease_factor=float(values['decrease_factor'])
+                )
+                self._controllers[host] = controller
+            return controller
+
+    def _gate(self, host: str) -> AdaptiveGate:
+        loop = asyncio.get_running_loop()
+        gates = self._gates.setdefault(loop, {})
+        gate = gates.get(host)
+        if gate is None:
+            gate = AdaptiveGate(self.controller(host))
+            gates[host] = gate
+        return gate
+
+    def _sync_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._sync_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.profile.for_host(host).max_concurrency)
+                self._sync_semaphores[host] = semaphore
+            return semaphore
+
+    def _reserve_rate_slot(self, host: str) -> float:
+        """Reserva a próxima janela de envio do host e retorna quanto esperar"""
+        rate = self.profile.for_host(host).requests_per_second
+        if rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 1.0 / rate
+            return slot - now
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url: str):
+        """Ocupa uma vaga de concorrência do host da URL (respeitando a taxa)"""
+        host = host_of(url)
+        gate = self._gate(host)
+        await gate.acquire()
+        try:
+            delay = self._reserve_rate_slot(host)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield HostLease(host, self.profile.for_host(host), gate.controller)
+            # Pequeno intervalo com a vaga ocupada para não sobrecarregar o servidor (exceto na passada rápida)
+            pause = random.uniform(*self.profile.request_delay) if _validation_phase.get() != "fast" else 0
+            if pause > 0:
+                await asyncio.sleep(pause)
+        finally:
+            await gate.release()
+
+    @contextlib.contextmanager
+    def sync_slot(self, url: str):
+        """Versão síncrona de slot() para as requisições via urllib"""
+        host = host_of(url)
+        with self._sync_semaphore(host):
+            delay = self._reserve_rate_slot(host)
+            if delay > 0:
+                time.sleep(delay)
+            yield self.profile.for_host(host)
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """Tempo após o qual uma requisição ao host ganha uma duplicata (p95 observado), ou None"""
+        values = self.profile.values
+        if not values['hedge']:
+            return None
+        p95 = self.controller(host).latency_percentile(0.95, int(values['hedge_min_samples']))
+        if p95 is None:
+            return None
+        return max(p95, float(values['hedge_min_delay']))
+
+    def describe_limits(self) -> str:
+        """Resumo dos limites de concorrência aprendidos por host"""
+        with self._lock:
+            items = sorted(self._controllers.items())
+        return ", ".join(f"{host}={controller.current_limit()}/{controller.ceiling}" for host, controller in items)
+
+_network_profile: Optional[NetworkProfile] = None
+_host_limiter: Optional[HostLimiter] = None
+
+def apply_network_profile(name: str = "") -> NetworkProfile:
+    """Ativa um perfil de rede para todas as requisições da execução"""
+    global _network_profile, _host_limiter
+    _network_profile = load_network_profile(name)
+    _host_limiter = HostLimiter(_network_profile)
+    return _network_profile
+
+def get_network_profile() -> NetworkProfile:
+    """Obtém o perfil de rede ativo (carrega o padrão na primeira chamada)"""
+    if _network_profile is None:
+        apply_network_profile()
+    return _network_profile
+
+def get_host_limiter() -> HostLimiter:
+    """Obtém o limitador por host do perfil de rede ativo"""
+    if _host_limiter is None:
+        apply_network_profile()
+    return _host_limiter
+
 def create_browser_request(url: str, referer: str = None, is_preflight: bool = False, domain_specific: bool = False) -> Request:
     """Cria um request com headers similares ao código C# CreateBrowserGetRequest"""
     # Seleciona User-Agent aleatório para rotação
@@ -241,16 +1000,24 @@ def create_browser_request(url: str, referer: str = None, is_preflight: bool = F
 
     return req
 
-def make_http_request(url: str, timeout: int = TIMEOUT_SECONDS, max_retries: int = 3) -> Tuple[Optional[bytes], Optional[str], int]:
+def make_http_request(url: str, timeout: Optional[float] = None, max_retries: Optional[int] = None) -> Tuple[Optional[bytes], Optional[str], int]:
     """
     Faz uma requisição HTTP simples e eficiente usando urllib básico
     """
+    return get_single_flight().run_sync(
+        "GET", url,
+        lambda: _make_http_request(url, timeout, max_retries or get_network_profile().max_retries),
+        cacheable=lambda response: response[0] is not None
+    )
+
+def _make_http_request(url: str, timeout: Optional[float], max_retries: int) -> Tuple[Optional[bytes], Optional[str], int]:
     for attempt in range(max_retries):
         try:
             req = Request(url)
-            with urlopen(req, timeout=timeout) as response:
-                content = response.read()
-                return content, None, response.getcode()
+            with get_host_limiter().sync_slot(url) as host_settings:
+                with urlopen(req, timeout=timeout or host_settings.read_timeout) as response:
+                    content = response.read()
+                    return content, None, response.getcode()
 
         except HTTPError as e:
             if attempt == max_retries - 1:  # Última tentativa
@@ -270,14 +1037,22 @@ def make_http_request(url: str, timeout: int = TIMEOUT_SECONDS, max_retries: int
 
     return None, "Unknown error", 0
 
-def fetch_github_releases(api_url: str, timeout: int = TIMEOUT_SECONDS) -> Tuple[Optional[bytes], Optional[str], int]:
+def fetch_github_releases(api_url: str, timeout: Optional[float] = None) -> Tuple[Optional[bytes], Optional[str], int]:
     """Faz request simples para GitHub API usando urllib básico"""
+    return get_single_flight().run_sync(
+        "GET", api_url,
+        lambda: _fetch_github_releases(api_url, timeout),
+        cacheable=lambda response: response[0] is not None
+    )
+
+def _fetch_github_releases(api_url: str, timeout: Optional[float]) -> Tuple[Optional[bytes], Optional[str], int]:
     for attempt in range(3):  # Menos tentativas para GitHub
         try:
             req = Request(api_url)
-            with urlopen(req, timeout=timeout) as response:
-                content = response.read()
-                return content, None, response.getcode()
+            with get_host_limiter().sync_slot(api_url) as host_settings:
+                with urlopen(req, timeout=timeout or host_settings.read_timeout) as response:
+                    content = response.read()
+                    return content, None, response.getcode()
 
         except HTTPError as e:
             if e.code == 403:  # Rate limit
@@ -373,6 +1148,232 @@ class SimpleProgressBar:
 
         print()  # Nova linha
 
+# componente_yyyyMMdd_HHmmss.bak ou componente_pre_restore_yyyyMMdd_HHmmss.bak
+BACKUP_NAME_PATTERN = re.compile(r'^(.+?)(?:_(pre_restore))?_(\d{8})_(\d{6})\.bak$')
+
+class BackupCatalog:
+    """Catálogo indexado dos backups
+
+    O catálogo é persistido como um log append-only (uma operação JSON por linha)
+    e mantido em memória como índices ordenados: as chaves de componente ficam em
+    uma lista ordenada (busca por prefixo com bisect) e os backups de cada
+    componente ficam ordenados por data (corte por idade com bisect).
+    """
+
+    def __init__(self, catalog_file: Path):
+        self.catalog_file = catalog_file
+        self._entries: Dict[str, Dict] = {}
+        self._index: Dict[str, List[Tuple[float, str]]] = {}
+        self._keys: List[str] = []
+        self._log_lines = 0
+
+    def load(self) -> None:
+        """Carrega o catálogo do disco (reconcilia com a pasta se ainda não existir)"""
+        self._entries.clear()
+        self._index.clear()
+        self._keys.clear()
+        self._log_lines = 0
+
+        if not self.catalog_file.exists():
+            if BACKUP_PATH.exists() and any(BACKUP_PATH.glob("*.bak")):
+                self.reconcile(verbose=False)
+            return
+
+        try:
+            with open(self.catalog_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    self._log_lines += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get('op') == 'remove':
+                        self._unindex(record['FileName'])
+                    else:
+                        self._index_entry(self._upgrade_record(record))
+        except OSError as e:
+            print_colored(f"Erro ao ler catálogo de backups: {e}", "yellow")
+
+    def add(self, backup_file: Path, source_name: str = "") -> Dict:
+        """Registra um novo backup no catálogo (o tipo vem do nome do arquivo)"""
+        entry = self._entry_from_file(backup_file, source_name)
+        if entry:
+            self._index_entry(entry)
+            self._append({'op': 'add', **entry})
+        return entry
+
+    def remove(self, file_name: str) -> None:
+        """Remove um backup do catálogo"""
+        if file_name in self._entries:
+            self._unindex(file_name)
+            self._append({'op': 'remove', 'FileName': file_name})
+            # Compacta o log quando a maioria das linhas já não representa backups ativos
+            if self._log_lines > 2 * len(self._entries) + 100:
+                self.compact()
+
+    def query(self, component_name: str = "", older_than_days: Optional[int] = None) -> List[Dict]:
+        """Consulta backups por prefixo de componente e idade (mais de N dias)"""
+        now = datetime.now()
+        cutoff = None
+        if older_than_days is not None:
+            cutoff = (now - timedelta(days=older_than_days + 1)).timestamp()
+
+        prefix = component_name.lower()
+        start = bisect.bisect_left(self._keys, prefix)
+        results = []
+        for key in self._keys[start:]:
+            if not key.startswith(prefix):
+                break
+            items = self._index[key]
+            end = bisect.bisect_right(items, (cutoff, '\uffff')) if cutoff is not None else len(items)
+            for timestamp, file_name in items[:end]:
+                entry = self._entries[file_name]
+                backup_date = datetime.fromtimestamp(timestamp)
+                results.append({
+                    'Component': entry['Component'],
+                    'FileName': file_name,
+                    'FullPath': str(BACKUP_PATH / file_name),
+                    'BackupDate': backup_date,
+                    'DaysOld': (now - backup_date).days,
+                    'SizeKB': round(entry['SizeBytes'] / 1024, 2),
+                    'Source': entry.get('Source', ''),
+                    'Kind': entry.get('Kind', 'update')
+                })
+
+        return results
+
+    def reconcile(self, verbose: bool = True) -> Tuple[int, int]:
+        """Sincroniza o catálogo com os arquivos .bak existentes na pasta"""
+        on_disk = {f.name: f for f in BACKUP_PATH.glob("*.bak")} if BACKUP_PATH.exists() else {}
+
+        added = 0
+        for file_name, file in on_disk.items():
+            if file_name not in self._entries:
+                entry = self._entry_from_file(file)
+                if entry:
+                    self._index_entry(entry)
+                    added += 1
+
+        missing = [name for name in self._entries if name not in on_disk]
+        for file_name in missing:
+            self._unindex(file_name)
+
+        self.compact()
+
+        if verbose:
+            print_colored(f"Catálogo de backups reconciliado: {added} adicionados, {len(missing)} removidos, {len(self._entries)} no total", "green")
+
+        return added, len(missing)
+
+    def compact(self) -> None:
+        """Reescreve o log do catálogo apenas com os backups ativos"""
+        if not BACKUP_PATH.exists():
+            BACKUP_PATH.mkdir(parents=True)
+
+        temp_file = self.catalog_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            for entry in self._entries.values():
+                f.write(json.dumps({'op': 'add', **entry}, ensure_ascii=False) + "\n")
+        temp_file.replace(self.catalog_file)
+        self._log_lines = len(self._entries)
+
+    def _append(self, record: Dict) -> None:
+        if not BACKUP_PATH.exists():
+            BACKUP_PATH.mkdir(parents=True)
+
+        with open(self.catalog_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._log_lines += 1
+
+    def _entry_from_file(self, backup_file: Path, source_name: str = "") -> Optional[Dict]:
+        # Extrai informações do nome do arquivo: componente_yyyyMMdd_HHmmss.bak
+        match = BACKUP_NAME_PATTERN.match(backup_file.name)
+        if not match:
+            return None
+
+        try:
+            stat = backup_file.stat()
+        except OSError:
+            return None
+
+        component = match.group(1)
+        try:
+            backup_date = datetime.strptime(f"{match.group(3)}{match.group(4)}", "%Y%m%d%H%M%S")
+        except ValueError:
+            # Se não conseguir parsear a data, usa a data de modificação do arquivo
+            backup_date = datetime.fromtimestamp(stat.st_mtime)
+
+        if not source_name and (AVAILABLE_VERSIONS_PATH / component).is_file():
+            source_name = component
+
+        return {
+            'FileName': backup_file.name,
+            'Component': component,
+            'Timestamp': backup_date.timestamp(),
+            'SizeBytes': stat.st_size,
+            'Source': source_name,
+            'Kind': match.group(2) or 'update'
+        }
+
+    @staticmethod
+    def _upgrade_record(record: Dict) -> Dict:
+        # Registros antigos guardavam o backup pré-restauração como componente "<nome>_pre_restore"
+        if 'Kind' not in record:
+            match = BACKUP_NAME_PATTERN.match(record['FileName'])
+            record = {**record, 'Kind': (match and match.group(2)) or 'update'}
+            if match:
+                record['Component'] = match.group(1)
+        return record
+
+    def _index_entry(self, entry: Dict) -> None:
+        file_name = entry['FileName']
+        if file_name in self._entries:
+            self._unindex(file_name)
+
+        self._entries[file_name] = {k: v for k, v in entry.items() if k != 'op'}
+        key = entry['Component'].lower()
+        if key not in self._index:
+            bisect.insort(self._keys, key)
+            self._index[key] = []
+        bisect.insort(self._index[key], (entry['Timestamp'], file_name))
+
+    def _unindex(self, file_name: str) -> None:
+        entry = self._entries.pop(file_name, None)
+        if not entry:
+            return
+
+        key = entry['Component'].lower()
+        items = self._index.get(key, [])
+        position = bisect.bisect_left(items, (entry['Timestamp'], file_name))
+        if position < len(items) and items[position] == (entry['Timestamp'], file_name):
+            items.pop(position)
+        if not items:
+            self._index.pop(key, None)
+            position = bisect.bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                self._keys.pop(position)
+
+_backup_catalog: Optional[BackupCatalog] = None
+
+def get_backup_catalog() -> BackupCatalog:
+    """Obtém o catálogo de backups (carregado uma única vez por execução)"""
+    global _backup_catalog
+    if _backup_catalog is None:
+        _backup_catalog = BackupCatalog(BACKUP_CATALOG_FILE)
+        _backup_catalog.load()
+    return _backup_catalog
+
+def remove_backup_file(backup: Dict) -> None:
+    """Remove o arquivo de backup e sua entrada no catálogo"""
+    try:
+        Path(backup['FullPath']).unlink()
+    except FileNotFoundError:
+        pass
+    get_backup_catalog().remove(backup['FileName'])
+
 def create_backup(file_path: Path) -> None:
     """Cria backup do arquivo"""
     if not BACKUP_PATH.exists():
@@ -382,8 +1383,8 @@ def create_backup(file_path: Path) -> None:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_file = BACKUP_PATH / f"{file_name}_{timestamp}.bak"
 
-    import shutil
     shutil.copy2(file_path, backup_file)
+    get_backup_catalog().add(backup_file, file_name)
 
     print_colored(f"Backup criado: {backup_file}", "green")
 
@@ -396,14 +1397,14 @@ def clear_old_backups(file_name: str, keep_count: int = 10) -> None:
         return
 
     base_file_name = file_name.replace('.cs', '')
-    backup_files = list(BACKUP_PATH.glob(f"{base_file_name}*.bak"))
-    backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+    backup_files = get_backup_catalog().query(base_file_name)
+    backup_files.sort(key=lambda x: x['BackupDate'], reverse=True)
 
     if len(backup_files) > keep_count:
         files_to_remove = backup_files[keep_count:]
-        for file in files_to_remove:
-            file.unlink()
-            print_colored(f"  Backup antigo removido: {file.name}", "gray")
+        for backup in files_to_remove:
+            remove_backup_file(backup)
+            print_colored(f"  Backup antigo removido: {backup['FileName']}", "gray")
         print_colored(f"  {len(files_to_remove)} backups antigos removidos (mantidos {keep_count} mais recentes)", "gray")
 
 def parse_cs_versions(file_path: Path) -> List[Dict]:
@@ -452,156 +1453,196 @@ def get_cs_component_info(file_path: Path) -> Tuple[str, str]:
         print_colored(f"Erro ao ler informações do componente: {e}", "red")
         return "", ""
 
+def render_cs_versions(file_path: Path, versions: List[Dict]) -> Tuple[str, str]:
+    """Retorna (conteúdo atual, conteúdo com a nova lista de versões) de um arquivo CS"""
+    # Lê o arquivo original para manter a estrutura
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Gera o novo conteúdo da lista de versões
+    version_lines = []
+    for version in versions:
+        version_lines.append(f'            new VersionInfo("{version["version"]}", "{version["url"]}")')
+
+    version_list_content = ',\n'.join(version_lines)
+
+    # Substitui o conteúdo da lista de versões
+    # Padrão: private static readonly List<VersionInfo> _versions = new List<VersionInfo> { ... };
+    pattern = r'(private\s+static\s+readonly\s+List<VersionInfo>\s+_versions\s*=\s*new\s+List<VersionInfo>\s*\{).*?(\s*\};)'
+    # O grupo 2 já inclui a quebra de linha e a indentação do fechamento
+    replacement = rf'\1\n{version_list_content}\2'
+
+    return content, re.sub(pattern, replacement, content, flags=re.DOTALL)
+
 def write_cs_versions(file_path: Path, versions: List[Dict], component_name: str = "", component_id: str = "") -> None:
     """Escreve versões em um arquivo CS mantendo a estrutura"""
     try:
-        # Lê o arquivo original para manter a estrutura
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Se não tiver component_name/id, tenta extrair do arquivo
-        if not component_name or not component_id:
-            component_name, component_id = get_cs_component_info(file_path)
-        
-        # Gera o novo conteúdo da lista de versões
-        version_lines = []
-        for version in versions:
-            version_lines.append(f'            new VersionInfo("{version["version"]}", "{version["url"]}")')
-        
-        version_list_content = ',\n'.join(version_lines)
-        
-        # Substitui o conteúdo da lista de versões
-        # Padrão: private static readonly List<VersionInfo> _versions = new List<VersionInfo> { ... };
-        pattern = r'(private\s+static\s+readonly\s+List<VersionInfo>\s+_versions\s*=\s*new\s+List<VersionInfo>\s*\{).*?(\s*\};)'
-        replacement = rf'\1\n{version_list_content}        \2'
-        
-        new_content = re.sub(pattern, replacement, content, flags=re.DOTALL)
-        
+        _, new_content = render_cs_versions(file_path, versions)
+
         # Salva o arquivo atualizado
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
-        
+
     except Exception as e:
         print_colored(f"Erro ao escrever arquivo CS: {e}", "red")
 
-def get_failed_versions_cache(component_name: str) -> List[Dict]:
-    """Obtém cache de versões falhadas"""
-    if not CACHE_PATH.exists():
-        CACHE_PATH.mkdir(parents=True)
+def update_cs_versions(file_path: Path, versions: List[Dict]) -> bool:
+    """Regrava o provider (com backup) apenas se o conteúdo mudar; retorna True se gravou"""
+    try:
+        content, new_content = render_cs_versions(file_path, versions)
+    except Exception as e:
+        print_colored(f"Erro ao escrever arquivo CS: {e}", "red")
+        return False
+
+    if new_content == content:
+        print_colored("Conteúdo do provider inalterado; arquivo não regravado", "gray")
+        return False
 
+    create_backup(file_path)
+    write_cs_versions(file_path, versions)
+    return True
+
+def classify_failure(status_code: int, error_class: str) -> str:
+    """Classe de falha usada para definir a validade da entrada no cache"""
+    if status_code in (404, 410):
+        return "gone"
+    if status_code in (401, 403, 429):
+        return "blocked"
+    if status_code >= 500:
+        return "server"
+    if error_class in ("timeout", "connect"):
+        return error_class
+    return "other"
+
+def failure_expires_at(entry: Dict) -> datetime:
+    """Data de expiração de uma entrada (entradas antigas, sem ExpiresAt, valem 7 dias)"""
+    if entry.get('ExpiresAt'):
+        return datetime.fromisoformat(entry['ExpiresAt'])
+    return datetime.fromisoformat(entry['FailedDate']) + timedelta(days=7)
+
+def load_failed_versions_file(component_name: str) -> List[Dict]:
+    """Lê todas as entradas do cache de falhas, inclusive as expiradas"""
     cache_file = CACHE_PATH / f"{component_name}-failed.json"
+    if not cache_file.exists():
+        return []
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
-    if cache_file.exists():
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_content = json.load(f)
+def write_failed_versions_file(component_name: str, entries: List[Dict]) -> None:
+    """Grava o cache de falhas do componente (remove o arquivo se vazio)"""
+    cache_file = CACHE_PATH / f"{component_name}-failed.json"
+    if not entries:
+        if cache_file.exists():
+            cache_file.unlink()
+        return
+    if not CACHE_PATH.exists():
+        CACHE_PATH.mkdir(parents=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=2, ensure_ascii=False)
 
-            # Remove entradas antigas (mais de 7 dias)
-            cutoff_date = datetime.now() - timedelta(days=7)
-            valid_cache = [
-                entry for entry in cache_content
-                if datetime.fromisoformat(entry['FailedDate']) > cutoff_date
-            ]
+def get_failed_versions_cache(component_name: str) -> List[Dict]:
+    """Obtém cache de versões falhadas (apenas entradas ainda válidas)"""
+    if not CACHE_PATH.exists():
+        CACHE_PATH.mkdir(parents=True)
 
-            # Se houve remoção de entradas antigas, atualiza o cache
-            if len(valid_cache) != len(cache_content):
-                if len(valid_cache) == 0:
-                    cache_file.unlink()
-                    print_colored("  Cache de versões falhadas removido (expirado)", "gray")
-                else:
-                    with open(cache_file, 'w', encoding='utf-8') as f:
-                        json.dump(valid_cache, f, indent=2, ensure_ascii=False)
-                    print_colored(f"  Cache de versões falhadas limpo ({len(cache_content) - len(valid_cache)} entradas expiradas removidas)", "gray")
+    try:
+        cache_content = load_failed_versions_file(component_name)
+    except Exception as e:
+        print_colored(f"Erro ao ler cache de versões falhadas: {e}", "yellow")
+        return []
 
-            return valid_cache
-        except Exception as e:
-            print_colored(f"Erro ao ler cache de versões falhadas: {e}", "yellow")
-            return []
+    now = datetime.now()
 
-    return []
+    # Remove do arquivo apenas entradas expiradas há mais tempo que o período de retenção
+    retention_cutoff = now - timedelta(days=FAILURE_CACHE_RETENTION_DAYS)
+    retained = [entry for entry in cache_content if failure_expires_at(entry) > retention_cutoff]
+    if len(retained) != len(cache_content):
+        write_failed_versions_file(component_name, retained)
+        print_colored(f"  Cache de versões falhadas limpo ({len(cache_content) - len(retained)} entradas antigas removidas)", "gray")
+
+    return [entry for entry in retained if failure_expires_at(entry) > now]
 
 def save_failed_versions_cache(component_name: str, failed_versions: List[Dict]) -> None:
-    """Salva versões falhadas no cache"""
+    """Salva versões falhadas no cache com validade por classe de erro e backoff exponencial"""
     if not failed_versions:
         return
 
-    if not CACHE_PATH.exists():
-        CACHE_PATH.mkdir(parents=True)
-
-    cache_file = CACHE_PATH / f"{component_name}-failed.json"
-
-    # Carrega cache existente
-    existing_cache = get_failed_versions_cache(component_name)
+    try:
+        all_cached_versions = load_failed_versions_file(component_name)
+    except Exception as e:
+        print_colored(f"Erro ao ler cache de versões falhadas: {e}", "yellow")
+        all_cached_versions = []
 
-    # Adiciona novas versões falhadas
-    current_date = datetime.now().isoformat()
+    now = datetime.now()
+    entry_index = {(entry['Version'], entry['Url']): i for i, entry in enumerate(all_cached_versions)}
     new_failed_entries = []
     for version in failed_versions:
-        new_failed_entries.append({
+        key = (version['version'], version['url'])
+        previous = all_cached_versions[entry_index[key]] if key in entry_index else None
+        failure_class = version.get('ErrorClass', 'other')
+        attempts = previous.get('Attempts', 1) + 1 if previous else 1
+        ttl_hours = min(FAILURE_CACHE_TTL_HOURS.get(failure_class, FAILURE_CACHE_TTL_HOURS['other']) * 2 ** (attempts - 1),
+                        FAILURE_CACHE_MAX_TTL_HOURS)
+
+        new_entry = {
             'Version': version['version'],
             'Url': version['url'],
-            'FailedDate': current_date,
-            'ErrorMessage': getattr(version, 'ErrorMessage', version.get('ErrorMessage', ''))
-        })
-
-    # Combina com cache existente (evita duplicatas)
-    all_cached_versions = existing_cache[:]
-    for new_entry in new_failed_entries:
-        existing = next(
-            (entry for entry in all_cached_versions
-             if entry['Version'] == new_entry['Version'] and entry['Url'] == new_entry['Url']),
-            None
-        )
-        if not existing:
+            'FailedDate': now.isoformat(),
+            'ErrorMessage': version.get('ErrorMessage', ''),
+            'ErrorClass': failure_class,
+            'StatusCode': version.get('StatusCode', 0),
+            'Attempts': attempts,
+            'ExpiresAt': (now + timedelta(hours=ttl_hours)).isoformat()
+        }
+        if previous:
+            all_cached_versions[entry_index[key]] = new_entry
+        else:
+            entry_index[key] = len(all_cached_versions)
             all_cached_versions.append(new_entry)
+        new_failed_entries.append(new_entry)
 
     # Salva cache atualizado
-    with open(cache_file, 'w', encoding='utf-8') as f:
-        json.dump(all_cached_versions, f, indent=2, ensure_ascii=False)
+    write_failed_versions_file(component_name, all_cached_versions)
 
     print_colored(f"  Cache de versões falhadas atualizado: {len(new_failed_entries)} novas entradas", "gray")
 
-def get_backup_info(component_name: str = "") -> List[Dict]:
-    """Obtém informações dos backups"""
-    if not BACKUP_PATH.exists():
-        return []
+def retry_transient_failures(component_name: str = "") -> None:
+    """Remove do cache as falhas transitórias (bloqueio, 5xx, timeout, conexão) para que sejam verificadas novamente"""
+    if not CACHE_PATH.exists():
+        print_colored("Nenhum cache encontrado", "gray")
+        return
 
-    filter_pattern = f"{component_name}*.bak" if component_name else "*.bak"
-    backup_files = list(BACKUP_PATH.glob(filter_pattern))
-    backup_files = [f for f in backup_files if not f.name.endswith("failed.json")]
+    if component_name:
+        components = [component_name.lower()]
+    else:
+        components = [cache_file.stem.replace('-failed', '') for cache_file in CACHE_PATH.glob("*-failed.json")]
 
-    backup_info = []
-    for file in backup_files:
-        # Extrai informações do nome do arquivo: componente_yyyyMMdd_HHmmss.bak
-        match = re.match(r'^(.+?)_(\d{8})_(\d{6})\.bak$', file.name)
-        if match:
-            component = match.group(1)
-            date_string = match.group(2)
-            time_string = match.group(3)
+    total_removed = 0
+    for component in components:
+        try:
+            entries = load_failed_versions_file(component)
+        except Exception as e:
+            print_colored(f"Erro ao processar cache de {component}: {e}", "yellow")
+            continue
 
-            try:
-                backup_date = datetime.strptime(f"{date_string}{time_string}", "%Y%m%d%H%M%S")
-                days_old = (datetime.now() - backup_date).days
+        kept = [entry for entry in entries if entry.get('ErrorClass', 'other') not in TRANSIENT_FAILURE_CLASSES]
+        removed = len(entries) - len(kept)
+        if removed:
+            write_failed_versions_file(component, kept)
+            print_colored(f"Cache de {component}: {removed} falhas transitórias liberadas para nova verificação", "yellow")
+            total_removed += removed
 
-                backup_info.append({
-                    'Component': component,
-                    'FileName': file.name,
-                    'FullPath': str(file),
-                    'BackupDate': backup_date,
-                    'DaysOld': days_old,
-                    'SizeKB': round(file.stat().st_size / 1024, 2)
-                })
-            except ValueError:
-                # Se não conseguir parsear a data, adiciona com data desconhecida
-                backup_info.append({
-                    'Component': component,
-                    'FileName': file.name,
-                    'FullPath': str(file),
-                    'BackupDate': file.stat().st_mtime,
-                    'DaysOld': (datetime.now() - datetime.fromtimestamp(file.stat().st_mtime)).days,
-                    'SizeKB': round(file.stat().st_size / 1024, 2)
-                })
+    if total_removed:
+        print_colored(f"Total: {total_removed} versões serão verificadas novamente na próxima atualização", "green")
+    else:
+        print_colored("Nenhuma falha transitória no cache", "gray")
+
+def get_backup_info(component_name: str = "", older_than_days: Optional[int] = None) -> List[Dict]:
+    """Obtém informações dos backups"""
+    if not BACKUP_PATH.exists():
+        return []
 
+    backup_info = get_backup_catalog().query(component_name or "", older_than_days)
     return sorted(backup_info, key=lambda x: (x['Component'], x['BackupDate']), reverse=True)
 
 def show_backup_info(component_name: str = "") -> None:
@@ -611,6 +1652,15 @@ def show_backup_info(component_name: str = "") -> None:
 
     backups = get_backup_info(component_name)
 
+    # Entradas do catálogo sem arquivo (backups apagados fora do script) saem da listagem e do catálogo
+    missing = [backup for backup in backups if not Path(backup['FullPath']).exists()]
+    for backup in missing:
+        get_backup_catalog().remove(backup['FileName'])
+    if missing:
+        print_colored(f"{len(missing)} backups sem arquivo removidos do catálogo", "yellow")
+        missing_names = {backup['FileName'] for backup in missing}
+        backups = [backup for backup in backups if backup['FileName'] not in missing_names]
+
     if not backups:
         print_colored("Nenhum backup encontrado", "gray")
         return
@@ -626,17 +1676,17 @@ def show_backup_info(component_name: str = "") -> None:
             current_component = backup['Component']
 
         age_status = " (ANTIGO)" if backup['DaysOld'] > 30 else ""
+        kind_status = " [pré-restauração]" if backup['Kind'] == 'pre_restore' else ""
         date_formatted = backup['BackupDate'].strftime("%d/%m/%Y %H:%M:%S")
 
-        print_colored(f"  • {backup['FileName']} - {date_formatted} ({backup['DaysOld']} dias) - {backup['SizeKB']} KB{age_status}", "gray")
+        print_colored(f"  • {backup['FileName']} - {date_formatted} ({backup['DaysOld']} dias) - {backup['SizeKB']} KB{age_status}{kind_status}", "gray")
         total_size += backup['SizeKB']
 
     print_colored(f"\nTotal: {len(backups)} backups - {round(total_size, 2)} KB", "green")
 
 def clear_old_backups_manual(component_name: str = "", days_old: int = 30) -> None:
     """Limpa backups antigos manualmente"""
-    backups = get_backup_info(component_name)
-    old_backups = [b for b in backups if b['DaysOld'] > days_old]
+    old_backups = get_backup_info(component_name, days_old)
 
     if not old_backups:
         scope_text = f"de {component_name} " if component_name else ""
@@ -653,7 +1703,7 @@ def clear_old_backups_manual(component_name: str = "", days_old: int = 30) -> No
     confirm = input("\nConfirma a remoção? (s/N): ").strip().lower()
     if confirm == "s":
         for backup in old_backups:
-            Path(backup['FullPath']).unlink()
+            remove_backup_file(backup)
         print_colored(f"{len(old_backups)} backups removidos com sucesso", "green")
 
 def clear_all_backups(component_name: str = "") -> None:
@@ -675,7 +1725,7 @@ def clear_all_backups(component_name: str = "") -> None:
     confirm = input("\nConfirma a remoção de TODOS os backups? (s/N): ").strip().lower()
     if confirm == "s":
         for backup in backups:
-            Path(backup['FullPath']).unlink()
+            remove_backup_file(backup)
         print_colored(f"{len(backups)} backups removidos com sucesso", "green")
 
 def show_failed_versions_cache() -> None:
@@ -706,10 +1756,13 @@ def show_failed_versions_cache() -> None:
 
             for entry in cache_content:
                 days_since = (datetime.now() - datetime.fromisoformat(entry['FailedDate'])).days
-                status = " (EXPIRADO)" if days_since > 7 else ""
+                status = " (EXPIRADO)" if failure_expires_at(entry) <= datetime.now() else ""
                 print_colored(f"  • {entry['Version']} - Falhou há {days_since} dias{status}", "gray")
                 print_colored(f"    URL: {entry['Url']}", "gray")
                 print_colored(f"    Erro: {entry['ErrorMessage']}", "gray")
+                if entry.get('ErrorClass'):
+                    print_colored(f"    Classe: {entry['ErrorClass']} (HTTP {entry.get('StatusCode', 0)}) | "
+                                  f"Tentativas: {entry.get('Attempts', 1)} | Expira: {failure_expires_at(entry).strftime('%d/%m/%Y %H:%M')}", "gray")
 
         except Exception as e:
             print_colored(f"Erro ao ler cache de {component_name}: {e}", "yellow")
@@ -777,7 +1830,7 @@ def clear_expired_cache() -> None:
         print_colored("Nenhum cache encontrado", "gray")
         return
 
-    cutoff_date = datetime.now() - timedelta(days=7)
+    now = datetime.now()
     removed_count = 0
     total_files = 0
 
@@ -793,7 +1846,7 @@ def clear_expired_cache() -> None:
             # Remove entradas expiradas
             valid_cache = [
                 entry for entry in cache_content
-                if datetime.fromisoformat(entry['FailedDate']) > cutoff_date
+                if failure_expires_at(entry) > now
             ]
 
             if len(valid_cache) != original_count:
@@ -900,7 +1953,7 @@ def show_cache_management_menu() -> None:
         print_colored("1. Visualizar cache de versões falhadas")
         print_colored("2. Limpar cache de um componente específico")
         print_colored("3. Limpar todo o cache")
-        print_colored("4. Limpar cache expirado (mais de 7 dias)")
+        print_colored("4. Limpar cache expirado")
         print_colored("")
         print_colored("--- Gerenciamento de Backups ---")
         print_colored("5. Visualizar backups")
@@ -951,7 +2004,8 @@ def restore_backup(component_name: str = "") -> None:
     print_colored("\nBackups disponíveis:", "yellow")
     for i, backup in enumerate(backups):
         date_formatted = backup['BackupDate'].strftime("%d/%m/%Y %H:%M:%S")
-        print_colored(f"{i + 1}. {backup['Component']} - {date_formatted} ({backup['DaysOld']} dias)", "gray")
+        kind_status = " [pré-restauração]" if backup['Kind'] == 'pre_restore' else ""
+        print_colored(f"{i + 1}. {backup['Component']} - {date_formatted} ({backup['DaysOld']} dias){kind_status}", "gray")
 
     try:
         choice = int(input(f"\nEscolha o backup para restaurar (1-{len(backups)}): ")) - 1
@@ -961,11 +2015,18 @@ def restore_backup(component_name: str = "") -> None:
 
     if 0 <= choice < len(backups):
         selected_backup = backups[choice]
-        original_file = AVAILABLE_VERSIONS_PATH / f"{selected_backup['Component']}.json"
+        source_name = selected_backup['Source'] or f"{selected_backup['Component']}.json"
+        original_file = AVAILABLE_VERSIONS_PATH / source_name
+
+        # Entrada do catálogo sem arquivo (backup apagado fora do script)
+        if not Path(selected_backup['FullPath']).exists():
+            get_backup_catalog().remove(selected_backup['FileName'])
+            print_colored(f"Arquivo de backup não encontrado: {selected_backup['FileName']} (removido do catálogo)", "red")
+            return
 
         print_colored("\nRestaurar:", "yellow")
         print_colored(f"  De: {selected_backup['FileName']}", "gray")
-        print_colored(f"  Para: {selected_backup['Component']}.json", "gray")
+        print_colored(f"  Para: {source_name}", "gray")
 
         if original_file.exists():
             print_colored("  ⚠ O arquivo atual será sobrescrito", "red")
@@ -976,12 +2037,11 @@ def restore_backup(component_name: str = "") -> None:
             if original_file.exists():
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 pre_restore_backup = BACKUP_PATH / f"{selected_backup['Component']}_pre_restore_{timestamp}.bak"
-                import shutil
                 shutil.copy2(original_file, pre_restore_backup)
+                get_backup_catalog().add(pre_restore_backup, source_name)
                 print_colored(f"Backup pré-restauração criado: {pre_restore_backup}", "green")
 
             # Restaura o backup
-            import shutil
             shutil.copy2(selected_backup['FullPath'], original_file)
             print_colored("Backup restaurado com sucesso!", "green")
     else:
@@ -1049,38 +2109,501 @@ def normalize_version(version_string: str, component_name: str = "") -> Optional
 
     return None
 
+def is_definitive_check(result: UrlCheckResult) -> bool:
+    """Indica se o resultado de uma verificação pode ser reaproveitado na execução"""
+    return result.is_valid or result.status_code in (404, 410)
+
 async def test_url_valid_async(url: str) -> UrlCheckResult:
     """Verifica se uma URL é válida usando aiohttp (versão assíncrona)"""
+    return await get_single_flight().run("HEAD", url, lambda: _test_url_valid_async(url), cacheable=is_definitive_check)
+
+def circuit_open_result(url: str) -> UrlCheckResult:
+    """Resultado "unknown" para URL cujo host está com o circuito aberto"""
+    result = UrlCheckResult(url)
+    result.is_unknown = True
+    result.error_class = "circuit"
+    result.error_message = f"Circuito aberto para {host_of(url)} (host indisponível)"
+    return result
+
+class RedirectCache:
+    """Cache persistente de cadeias de redirecionamento (URL original -> destino final + validadores)
+
+    Validações seguintes vão direto ao destino final com requisição condicional;
+    a cadeia só é resolvida de novo quando o destino em cache falha. URLs cujo
+    destino muda a cada execução (links assinados que expiram) deixam de usar o cache.
+    """
+    MAX_MISSES = 2
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = cache_file
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.cache_file.exists():
+                try:
+                    with open(self.cache_file, 'r', encoding='utf-8') as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError):
+                    self._entries = {}
+        return self._entries
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Entrada utilizável do cache para a URL (None se ausente ou instável)"""
+        with self._lock:
+            entry = self._load().get(url)
+            if entry and entry.get('misses', 0) < self.MAX_MISSES:
+                return dict(entry)
+            return None
+
+    def update(self, url: str, final_url: str, hops: int, etag: str, last_modified: str, content_length: int) -> None:
+        with self._lock:
+            entries = self._load()
+            previous = entries.get(url, {})
+            misses = previous.get('misses', 0) if previous.get('final') != final_url else 0
+            entries[url] = {
+                'final': final_url,
+                'hops': hops,
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_length': content_length,
+                'misses': misses,
+                'updated': datetime.now().isoformat()
+            }
+            self._dirty = True
+
+    def record_hit(self, url: str, etag: str, last_modified: str) -> None:
+        with self._lock:
+            entry = self._load().get(url)
+            if entry:
+                entry['misses'] = 0
+                entry['etag'] = etag or entry.get('etag', '')
+                entry['last_modified'] = last_modified or entry.get('last_modified', '')
+                self._dirty = True
+
+    def record_miss(self, url: str) -> None:
+        with self._lock:
+            entry = self._load().get(url)
+            if entry:
+                entry['misses'] = entry.get('misses', 0) + 1
+                self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            if not self.cache_file.parent.exists():
+                self.cache_file.parent.mkdir(parents=True)
+            temp_file = self.cache_file.with_suffix('.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            temp_file.replace(self.cache_file)
+            self._dirty = False
+
+_redirect_cache: Optional[RedirectCache] = None
+
+def get_redirect_cache() -> RedirectCache:
+    """Obtém o cache de redirecionamentos da execução"""
+    global _redirect_cache
+    if _redirect_cache is None:
+        _redirect_cache = RedirectCache(REDIRECT_CACHE_FILE)
+    return _redirect_cache
+
+async def _head_request(url: str, settings: HostSettings, target: str = "", validators: Optional[Dict] = None) -> Tuple[UrlCheckResult, bool]:
+    """Executa um HEAD em uma sessão (conexão) própria; retorna (resultado, houve timeout)
+
+    Sem target, segue os redirecionamentos e grava a cadeia no cache. Com target
+    (destino final em cache), faz um HEAD condicional direto ao destino.
+    """
     result = UrlCheckResult(url)
+    timed_out = False
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
 
     try:
-        timeout = aiohttp.ClientTimeout(total=TIMEOUT_SECONDS)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.head(url) as response:
+        timeout = settings.client_timeout(_validation_phase.get())
+        async with http_session(timeout) as session:
+            async with session.head(target or url, headers=headers, allow_redirects=not target, timeout=timeout) as response:
                 result.status_code = response.status
-                result.is_valid = response.status < 400
+                if target:
+                    # O destino final deve responder diretamente (304 = inalterado)
+                    result.is_valid = 200 <= response.status < 300 or response.status == 304
+                else:
+                    result.is_valid = response.status < 400
+                if not result.is_valid:
+                    result.error_class = "http"
 
                 # Obtém tamanho do conteúdo se disponível
                 content_length = response.headers.get('Content-Length')
                 if content_length:
                     result.content_length = int(content_length)
+                elif response.status == 304 and validators:
+                    result.content_length = validators.get('content_length', 0)
+                result.etag = response.headers.get('ETag', '')
+                result.last_modified = response.headers.get('Last-Modified', '')
+
+                if not target and response.history and result.is_valid:
+                    get_redirect_cache().update(url, str(response.url), len(response.history),
+                                                result.etag, result.last_modified, result.content_length)
 
     except asyncio.TimeoutError:
+        timed_out = True
         result.is_valid = False
         result.error_message = "Timeout"
+        result.error_class = "timeout"
         result.status_code = 408
+    except (aiohttp.ClientConnectionError, OSError) as e:
+        result.is_valid = False
+        result.error_message = str(e)
+        result.error_class = "connect"
+        result.status_code = 0
     except aiohttp.ClientError as e:
         result.is_valid = False
         result.error_message = str(e)
+        result.error_class = "other"
         result.status_code = 0
     except Exception as e:
         result.is_valid = False
         result.error_message = str(e)
+        result.error_class = "other"
+
+    return result, timed_out
+
+async def _head_once(url: str, settings: HostSettings) -> Tuple[UrlCheckResult, bool]:
+    """HEAD de uma URL, indo direto ao destino final quando a cadeia de redirecionamentos está em cache"""
+    redirect_cache = get_redirect_cache()
+    entry = redirect_cache.get(url)
+    if entry:
+        result, timed_out = await _head_request(url, settings, target=entry['final'], validators=entry)
+        if result.is_valid:
+            if result.status_code == 304:
+                result.status_code = 200
+            redirect_cache.record_hit(url, result.etag, result.last_modified)
+            return result, timed_out
+        if timed_out:
+            return result, timed_out
+        # Destino em cache falhou: resolve a cadeia novamente a partir da URL original
+        redirect_cache.record_miss(url)
+
+    return await _head_request(url, settings)
+
+async def _head_hedged(url: str, settings: HostSettings, hedge_delay: Optional[float]) -> Tuple[UrlCheckResult, bool]:
+    """HEAD com hedge: passado o p95 do host, dispara uma duplicata e usa a primeira resposta"""
+    limiter = get_host_limiter()
+    limiter.hedging.note_request()
+    primary = asyncio.ensure_future(_head_once(url, settings))
+    if hedge_delay is None:
+        return await primary
+
+    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+    if done or not limiter.hedging.try_acquire():
+        return await primary
+
+    hedge = asyncio.ensure_future(_head_once(url, settings))
+    pending = {primary, hedge}
+    try:
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result, timed_out = task.result()
+                # Erro de conexão/timeout só vence se a outra requisição também falhar
+                if result.error_class not in ("timeout", "connect") or not pending:
+                    if task is hedge:
+                        limiter.hedging.note_win()
+                    return result, timed_out
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def _test_url_valid_async(url: str) -> UrlCheckResult:
+    limiter = get_host_limiter()
+    host = host_of(url)
+    if not limiter.breaker.allow(host):
+        return circuit_open_result(url)
+
+    async with limiter.slot(url) as lease:
+        # O circuito pode ter aberto enquanto a requisição aguardava vaga
+        if not limiter.breaker.allow(host):
+            return circuit_open_result(url)
+
+        started = time.monotonic()
+        result, timed_out = await _head_hedged(url, lease.settings, limiter.hedge_delay(host))
+
+        result.latency = time.monotonic() - started
+        # Timeouts da passada rápida (limites curtos) só indicam host lento: a confirmação decide,
+        # sem abrir o circuito nem reduzir o limite AIMD do host
+        if timed_out and _validation_phase.get() == "fast":
+            return result
+        lease.record(result.status_code, result.latency, timed_out)
+        if result.error_class in ("timeout", "connect"):
+            limiter.breaker.record_failure(host)
+        else:
+            limiter.breaker.record_success(host)
+
+    return result
+
+class RunDeadline:
+    """Orçamento de tempo da execução (--deadline) e do componente em andamento (--component-deadline)
+
+    Quando o prazo acaba ou o usuário pressiona Ctrl+C, as tarefas pendentes são
+    canceladas, as verificações não concluídas ficam como "unknown" (não removem
+    nem entram no cache de falhas) e a execução segue para gravar caches e relatório.
+    """
+    def __init__(self, run_seconds: float = 0, component_seconds: float = 0):
+        self.run_seconds = run_seconds
+        self.run_ends = time.monotonic() + run_seconds if run_seconds > 0 else None
+        self.component_seconds = component_seconds
+        self.component_ends: Optional[float] = None
+        self.component = ""
+        self.interrupted = False
+        self.exceeded: List[str] = []
+        self.skipped: List[str] = []
+        self._event: Optional[asyncio.Event] = None
+
+    def restart(self) -> None:
+        """Novo ciclo dos modos de longa duração (--serve, --daemon): o prazo da execução vale por ciclo"""
+        self.run_ends = time.monotonic() + self.run_seconds if self.run_seconds > 0 else None
+        self.exceeded = []
+        self.skipped = []
+
+    def begin_component(self, component_name: str) -> None:
+        self.component = component_name
+        self.component_ends = time.monotonic() + self.component_seconds if self.component_seconds > 0 else None
+
+    def end_component(self) -> None:
+        self.component = ""
+        self.component_ends = None
+
+    def remaining(self) -> Optional[float]:
+        """Segundos até o prazo mais próximo (None = sem prazo)"""
+        ends = [end for end in (self.run_ends, self.component_ends) if end is not None]
+        if not ends:
+            return None
+        return max(0.0, min(ends) - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return self.interrupted or (remaining is not None and remaining <= 0)
+
+    def run_expired(self) -> bool:
+        """Prazo da execução inteira esgotado (ou interrompida)"""
+        return self.interrupted or (self.run_ends is not None and time.monotonic() >= self.run_ends)
+
+    def _interrupt_event(self) -> asyncio.Event:
+        if self._event is None:
+            self._event = asyncio.Event()
+        return self._event
+
+    async def wait_interrupted(self) -> None:
+        """Aguarda o Ctrl+C (modos de longa duração, como --serve)"""
+        await self._interrupt_event().wait()
+
+    def interrupt(self) -> None:
+        """Ctrl+C: segue o caminho de cancelamento gradual; um segundo Ctrl+C encerra na hora"""
+        if self.interrupted:
+            return
+        self.interrupted = True
+        print_colored("\nInterrompido: cancelando verificações pendentes (Ctrl+C novamente para sair imediatamente)...", "yellow")
+        self._interrupt_event().set()
+        self.remove_signal_handler()
+
+    def install_signal_handler(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.interrupt)
+        except (NotImplementedError, RuntimeError):
+            # Windows: o loop não suporta add_signal_handler
+            signal.signal(signal.SIGINT, lambda signum, frame: loop.call_soon_threadsafe(self.interrupt))
+
+    def remove_signal_handler(self) -> None:
+        try:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGINT)
+        except (NotImplementedError, RuntimeError):
+            pass
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    async def run(self, coro, limit: Optional[float] = None) -> Tuple[bool, Any]:
+        """Executa a corrotina dentro do prazo; retorna (concluída, resultado)
+
+        limit restringe ainda mais o tempo desta etapa. Se o prazo acabar, a tarefa é
+        cancelada e aguardada, para que os blocos finally gravem os caches.
+        """
+        if self.expired():
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            else:
+                coro.cancel()
+            return False, None
+
+        timeout = self.remaining()
+        if limit is not None:
+            timeout = limit if timeout is None else min(timeout, limit)
+
+        task = asyncio.ensure_future(coro)
+        waiter = asyncio.ensure_future(self._interrupt_event().wait())
+        try:
+            await asyncio.wait({task, waiter}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+        if task.done():
+            return True, task.result()
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        if not self.interrupted:
+            label = self.component or "execução"
+            if label not in self.exceeded:
+                self.exceeded.append(label)
+                print_colored(f"  Prazo esgotado ({label}): verificações pendentes canceladas", "yellow")
+        return False, None
+
+    def report(self) -> None:
+        """Resumo de uma execução parcial (prazo esgotado ou interrompida)"""
+        if not (self.interrupted or self.exceeded or self.skipped):
+            return
+        print_colored("\n=== Execução parcial ===", "yellow")
+        if self.interrupted:
+            print_colored("Interrompida pelo usuário (Ctrl+C)", "yellow")
+        if self.exceeded:
+            print_colored(f"Prazo esgotado em: {', '.join(self.exceeded)}", "yellow")
+        if self.skipped:
+            print_colored(f"Componentes não processados: {', '.join(self.skipped)}", "yellow")
+        print_colored("Verificações não concluídas ficaram como desconhecidas: nada foi removido nem cacheado por elas", "gray")
+
+_run_deadline = RunDeadline()
+
+def get_run_deadline() -> RunDeadline:
+    """Obtém o prazo da execução"""
+    return _run_deadline
+
+def set_run_deadline(deadline: RunDeadline) -> None:
+    """Define o prazo da execução (--deadline / --component-deadline)"""
+    global _run_deadline
+    _run_deadline = deadline
+
+def deadline_result(url: str) -> UrlCheckResult:
+    """Resultado de uma verificação cancelada pelo prazo (status desconhecido)"""
+    result = UrlCheckResult(url)
+    result.is_unknown = True
+    result.error_class = "deadline"
+    result.error_message = "Prazo esgotado"
+    result.source = "deadline"
+    return result
+
+async def _confirm_url(url: str) -> UrlCheckResult:
+    """Confirma uma falha com GET parcial (Range: bytes=0-0) e timeouts longos"""
+    limiter = get_host_limiter()
+    host = host_of(url)
+    if not limiter.breaker.allow(host):
+        return circuit_open_result(url)
+    result = UrlCheckResult(url)
+    result.source = "confirm"
+
+    with validation_phase("confirm"):
+        async with limiter.slot(url) as lease:
+            started = time.monotonic()
+            try:
+                timeout = lease.settings.client_timeout("confirm")
+                async with http_session(timeout) as session:
+                    async with session.get(url, headers={'Range': 'bytes=0-0'}, timeout=timeout) as response:
+                        result.status_code = response.status
+                        # 416: o recurso existe, mas o intervalo pedido não (arquivo vazio)
+                        result.is_valid = response.status < 400 or response.status == 416
+                        if not result.is_valid:
+                            result.error_class = "http"
+
+                        content_range = response.headers.get('Content-Range', '')
+                        match = re.search(r'/(\d+)$', content_range)
+                        if match:
+                            result.content_length = int(match.group(1))
+                        elif response.status == 200 and response.headers.get('Content-Length'):
+                            result.content_length = int(response.headers['Content-Length'])
+                        result.etag = response.headers.get('ETag', '')
+                        result.last_modified = response.headers.get('Last-Modified', '')
+            except asyncio.TimeoutError:
+                result.error_message = "Timeout"
+                result.error_class = "timeout"
+                result.status_code = 408
+            except (aiohttp.ClientConnectionError, OSError) as e:
+                result.error_message = str(e)
+                result.error_class = "connect"
+            except Exception as e:
+                result.error_message = str(e)
+                result.error_class = "other"
+
+            result.latency = time.monotonic() - started
+            lease.record(result.status_code, result.latency, result.error_class == "timeout")
+            if result.error_class in ("timeout", "connect"):
+                limiter.breaker.record_failure(host)
+            else:
+                limiter.breaker.record_success(host)
 
     return result
 
+async def confirm_failures(failures: List[UrlCheckResult]) -> Dict[str, UrlCheckResult]:
+    """Segunda fase: reverifica as falhas da passada rápida, em série por host
+
+    Hosts são confirmados em paralelo, mas cada host recebe uma requisição por vez.
+    Falhas de conexão/timeout de hosts com o circuito aberto não são reverificadas, e
+    um host que não responde a confirm_failure_limit confirmações seguidas tem o
+    circuito aberto: as URLs restantes dele ficam como desconhecidas.
+    """
+    breaker = get_host_limiter().breaker
+    by_host: Dict[str, List[UrlCheckResult]] = {}
+    for result in failures:
+        # Falhas do diário de uma execução interrompida já foram confirmadas
+        if result.is_valid or result.is_unknown or result.source == "journal":
+            continue
+        host = host_of(result.url)
+        if result.error_class in ("timeout", "connect") and breaker.has_tripped(host):
+            continue
+        by_host.setdefault(host, []).append(result)
+
+    confirmed: Dict[str, UrlCheckResult] = {}
+    if not by_host:
+        return confirmed
+
+    total = sum(len(results) for results in by_host.values())
+    print_colored(f"  Confirmando {total} falhas em {len(by_host)} hosts (GET parcial, em série por host)...", "yellow")
+
+    failure_limit = max(1, int(get_network_profile().values['confirm_failure_limit']))
+
+    async def confirm_host(host: str, results: List[UrlCheckResult]) -> None:
+        consecutive_failures = 0
+        for position, first_pass in enumerate(results):
+            result = await _confirm_url(first_pass.url)
+            confirmed[first_pass.url] = result
+            if is_definitive_check(result):
+                get_single_flight().remember("HEAD", first_pass.url, result)
+
+            consecutive_failures = consecutive_failures + 1 if result.error_class in ("timeout", "connect") else 0
+            if consecutive_failures >= failure_limit:
+                breaker.trip(host)
+            if breaker.is_open(host):
+                # Host fora do ar: as demais URLs não esperam um timeout longo cada
+                for remaining in results[position + 1:]:
+                    confirmed[remaining.url] = circuit_open_result(remaining.url)
+                return
+
+    await asyncio.gather(*[confirm_host(host, results) for host, results in by_host.items()])
+
+    recovered = sum(1 for result in confirmed.values() if result.is_valid)
+    if recovered:
+        print_colored(f"  {recovered} URLs recuperadas na confirmação (falsos negativos da passada rápida)", "green")
+    return confirmed
+
 def test_url_valid(url: str) -> UrlCheckResult:
     """Verifica se uma URL é válida de forma síncrona"""
+    return get_single_flight().run_sync("HEAD", url, lambda: _test_url_valid(url), cacheable=is_definitive_check)
+
+def _test_url_valid(url: str) -> UrlCheckResult:
     result = UrlCheckResult(url)
     
     try:
@@ -1088,14 +2611,15 @@ def test_url_valid(url: str) -> UrlCheckResult:
         req = Request(url)
         req.get_method = lambda: 'HEAD'
         
-        with urlopen(req, timeout=TIMEOUT_SECONDS) as response:
-            result.status_code = response.getcode()
-            result.is_valid = response.status < 400
-            
-            # Obtém tamanho do conteúdo se disponível
-            content_length = response.headers.get('Content-Length')
-            if content_length:
-                result.content_length = int(content_length)
+        with get_host_limiter().sync_slot(url) as host_settings:
+            with urlopen(req, timeout=host_settings.read_timeout) as response:
+                result.status_code = response.getcode()
+                result.is_valid = response.status < 400
+                
+                # Obtém tamanho do conteúdo se disponível
+                content_length = response.headers.get('Content-Length')
+                if content_length:
+                    result.content_length = int(content_length)
     except HTTPError as e:
         result.is_valid = False
         result.error_message = f"HTTP {e.code}: {e.reason}"
@@ -1133,186 +2657,1572 @@ def test_single_url(url: str) -> bool:
         print_colored(f"  {error_msg}", "red")
         return False
 
-async def test_new_version_urls_async(new_versions: List[Dict], component_name: str = "") -> List[Dict]:
-    """Verifica URLs de novas versões em paralelo com asyncio"""
-    if not new_versions:
-        return []
+# Validação em lote a partir de manifestos publicados pelos upstreams
+class BulkSource(abc.ABC):
+    """Fonte de validação em lote: um único arquivo upstream que lista vários artefatos
 
-    # Carrega cache de versões falhadas
-    failed_cache = []
-    if component_name:
-        failed_cache = get_failed_versions_cache(component_name)
-        if failed_cache:
-            print_colored(f"  Cache carregado: {len(failed_cache)} versões falhadas conhecidas", "gray")
-
-    # Filtra versões que já falharam anteriormente
-    versions_to_check = []
-    skipped_versions = []
-
-    for version in new_versions:
-        cached_failure = next(
-            (entry for entry in failed_cache
-             if entry['Version'] == version['version'] and entry['Url'] == version['url']),
-            None
-        )
+    Subclasses informam quais URLs cobrem e carregam o manifesto, retornando
+    URL -> {'size': ..., 'sha256': ...}. URLs cobertas que não aparecem no
+    manifesto não são consideradas inválidas: voltam para a verificação via HEAD.
+    """
+    name = "bulk"
 
-        if cached_failure:
-            skipped_versions.append(version)
-            print_colored(f"  ⚠ Pulando {version['version']} (falhou em {cached_failure['FailedDate']}): {version['url']}", "yellow")
-        else:
-            versions_to_check.append(version)
+    @abc.abstractmethod
+    def covers(self, url: str) -> bool:
+        """Indica se a URL está no escopo desta fonte"""
 
-    if skipped_versions:
-        print_colored(f"  {len(skipped_versions)} versões puladas (cache de falhas)", "yellow")
+    @abc.abstractmethod
+    def load(self) -> Dict[str, Dict]:
+        """Carrega o manifesto: URL -> {'size': ..., 'sha256': ...}"""
 
-    if not versions_to_check:
-        print_colored("  Nenhuma nova versão para verificar (todas no cache de falhas)", "gray")
-        return []
+class ChecksumFileSource(BulkSource):
+    """Arquivo de checksums no formato sha256sum (SHASUMS256.txt, sha256sum.txt)"""
+    name = "checksums"
 
-    urls = [v['url'] for v in versions_to_check]
-    print_colored(f"  Verificando {len(urls)} URLs de novas versões com asyncio...", "yellow")
+    def __init__(self, directory_url: str, file_name: str):
+        self.directory_url = directory_url if directory_url.endswith('/') else directory_url + '/'
+        self.file_name = file_name
 
-    # Cria barra de progresso
-    progress_bar = create_progress_bar(len(urls), "Verificando URLs")
+    def covers(self, url: str) -> bool:
+        return url.startswith(self.directory_url) and '/' not in url[len(self.directory_url):]
 
-    async def check_with_delay(url):
-        result = await test_url_valid_async(url)
-        progress_bar.update(1)
-        # Delay entre requests para evitar detecção
-        await asyncio.sleep(random.uniform(1, 3))
-        return result
+    def load(self) -> Dict[str, Dict]:
+        content, error, status_code = make_http_request(self.directory_url + self.file_name, max_retries=1)
+        if not content:
+            return {}
 
-    # Cria tarefas com limite de concorrência
-    semaphore = asyncio.Semaphore(MAX_WORKERS)
-
-    async def limited_check(url):
-        async with semaphore:
-            return await check_with_delay(url)
-
-    # Executa todas as verificações
-    tasks = [limited_check(url) for url in urls]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    # Processa resultados
-    processed_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            error_result = UrlCheckResult(urls[i])
-            error_result.is_valid = False
-            error_result.error_message = str(result)
-            processed_results.append(error_result)
-        else:
-            processed_results.append(result)
+        artifacts = {}
+        for line in content.decode('utf-8', errors='replace').splitlines():
+            match = re.match(r'^([0-9a-fA-F]{64})\s+\*?(\S+)\s*$', line.strip())
+            if match:
+                artifacts[self.directory_url + match.group(2)] = {'sha256': match.group(1).lower()}
+        return artifacts
 
-    # Fecha barra de progresso
-    progress_bar.close()
+class NodeIndexSource(BulkSource):
+    """index.json do nodejs.org (lista de releases com os arquivos publicados)"""
+    name = "nodejs-index"
+    index_url = "https://nodejs.org/dist/index.json"
+
+    def covers(self, url: str) -> bool:
+        return url.startswith("https://nodejs.org/dist/") and url.endswith("-win-x64.zip")
 
-    # Separa versões válidas e inválidas
-    valid_versions = []
-    failed_versions = []
+    def load(self) -> Dict[str, Dict]:
+        content, error, status_code = make_http_request(self.index_url)
+        if not content:
+            return {}
 
-    for version in versions_to_check:
-        url_result = next((r for r in processed_results if r.url == version['url']), None)
-        if url_result and url_result.is_valid:
-            success_msg = f"  ✓ {version['version']}: {version['url']}"
-            if url_result.content_length > 0:
-                success_msg += f" ({url_result.content_length:,} bytes)"
-            print_colored(success_msg, "green")
+        artifacts = {}
+        for release in json.loads(content.decode('utf-8')):
+            if 'win-x64-zip' in release.get('files', []):
+                version = release['version']
+                artifacts[f"https://nodejs.org/dist/{version}/node-{version}-win-x64.zip"] = {}
+        return artifacts
 
-            if url_result.content_error:
-                print_colored(f"     Aviso: {url_result.content_error}", "yellow")
+class GithubReleaseAssetsSource(BulkSource):
+    """Lista de assets das releases do GitHub (tamanho e, quando publicado, digest)"""
+    name = "github-assets"
 
-            valid_versions.append(version)
-        else:
-            error_msg = f"  ✗ {version['version']}: {version['url']}"
-            if url_result:
-                if url_result.error_message:
-                    error_msg += f" - {url_result.error_message}"
-                if url_result.content_error:
-                    error_msg += f" | {url_result.content_error}"
-            else:
-                error_msg += " - Resultado não encontrado"
-            print_colored(error_msg, "red")
-            # Adiciona informação do erro para o cache
-            if url_result:
-                version['ErrorMessage'] = f"{url_result.error_message} | {url_result.content_error}".strip(" | ")
+    def __init__(self, repository: str):
+        self.repository = repository
+        self.download_prefix = f"https://github.com/{repository}/releases/download/"
+
+    def covers(self, url: str) -> bool:
+        return url.startswith(self.download_prefix)
+
+    def load(self) -> Dict[str, Dict]:
+        # Mesma URL usada na busca de novas versões: a requisição é compartilhada
+        content, error, status_code = fetch_github_releases(f"https://api.github.com/repos/{self.repository}/releases")
+        if not content:
+            return {}
+
+        artifacts = {}
+        for release in json.loads(content.decode('utf-8')):
+            for asset in release.get('assets', []):
+                info = {'size': asset.get('size', 0)}
+                digest = asset.get('digest') or ''
+                if digest.startswith('sha256:'):
+                    info['sha256'] = digest[len('sha256:'):]
+                artifacts[asset['browser_download_url']] = info
+        return artifacts
+
+class _ListingLinkParser(html.parser.HTMLParser):
+    """Extrai os nomes de arquivo dos links de uma listagem de diretório"""
+    def __init__(self, directory_url: str):
+        super().__init__()
+        self.directory_url = directory_url
+        self.names = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'a':
+            return
+        href = dict(attrs).get('href')
+        if not href:
+            return
+        target = urljoin(self.directory_url, href.split('?', 1)[0].split('#', 1)[0])
+        if target.startswith(self.directory_url):
+            name = target[len(self.directory_url):]
+            if name and '/' not in name:
+                self.names.add(name)
+
+_listing_cache_lock = threading.Lock()
+_listing_cache: Optional[Dict[str, Dict]] = None
+
+def get_listing_cache() -> Dict[str, Dict]:
+    """Cache das listagens de diretório (validadores + nomes de arquivo)"""
+    global _listing_cache
+    with _listing_cache_lock:
+        if _listing_cache is None:
+            _listing_cache = {}
+            if LISTING_CACHE_FILE.exists():
+                try:
+                    with open(LISTING_CACHE_FILE, 'r', encoding='utf-8') as f:
+                        _listing_cache = json.load(f)
+                except (OSError, ValueError):
+                    _listing_cache = {}
+        return _listing_cache
+
+def save_listing_cache() -> None:
+    """Salva o cache das listagens de diretório"""
+    with _listing_cache_lock:
+        if _listing_cache is None:
+            return
+        if not CACHE_PATH.exists():
+            CACHE_PATH.mkdir(parents=True)
+        temp_file = LISTING_CACHE_FILE.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(_listing_cache, f, ensure_ascii=False)
+        temp_file.replace(LISTING_CACHE_FILE)
+
+class DirectoryListingSource(BulkSource):
+    """Listagem de diretório (índice HTML) de hosts como nginx.org e windows.php.net
+
+    A listagem é baixada com requisição condicional (ETag/Last-Modified do cache) e
+    analisada em streaming, sem montar o HTML inteiro em memória.
+    """
+    name = "listing"
+
+    def __init__(self, directory_url: str):
+        self.directory_url = directory_url
+
+    def covers(self, url: str) -> bool:
+        return url.startswith(self.directory_url) and '/' not in url[len(self.directory_url):]
+
+    def load(self) -> Dict[str, Dict]:
+        cache = get_listing_cache()
+        cached = cache.get(self.directory_url)
+        names = self._fetch(cached)
+        if names is None:
+            return {}
+        return {self.directory_url + name: {} for name in names}
+
+    def _fetch(self, cached: Optional[Dict]) -> Optional[set]:
+        req = Request(self.directory_url)
+        if cached:
+            if cached.get('etag'):
+                req.add_header('If-None-Match', cached['etag'])
+            if cached.get('last_modified'):
+                req.add_header('If-Modified-Since', cached['last_modified'])
+
+        parser = _ListingLinkParser(self.directory_url)
+        try:
+            with get_host_limiter().sync_slot(self.directory_url) as host_settings:
+                with urlopen(req, timeout=host_settings.read_timeout) as response:
+                    charset = response.headers.get_content_charset() or 'utf-8'
+                    for block in iter(lambda: response.read(HASH_CHUNK_SIZE), b''):
+                        parser.feed(block.decode(charset, errors='replace'))
+                    parser.close()
+                    validators = {
+                        'etag': response.headers.get('ETag', ''),
+                        'last_modified': response.headers.get('Last-Modified', '')
+                    }
+        except HTTPError as e:
+            if e.code == 304 and cached:
+                return set(cached.get('names', []))
+            return None
+        except (URLError, OSError, ValueError):
+            return None
+
+        with _listing_cache_lock:
+            _listing_cache[self.directory_url] = {
+                **validators,
+                'names': sorted(parser.names),
+                'fetched': datetime.now().isoformat()
+            }
+        return parser.names
+
+def build_listing_sources(urls: List[str]) -> List[BulkSource]:
+    """Agrupa URLs por diretório pai em hosts com listagem e cria uma fonte por diretório"""
+    min_urls = int(get_network_profile().values['listing_min_urls'])
+    groups: Dict[str, int] = {}
+    for url in urls:
+        directory_url = url.rsplit('/', 1)[0] + '/'
+        if any(directory_url.startswith(prefix) for prefix in DIRECTORY_LISTING_PREFIXES):
+            groups[directory_url] = groups.get(directory_url, 0) + 1
+
+    # Diretórios com poucas URLs saem mais baratos via HEAD do que baixando a listagem
+    return [DirectoryListingSource(directory_url) for directory_url, count in groups.items() if count >= min_urls]
+
+# Fontes em lote declaradas por componente
+BULK_VALIDATION_SOURCES = {
+    "node": lambda: [NodeIndexSource()],
+    "php": lambda: [
+        ChecksumFileSource("https://windows.php.net/downloads/releases/", "sha256sum.txt"),
+        ChecksumFileSource("https://windows.php.net/downloads/releases/archives/", "sha256sum.txt")
+    ],
+    "git": lambda: [GithubReleaseAssetsSource("git-for-windows/git")],
+    "adminer": lambda: [GithubReleaseAssetsSource("vrana/adminer")],
+    "phpcsfixer": lambda: [GithubReleaseAssetsSource("PHP-CS-Fixer/PHP-CS-Fixer")],
+    "wpcli": lambda: [GithubReleaseAssetsSource("wp-cli/wp-cli")]
+}
+
+def build_bulk_sources(component_name: str, urls: List[str]) -> List[BulkSource]:
+    """Fontes em lote aplicáveis às URLs do componente"""
+    factory = BULK_VALIDATION_SOURCES.get(component_name.lower())
+    if not factory:
+        return []
+    return [source for source in factory() if any(source.covers(url) for url in urls)]
+
+def bulk_result(url: str, info: Dict, source_name: str) -> UrlCheckResult:
+    """Resultado de uma URL confirmada por manifesto em lote (memorizado como um HEAD)"""
+    result = UrlCheckResult(url)
+    result.is_valid = True
+    result.status_code = 200
+    result.content_length = int(info.get('size') or 0)
+    result.sha256 = info.get('sha256', '')
+    result.source = source_name
+    get_single_flight().remember("HEAD", url, result)
+    return result
+
+async def resolve_with_bulk_sources(urls: List[str], component_name: str = "") -> Tuple[Dict[str, UrlCheckResult], List[str]]:
+    """Confirma URLs usando manifestos em lote; retorna (confirmadas, restantes para HEAD)
+
+    Primeiro são usadas as fontes declaradas pelo componente; as URLs que sobrarem
+    em hosts com listagem de diretório são agrupadas por diretório pai.
+    """
+    resolved: Dict[str, UrlCheckResult] = {}
+    remaining = list(urls)
+    used_sources = set()
+    loop = asyncio.get_event_loop()
+
+    stages = [lambda pending: build_bulk_sources(component_name, pending) if component_name else [], build_listing_sources]
+    for build_sources in stages:
+        sources = build_sources(remaining)
+        if not sources:
+            continue
+
+        manifests = await asyncio.gather(
+            *[loop.run_in_executor(None, source.load) for source in sources],
+            return_exceptions=True
+        )
+
+        pending = []
+        for url in remaining:
+            info = None
+            source_name = ""
+            for source, manifest in zip(sources, manifests):
+                if isinstance(manifest, dict) and source.covers(url) and url in manifest:
+                    info = manifest[url]
+                    source_name = source.name
+                    break
+
+            if info is None:
+                pending.append(url)
+                continue
+
+            resolved[url] = bulk_result(url, info, source_name)
+            used_sources.add(source_name)
+
+        remaining = pending
+        if isinstance(sources[0], DirectoryListingSource):
+            save_listing_cache()
+
+    if resolved:
+        print_colored(f"  {len(resolved)} URLs confirmadas por manifestos em lote ({', '.join(sorted(used_sources))}); {len(remaining)} via HEAD", "gray")
+
+    return resolved, remaining
+
+class StreamingBulkResolver:
+    """Confirma URLs uma a uma contra os manifestos em lote, carregados sob demanda
+
+    Usado pelo pipeline de descoberta, em que as URLs chegam aos poucos: cada
+    manifesto é baixado uma única vez, na primeira URL coberta, e compartilhado
+    pelos workers. Diretórios com listagem só são consultados a partir de
+    listing_min_urls candidatas no mesmo diretório.
+    """
+    def __init__(self, component_name: str):
+        factory = BULK_VALIDATION_SOURCES.get(component_name.lower())
+        self.sources: List[BulkSource] = factory() if factory else []
+        self.min_listing_urls = int(get_network_profile().values['listing_min_urls'])
+        self.used_sources = set()
+        self.resolved = 0
+        self._manifests: Dict[BulkSource, asyncio.Future] = {}
+        self._listing_sources: Dict[str, DirectoryListingSource] = {}
+        self._listing_counts: Dict[str, int] = {}
+
+    def _candidate_sources(self, url: str) -> List[BulkSource]:
+        sources = [source for source in self.sources if source.covers(url)]
+        directory_url = url.rsplit('/', 1)[0] + '/'
+        if any(directory_url.startswith(prefix) for prefix in DIRECTORY_LISTING_PREFIXES):
+            self._listing_counts[directory_url] = self._listing_counts.get(directory_url, 0) + 1
+            if self._listing_counts[directory_url] >= self.min_listing_urls:
+                if directory_url not in self._listing_sources:
+                    self._listing_sources[directory_url] = DirectoryListingSource(directory_url)
+                sources.append(self._listing_sources[directory_url])
+        return sources
+
+    async def resolve(self, url: str) -> Optional[UrlCheckResult]:
+        """Resultado confirmado pelo manifesto ou None (a URL segue para HEAD)"""
+        for source in self._candidate_sources(url):
+            if source not in self._manifests:
+                self._manifests[source] = asyncio.get_event_loop().run_in_executor(None, source.load)
+            try:
+                manifest = await self._manifests[source]
+            except Exception:
+                continue
+
+            if url in manifest:
+                self.used_sources.add(source.name)
+                self.resolved += 1
+                return bulk_result(url, manifest[url], source.name)
+        return None
+
+    def close(self) -> None:
+        if self._listing_sources:
+            save_listing_cache()
+
+def report_discovered_version(version: Dict, url_result: UrlCheckResult) -> str:
+    """Exibe o resultado da validação de uma versão descoberta; retorna 'valid', 'failed' ou 'unknown'"""
+    if url_result.is_unknown:
+        # Host indisponível: a versão não é adicionada nem entra no cache de falhas
+        print_colored(f"  ? {version['version']}: {version['url']} - status desconhecido ({url_result.error_message})", "yellow")
+        return 'unknown'
+
+    if url_result.is_valid:
+        success_msg = f"  ✓ {version['version']}: {version['url']}"
+        if url_result.content_length > 0:
+            success_msg += f" ({url_result.content_length:,} bytes)"
+        print_colored(success_msg, "green")
+
+        if url_result.content_error:
+            print_colored(f"     Aviso: {url_result.content_error}", "yellow")
+        return 'valid'
+
+    error_msg = f"  ✗ {version['version']}: {version['url']}"
+    if url_result.error_message:
+        error_msg += f" - {url_result.error_message}"
+    if url_result.content_error:
+        error_msg += f" | {url_result.content_error}"
+    print_colored(error_msg, "red")
+    # Adiciona informação do erro para o cache
+    version['ErrorMessage'] = f"{url_result.error_message} | {url_result.content_error}".strip(" | ")
+    version['ErrorClass'] = classify_failure(url_result.status_code, url_result.error_class)
+    version['StatusCode'] = url_result.status_code
+    return 'failed'
+
+async def discover_new_versions(iter_versions: Callable[[], Iterator[Dict]], existing_versions: List[Dict],
+                                component_name: str) -> List[Dict]:
+    """Pipeline de descoberta: parse → normalização → dedupe → fila limitada → validação
+
+    O iterador do componente (parse + normalização) roda em uma thread e alimenta
+    uma fila limitada; os workers validam as candidatas enquanto a página/JSON
+    ainda está sendo processada, e a fila mantém a memória limitada em índices grandes.
+    """
+    profile = get_network_profile()
+    loop = asyncio.get_event_loop()
+    worker_count = max(1, profile.max_workers)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count * 2)
+    stopped = threading.Event()
+
+    existing = {v['version'] for v in existing_versions}
+    failed_cache = {(entry['Version'], entry['Url']): entry for entry in get_failed_versions_cache(component_name)}
+    if failed_cache:
+        print_colored(f"  Cache carregado: {len(failed_cache)} versões falhadas conhecidas", "gray")
+
+    stats = collections.Counter()
+    outcomes: Dict[str, List[Tuple[int, Dict]]] = {'valid': [], 'failed': [], 'unknown': []}
+    pending_failures: List[Tuple[int, Dict, UrlCheckResult]] = []
+
+    def enqueue(item) -> bool:
+        # Bloqueia a thread produtora enquanto a fila estiver cheia (backpressure)
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        while not stopped.is_set():
+            try:
+                future.result(timeout=1)
+                return True
+            except concurrent.futures.TimeoutError:
+                continue
+        future.cancel()
+        return False
+
+    def produce() -> None:
+        seen = set()
+        try:
+            for index, version in enumerate(iter_versions()):
+                if version['version'] in existing or version['version'] in seen:
+                    continue
+                seen.add(version['version'])
+
+                cached_failure = failed_cache.get((version['version'], version['url']))
+                if cached_failure:
+                    stats['skipped'] += 1
+                    print_colored(f"  ⚠ Pulando {version['version']} (falhou em {cached_failure['FailedDate']}): {version['url']}", "yellow")
+                    continue
+
+                stats['candidates'] += 1
+                if not enqueue((index, version)):
+                    return
+        finally:
+            for _ in range(worker_count):
+                if not enqueue(None):
+                    break
+
+    async def validate_worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, version = item
+
+            url_result = await resolver.resolve(version['url'])
+            if url_result is None:
+                try:
+                    url_result = await test_url_valid_async(version['url'])
+                except Exception as e:
+                    url_result = UrlCheckResult(version['url'])
+                    url_result.is_valid = False
+                    url_result.error_message = str(e)
+                # Delay entre requests para evitar detecção (vale também na passada rápida)
+                await asyncio.sleep(random.uniform(*profile.discovery_delay))
+
+            if url_result.is_valid:
+                get_validation_history().record(url_result, component_name)
+                outcomes[report_discovered_version(version, url_result)].append((index, version))
+                if _run_journal:
+                    _run_journal.record_result(url_result)
+                    _run_journal.record_candidate(component_name, version)
             else:
-                version['ErrorMessage'] = "Resultado não encontrado"
-            failed_versions.append(version)
+                # Falhas só são classificadas no fim: o circuito do host pode abrir depois
+                pending_failures.append((index, version, url_result))
+
+    resolver = StreamingBulkResolver(component_name)
+    print_colored(f"  Verificando novas versões de {component_name} à medida que são encontradas...", "yellow")
+
+    deadline = get_run_deadline()
+    with validation_phase("fast"):
+        workers = [asyncio.ensure_future(validate_worker()) for _ in range(worker_count)]
+    try:
+        await deadline.run(asyncio.gather(loop.run_in_executor(None, produce), *workers))
+    finally:
+        stopped.set()
+        for worker in workers:
+            worker.cancel()
+        resolver.close()
+        get_redirect_cache().save()
+
+    # Falhas da passada rápida são confirmadas antes de entrar no cache de falhas
+    completed, confirmed = await deadline.run(confirm_failures([url_result for _, _, url_result in pending_failures]))
+    for index, version, url_result in sorted(pending_failures, key=lambda item: item[0]):
+        if not completed:
+            url_result.is_unknown = True
+        url_result = (confirmed or {}).get(url_result.url, url_result)
+        mark_unknown_if_host_down(url_result)
+        get_validation_history().record(url_result, component_name)
+        if _run_journal:
+            _run_journal.record_result(url_result)
+        outcomes[report_discovered_version(version, url_result)].append((index, version))
+    get_validation_history().flush()
+
+    if stats['skipped']:
+        print_colored(f"  {stats['skipped']} versões puladas (cache de falhas)", "yellow")
+    if not stats['candidates']:
+        print_colored("  Nenhuma nova versão para verificar", "gray")
+    if resolver.resolved:
+        print_colored(f"  {resolver.resolved} URLs confirmadas por manifestos em lote ({', '.join(sorted(resolver.used_sources))})", "gray")
 
     # Salva versões falhadas no cache
-    if component_name and failed_versions:
+    failed_versions = [version for _, version in sorted(outcomes['failed'], key=lambda item: item[0])]
+    if failed_versions:
         save_failed_versions_cache(component_name, failed_versions)
 
-    return valid_versions
+    return [version for _, version in sorted(outcomes['valid'], key=lambda item: item[0])]
 
-async def test_urls_parallel_async(urls: List[str]) -> List[UrlCheckResult]:
-    """Verifica URLs em paralelo usando asyncio"""
-    if not urls:
-        return []
+class ValidationHistory:
+    """Histórico persistente (SQLite) de todas as verificações de URL
+
+    Cada execução recebe um run_id; a remoção de URLs do provider exige falhas em
+    execuções seguidas, e URLs estáveis de hosts estáveis são verificadas com menos
+    frequência.
+    """
+    def __init__(self, db_file: Path):
+        if not db_file.parent.exists():
+            db_file.parent.mkdir(parents=True)
+        self.db_file = db_file
+        self.new_run()
+        self._lock = threading.Lock()
+        self._pending: List[Tuple] = []
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS checks (
+                run_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                host TEXT NOT NULL,
+                component TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                is_valid INTEGER NOT NULL,
+                is_unknown INTEGER NOT NULL,
+                error_class TEXT NOT NULL,
+                error TEXT NOT NULL,
+                latency REAL NOT NULL,
+                source TEXT NOT NULL,
+                checked_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_checks_url ON checks (url, checked_at);
+            CREATE INDEX IF NOT EXISTS idx_checks_host ON checks (host, checked_at);
+        """)
+        cutoff = time.time() - HISTORY_RETENTION_DAYS * 86400
+        with self._conn:
+            self._conn.execute("DELETE FROM checks WHERE checked_at < ?", (cutoff,))
+
+    def new_run(self) -> None:
+        """Inicia uma nova execução (o daemon inicia uma a cada verificação de componente)"""
+        self.run_id = datetime.now().strftime("%Y%m%d%H%M%S%f") + f"-{os.getpid()}"
+
+    def record(self, result: UrlCheckResult, component_name: str = "") -> None:
+        """Registra um resultado (gravado em lote no próximo flush)"""
+        if result.source in ("history", "journal"):
+            return
+        with self._lock:
+            self._pending.append((
+                self.run_id, result.url, host_of(result.url), component_name, result.status_code,
+                int(result.is_valid), int(result.is_unknown), result.error_class,
+                f"{result.error_message} | {result.content_error}".strip(" | "),
+                result.latency, result.source, time.time()
+            ))
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if pending:
+                with self._conn:
+                    self._conn.executemany("INSERT INTO checks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", pending)
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        self.flush()
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def failed_runs(self, url: str) -> int:
+        """Número de execuções seguidas (das mais recentes) em que a URL falhou"""
+        rows = self._query(
+            "SELECT MAX(is_valid), MIN(is_unknown) FROM checks WHERE url = ? "
+            "GROUP BY run_id ORDER BY MAX(checked_at) DESC LIMIT 50", (url,))
+        failed = 0
+        for any_valid, all_unknown in rows:
+            if any_valid:
+                break
+            if not all_unknown:
+                failed += 1
+        return failed
+
+    def url_flakiness(self, url: str, window: int = 20) -> float:
+        """Fração de mudanças de estado (válida/inválida) entre verificações seguidas"""
+        rows = self._query(
+            "SELECT is_valid FROM checks WHERE url = ? AND is_unknown = 0 ORDER BY checked_at DESC LIMIT ?", (url, window))
+        if len(rows) < 2:
+            return 0.0
+        flips = sum(1 for (a,), (b,) in zip(rows, rows[1:]) if a != b)
+        return flips / (len(rows) - 1)
+
+    def flaky_urls(self, component_name: str = "", limit: int = 10, min_checks: int = 4) -> List[Tuple[str, float, int]]:
+        """URLs mais instáveis: (url, flakiness, verificações)"""
+        sql = "SELECT url, COUNT(*) FROM checks WHERE is_unknown = 0"
+        params: Tuple = ()
+        if component_name:
+            sql += " AND component = ?"
+            params = (component_name,)
+        rows = self._query(sql + " GROUP BY url HAVING COUNT(*) >= ?", params + (min_checks,))
+        scored = [(url, self.url_flakiness(url), count) for url, count in rows]
+        return sorted((item for item in scored if item[1] > 0), key=lambda item: item[1], reverse=True)[:limit]
+
+    def host_latency_trend(self, host: str, days: int = 7) -> List[Tuple[str, float, int]]:
+        """Latência média diária das respostas HEAD do host: (dia, latência, verificações)"""
+        return self._query(
+            "SELECT date(checked_at, 'unixepoch', 'localtime') AS day, AVG(latency), COUNT(*) FROM checks "
+            "WHERE host = ? AND source = 'head' AND is_unknown = 0 AND checked_at >= ? GROUP BY day ORDER BY day",
+            (host, time.time() - days * 86400))
+
+    def hosts(self, component_name: str = "") -> List[str]:
+        """Hosts presentes no histórico (opcionalmente de um componente)"""
+        if component_name:
+            rows = self._query("SELECT DISTINCT host FROM checks WHERE component = ?", (component_name,))
+        else:
+            rows = self._query("SELECT DISTINCT host FROM checks")
+        return [row[0] for row in rows]
+
+    def host_error_rate(self, host: str, hours: float = 24) -> float:
+        """Fração de falhas transitórias do host (timeout, conexão, 429, 5xx); 404 não conta"""
+        rows = self._query(
+            "SELECT COUNT(*), SUM(CASE WHEN error_class IN ('timeout', 'connect') OR status_code = 429 "
+            "OR status_code >= 500 THEN 1 ELSE 0 END) FROM checks WHERE host = ? AND checked_at >= ?",
+            (host, time.time() - hours * 3600))
+        total, failures = rows[0]
+        return (failures or 0) / total if total else 0.0
+
+    def stable_urls(self, urls: Iterable[str]) -> set:
+        """URLs estáveis verificadas recentemente, que podem pular a verificação nesta execução
+
+        Uma única consulta para todas as URLs: elas entram em uma tabela temporária e
+        as últimas STABLE_MIN_CHECKS verificações de cada uma vêm de uma função de janela.
+        """
+        if STABLE_RECHECK_HOURS <= 0:
+            return set()
+
+        recent_cutoff = time.time() - STABLE_RECHECK_HOURS * 3600
+        self.flush()
+        with self._lock:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS stable_candidates (url TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM stable_candidates")
+            self._conn.executemany("INSERT OR IGNORE INTO stable_candidates VALUES (?)", ((url,) for url in urls))
+            rows = self._conn.execute(
+                "SELECT url FROM ("
+                "  SELECT c.url, c.is_valid, c.checked_at,"
+                "         ROW_NUMBER() OVER (PARTITION BY c.url ORDER BY c.checked_at DESC) AS position"
+                "  FROM checks c JOIN stable_candidates s ON s.url = c.url WHERE c.is_unknown = 0"
+                ") WHERE position <= ? GROUP BY url "
+                "HAVING COUNT(*) = ? AND MIN(is_valid) = 1 AND MAX(checked_at) >= ?",
+                (STABLE_MIN_CHECKS, STABLE_MIN_CHECKS, recent_cutoff)).fetchall()
+            self._conn.execute("DELETE FROM stable_candidates")
+
+        host_stable: Dict[str, bool] = {}
+        stable = set()
+        for (url,) in rows:
+            host = host_of(url)
+            if host not in host_stable:
+                host_stable[host] = self.host_error_rate(host) <= STABLE_HOST_MAX_ERROR_RATE
+            if host_stable[host]:
+                stable.add(url)
+        return stable
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+_validation_history: Optional[ValidationHistory] = None
+
+def get_validation_history() -> ValidationHistory:
+    """Obtém o histórico de validações da execução"""
+    global _validation_history
+    if _validation_history is None:
+        _validation_history = ValidationHistory(HISTORY_DB_FILE)
+    return _validation_history
+
+def history_result(url: str) -> UrlCheckResult:
+    """Resultado de uma URL estável que pulou a verificação nesta execução"""
+    result = UrlCheckResult(url)
+    result.is_valid = True
+    result.status_code = 200
+    result.source = "history"
+    return result
+
+def show_validation_history(component_name: str = "") -> None:
+    """Mostra URLs instáveis e a tendência de latência por host"""
+    history = get_validation_history()
+    scope_text = f" de {component_name}" if component_name else ""
+    print_colored(f"\n=== Histórico de Validações{scope_text} ===", "cyan")
+
+    flaky = history.flaky_urls(component_name)
+    if flaky:
+        print_colored("\nURLs instáveis (mudanças de estado entre verificações):", "yellow")
+        for url, flakiness, checks in flaky:
+            print_colored(f"  {flakiness:5.0%}  {url} ({checks} verificações)", "gray")
+    else:
+        print_colored("Nenhuma URL instável no histórico", "gray")
+
+    hosts = history.hosts(component_name)
+    if hosts:
+        print_colored("\nLatência média por host (últimos 7 dias):", "yellow")
+    for host in sorted(hosts):
+        trend = history.host_latency_trend(host)
+        if trend:
+            points = ", ".join(f"{day[5:]}={latency * 1000:.0f}ms" for day, latency, _ in trend)
+            print_colored(f"  {host}: {points} | falhas transitórias 24h: {history.host_error_rate(host):.0%}", "gray")
+
+class JsonlResultSink:
+    """Grava cada resultado de verificação como uma linha JSON (memória constante)"""
+    def __init__(self, path: Path):
+        self.path = path
+        if path.parent and not path.parent.exists():
+            path.parent.mkdir(parents=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self.count = 0
+
+    def __call__(self, result: UrlCheckResult) -> None:
+        self._file.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+_results_sink: Optional[JsonlResultSink] = None
+
+class HostFairQueue:
+    """Fila de URLs com uma fila por host, servida por weighted fair queuing
+
+    get() entrega a URL do host com menor serviço acumulado (cada entrega custa
+    1/limite atual do host) entre os hosts com vagas livres. Um host lento ou
+    saturado não prende os workers enquanto outros hosts têm trabalho, e todos
+    os hosts avançam em paralelo.
+
+    A fila é sempre limitada: put() espera quando há max_size URLs. Se todas as
+    URLs da fila forem de hosts saturados, put() continua lendo adiante (até
+    FAIR_QUEUE_PULL_AHEAD x max_size) para encontrar trabalho de outros hosts.
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max(1, max_size)
+        self.pull_ahead_size = self.max_size * FAIR_QUEUE_PULL_AHEAD
+        self._queues: Dict[str, collections.deque] = {}
+        self._served: Dict[str, float] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._size = 0
+        self._closed = False
+        self._condition = asyncio.Condition()
+
+    async def put(self, url: str) -> None:
+        host = host_of(url)
+        async with self._condition:
+            await self._condition.wait_for(self._has_room)
+            queue = self._queues.setdefault(host, collections.deque())
+            if not queue and not self._in_flight.get(host):
+                # Host que volta a ter trabalho entra no ritmo atual, sem acumular crédito
+                active = [self._served[key] for key, pending in self._queues.items() if pending and key in self._served]
+                self._served[host] = max(self._served.get(host, 0.0), min(active, default=0.0))
+            queue.append(url)
+            self._size += 1
+            self._condition.notify_all()
+
+    async def close(self) -> None:
+        """Indica que não haverá novas URLs; get() retorna None quando a fila esvaziar"""
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _has_room(self) -> bool:
+        if self._size < self.max_size:
+            return True
+        # Fila cheia só de hosts saturados: lê adiante, até o limite rígido
+        return self._size < self.pull_ahead_size and self._pick_host() is None
+
+    def _pick_host(self) -> Optional[str]:
+        limiter = get_host_limiter()
+        best_host = None
+        for host, queue in self._queues.items():
+            if not queue or self._in_flight.get(host, 0) >= limiter.controller(host).current_limit():
+                continue
+            if best_host is None or self._served[host] < self._served[best_host]:
+                best_host = host
+        return best_host
+
+    async def get(self) -> Optional[str]:
+        async with self._condition:
+            while True:
+                host = self._pick_host()
+                if host:
+                    url = self._queues[host].popleft()
+                    self._size -= 1
+                    self._in_flight[host] = self._in_flight.get(host, 0) + 1
+                    self._served[host] += 1.0 / get_host_limiter().controller(host).current_limit()
+                    self._condition.notify_all()
+                    return url
+                if self._closed and self._size == 0:
+                    return None
+                await self._condition.wait()
+
+    async def done(self, url: str) -> None:
+        """Libera a vaga do host após a verificação da URL"""
+        host = host_of(url)
+        async with self._condition:
+            self._in_flight[host] -= 1
+            self._condition.notify_all()
+
+def set_results_sink(sink: Optional[JsonlResultSink]) -> None:
+    """Define o arquivo que recebe todos os resultados de verificação da execução"""
+    global _results_sink
+    _results_sink = sink
+
+class RunJournal:
+    """Diário em disco de uma varredura (--update-all / --check-only), retomável com --resume
+
+    Registra à medida que acontecem os resultados definitivos de verificação, as
+    novas versões descobertas e os componentes concluídos. Uma execução completa
+    apaga o diário; uma interrompida o deixa para a próxima execução com --resume.
+    """
+    def __init__(self, journal_file: Path):
+        self.journal_file = journal_file
+        self.completed: set = set()
+        self.results: Dict[str, UrlCheckResult] = {}
+        self.candidates: Dict[str, List[Dict]] = {}
+        self.started = 0.0
+        self._file = None
+
+    def _load(self) -> Optional[Dict]:
+        header = None
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Última linha truncada pela interrupção
+                kind = record.get('type')
+                if kind == 'start':
+                    header = record
+                elif kind == 'url':
+                    result = UrlCheckResult.from_dict(record['result'])
+                    result.source = "journal"
+                    self.results[result.url] = result
+                elif kind == 'candidate':
+                    self.candidates.setdefault(record['component'], []).append(record['version'])
+                elif kind == 'component':
+                    self.completed.add(record['component'])
+        return header
+
+    def _write(self, record: Dict) -> None:
+        if self._file:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def open(self, mode: str, resume: bool) -> bool:
+        """Abre o diário da varredura; com resume, carrega a execução interrompida do mesmo modo"""
+        if not self.journal_file.parent.exists():
+            self.journal_file.parent.mkdir(parents=True)
+
+        resumed = False
+        if resume and self.journal_file.exists():
+            header = self._load()
+            if not header or header.get('mode') != mode:
+                print_colored(f"Diário de execução interrompida é de outro modo ({(header or {}).get('mode', '?')}, não {mode}); iniciando do zero", "yellow")
+            elif time.time() - header.get('started', 0) > RUN_JOURNAL_MAX_AGE_HOURS * 3600:
+                print_colored(f"Diário de execução interrompida tem mais de {RUN_JOURNAL_MAX_AGE_HOURS}h; iniciando do zero", "yellow")
+            else:
+                resumed = True
+                self.started = header['started']
+        elif resume:
+            print_colored("Nenhuma execução interrompida encontrada; iniciando do zero", "yellow")
+
+        if not resumed:
+            self.completed, self.results, self.candidates = set(), {}, {}
+            self.started = time.time()
+
+        # Reescreve o diário compactado (descarta uma eventual linha truncada)
+        self._file = open(self.journal_file, 'w', encoding='utf-8')
+        self._write({'type': 'start', 'mode': mode, 'started': self.started})
+        for result in self.results.values():
+            self._write({'type': 'url', 'result': result.to_dict()})
+        for component_name, versions in self.candidates.items():
+            for version in versions:
+                self._write({'type': 'candidate', 'component': component_name, 'version': version})
+        for component_name in sorted(self.completed):
+            self._write({'type': 'component', 'component': component_name})
+
+        if resumed:
+            # Verificações já feitas são reaproveitadas por todos os caminhos (pré-verificação, descoberta)
+            single_flight = get_single_flight()
+            for url, result in self.results.items():
+                single_flight.remember("HEAD", url, result)
+            candidates = sum(len(versions) for versions in self.candidates.values())
+            print_colored(f"Retomando execução interrompida: {len(self.completed)} componentes concluídos, "
+                          f"{len(self.results)} URLs e {candidates} novas versões já verificadas", "green")
+        return resumed
+
+    def lookup(self, urls: Iterable[str]) -> Dict[str, UrlCheckResult]:
+        """Resultados carregados do diário da execução interrompida para as URLs"""
+        return {url: self.results[url] for url in urls if url in self.results and self.results[url].source == "journal"}
+
+    def record_result(self, result: UrlCheckResult) -> None:
+        """Registra um resultado definitivo (válido, 404 ou 410) já confirmado"""
+        if result.source == "journal" or result.is_unknown or not is_definitive_check(result):
+            return
+        self.results[result.url] = result
+        self._write({'type': 'url', 'result': result.to_dict()})
+
+    def record_candidate(self, component_name: str, version: Dict) -> None:
+        self.candidates.setdefault(component_name, []).append(version)
+        self._write({'type': 'candidate', 'component': component_name, 'version': version})
+
+    def complete_component(self, component_name: str) -> None:
+        self.completed.add(component_name)
+        self._write({'type': 'component', 'component': component_name})
+
+    def close(self, finished: bool) -> None:
+        """Fecha o diário; uma varredura completa não precisa dele e o apaga"""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if finished and self.journal_file.exists():
+            self.journal_file.unlink()
+
+_run_journal: Optional[RunJournal] = None
+
+def set_run_journal(journal: Optional[RunJournal]) -> None:
+    """Define o diário da varredura em andamento"""
+    global _run_journal
+    _run_journal = journal
+
+def note_component_completed(component_name: str) -> None:
+    """Marca o componente como concluído no diário, se não foi cortado pelo prazo ou por Ctrl+C"""
+    deadline = get_run_deadline()
+    if _run_journal and not deadline.interrupted and component_name not in deadline.exceeded:
+        _run_journal.complete_component(component_name)
+
+async def validate_urls_stream(urls: Iterable[str], on_result: Callable[[UrlCheckResult], None],
+                               component_name: str = "", progress_bar=None) -> collections.Counter:
+    """Valida URLs com um pool fixo de workers, lendo o iterador sob demanda
+
+    Não cria uma corrotina por URL nem acumula resultados: a fila limitada e o
+    callback por resultado mantêm a memória do stream proporcional à concorrência
+    (o que guardar fica a critério do callback). A fila
+    é justa entre hosts e lê adiante quando os hosts já enfileirados estão saturados.
+    """
+    worker_count = max(1, get_network_profile().max_workers)
+    queue = HostFairQueue(worker_count * 4)
+    resolver = StreamingBulkResolver(component_name) if component_name else None
+    stats = collections.Counter()
+
+    async def feed() -> None:
+        try:
+            for url in urls:
+                await queue.put(url)
+        finally:
+            await queue.close()
 
-    print_colored(f"Verificando {len(urls)} URLs com asyncio...", "yellow")
+    async def worker() -> None:
+        while True:
+            url = await queue.get()
+            if url is None:
+                return
+
+            try:
+                result = await resolver.resolve(url) if resolver else None
+                if result is None:
+                    result = await test_url_valid_async(url)
+            except Exception as e:
+                result = UrlCheckResult(url)
+                result.is_valid = False
+                result.error_message = str(e)
+            finally:
+                await queue.done(url)
+
+            stats['valid' if result.is_valid else 'invalid'] += 1
+            if progress_bar:
+                progress_bar.update(1)
+            on_result(result)
+
+    feeder = asyncio.ensure_future(feed())
+    workers = [asyncio.ensure_future(worker()) for _ in range(worker_count)]
+    try:
+        await asyncio.gather(feeder, *workers)
+    finally:
+        # Um callback com erro não pode deixar o alimentador preso em queue.put
+        for task in [feeder, *workers]:
+            task.cancel()
+        await asyncio.gather(feeder, *workers, return_exceptions=True)
+        if resolver:
+            resolver.close()
+        get_redirect_cache().save()
+
+    return stats
+
+def invalid_result_urls(results: Dict[str, UrlCheckResult]) -> set:
+    """URLs com falha definitiva (nem válidas, nem com status desconhecido)"""
+    return {url for url, result in results.items() if not result.is_valid and not result.is_unknown}
+
+def remove_entries(cs_content: List[Dict], urls: set) -> List[Dict]:
+    """Entradas do provider cujas URLs não estão no conjunto"""
+    return [item for item in cs_content if item['url'] not in urls]
+
+# Falhas da pré-verificação (URL -> resultado), entregues direto à confirmação do componente
+_prevalidation_failures: Dict[str, UrlCheckResult] = {}
+
+async def test_urls_parallel_async(urls: List[str], component_name: str = "") -> Dict[str, UrlCheckResult]:
+    """Verifica URLs em paralelo usando asyncio; retorna URL -> resultado na ordem original"""
+    if not urls:
+        return {}
+
+    if _snapshot_catalog:
+        # Sem rede: resultados do snapshot (URLs fora dele ficam como desconhecidas)
+        snapshot_results = {url: _snapshot_catalog.result_for(url) for url in urls}
+        if _results_sink:
+            for result in snapshot_results.values():
+                _results_sink(result)
+            _results_sink.flush()
+        return snapshot_results
+
+    history = get_validation_history()
+    # Um único dicionário na ordem original (o retorno); cada etapa preenche as suas URLs e
+    # os resultados finais vão para histórico, diário e arquivo de resultados assim que saem
+    results: Dict[str, Optional[UrlCheckResult]] = dict.fromkeys(urls)
+
+    def publish(result: UrlCheckResult) -> None:
+        mark_unknown_if_host_down(result)
+        results[result.url] = result
+        history.record(result, component_name)
+        if _run_journal:
+            _run_journal.record_result(result)
+        if _results_sink:
+            _results_sink(result)
+
+    # Consulta ao SQLite fora do event loop
+    stable = await asyncio.get_event_loop().run_in_executor(None, history.stable_urls, list(results))
+    if stable:
+        print_colored(f"  {len(stable)} URLs estáveis puladas (válidas nas últimas {STABLE_MIN_CHECKS} verificações, há menos de {STABLE_RECHECK_HOURS}h)", "gray")
+        for url in stable:
+            publish(history_result(url))
+    journaled = _run_journal.lookup(url for url, result in results.items() if result is None) if _run_journal else {}
+    if journaled:
+        print_colored(f"  {len(journaled)} URLs reaproveitadas da execução interrompida", "gray")
+        for result in journaled.values():
+            publish(result)
+    bulk_results, pending = await resolve_with_bulk_sources([url for url, result in results.items() if result is None],
+                                                            component_name)
+    for result in bulk_results.values():
+        publish(result)
+    del bulk_results
+
+    # Falhas da pré-verificação já passaram pela passada rápida: vão direto à confirmação
+    failures: List[UrlCheckResult] = [_prevalidation_failures.pop(url) for url in pending if url in _prevalidation_failures]
+    if failures:
+        prevalidated = {result.url for result in failures}
+        pending = [url for url in pending if url not in prevalidated]
+
+    print_colored(f"Verificando {len(pending)} URLs com asyncio...", "yellow")
 
     # Cria barra de progresso
-    progress_bar = create_progress_bar(len(urls), "Verificando URLs")
+    progress_bar = create_progress_bar(len(pending), "Verificando URLs")
+
+    def on_result(result: UrlCheckResult) -> None:
+        if result.is_valid:
+            publish(result)
+        else:
+            failures.append(result)
+
+    # Fase 1: passada rápida (timeouts curtos, sem pausas, teto de concorrência por host)
+    deadline = get_run_deadline()
+    with validation_phase("fast"):
+        await deadline.run(validate_urls_stream(pending, on_result, progress_bar=progress_bar))
+    progress_bar.close()
+
+    # Fase 2: apenas as falhas são confirmadas, devagar, antes de qualquer remoção ou cache de falha
+    completed, confirmed = await deadline.run(confirm_failures(failures))
+    for result in failures:
+        if not completed:
+            # Falhas não confirmadas dentro do prazo não removem nada
+            result.is_unknown = True
+        publish(confirmed.get(result.url, result) if completed else result)
+
+    # URLs não verificadas no prazo ficam como desconhecidas
+    for url in [url for url, result in results.items() if result is None]:
+        publish(deadline_result(url))
+    history.flush()
+    if _results_sink:
+        _results_sink.flush()
+
+    limits = get_host_limiter().describe_limits()
+    if limits:
+        print_colored(f"Concorrência por host (atual/máx.): {limits}", "gray")
+    hedging = get_host_limiter().hedging
+    if hedging.issued:
+        print_colored(f"Requisições duplicadas (hedge): {hedging.issued} emitidas, {hedging.won} responderam primeiro", "gray")
+
+    return results
+
+# Manifesto de integridade (SHA-256 dos artefatos)
+class BandwidthLimiter:
+    """Limite global de banda (bytes/s) compartilhado por todos os downloads"""
+    def __init__(self, bytes_per_second: float = 0):
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    async def consume(self, size: int) -> None:
+        """Reserva a janela de tempo para transferir size bytes e aguarda até ela"""
+        if self.bytes_per_second <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + size / self.bytes_per_second
+            delay = start - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def load_checksum_manifest() -> Dict:
+    """Carrega o manifesto de checksums (componente -> versão -> hash/tamanho)"""
+    if CHECKSUM_MANIFEST_FILE.exists():
+        try:
+            with open(CHECKSUM_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            manifest.setdefault('components', {})
+            return manifest
+        except (OSError, ValueError) as e:
+            print_colored(f"Erro ao ler manifesto de checksums: {e}", "yellow")
+    return {'version': 1, 'components': {}}
+
+def save_checksum_manifest(manifest: Dict) -> None:
+    """Salva o manifesto de checksums de forma atômica"""
+    manifest['version'] = 1
+    manifest['generated'] = datetime.now().isoformat()
+    temp_file = CHECKSUM_MANIFEST_FILE.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+    temp_file.replace(CHECKSUM_MANIFEST_FILE)
+
+def is_artifact_unchanged(entry: Optional[Dict], head: UrlCheckResult) -> bool:
+    """Indica se o artefato não mudou desde o último hash (mesma URL, ETag e tamanho)"""
+    if not entry or not entry.get('sha256') or entry.get('url') != head.url:
+        return False
+    if head.content_length and entry.get('size') != head.content_length:
+        return False
+    if head.etag:
+        return entry.get('etag') == head.etag
+    return bool(head.last_modified) and entry.get('last_modified') == head.last_modified
+
+async def hash_remote_artifact(url: str, bandwidth: BandwidthLimiter) -> Tuple[Optional[str], int, Dict[str, str], str]:
+    """Baixa o artefato em blocos calculando o SHA-256 sem mantê-lo em memória"""
+    digest = hashlib.sha256()
+    size = 0
+    settings = get_network_profile().for_host(host_of(url))
+    timeout = aiohttp.ClientTimeout(total=None, connect=settings.connect_timeout, sock_read=settings.read_timeout)
+    try:
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            # A vaga do host cobre só o envio e os cabeçalhos: o corpo é limitado por download_concurrency
+            # e a duração do download não entra na latência do controlador AIMD
+            async with get_host_limiter().slot(url):
+                response = await session.get(url)
+            async with response:
+                if response.status >= 400:
+                    return None, 0, {}, f"HTTP {response.status}"
+                async for chunk in response.content.iter_chunked(HASH_CHUNK_SIZE):
+                    await bandwidth.consume(len(chunk))
+                    digest.update(chunk)
+                    size += len(chunk)
+
+                expected = response.content_length
+                if expected is not None and expected != size:
+                    return None, size, {}, f"Download incompleto ({size} de {expected} bytes)"
+
+                validators = {
+                    'etag': response.headers.get('ETag', ''),
+                    'last_modified': response.headers.get('Last-Modified', '')
+                }
+                return digest.hexdigest(), size, validators, ""
+    except asyncio.TimeoutError:
+        return None, size, {}, "Timeout"
+    except aiohttp.ClientError as e:
+        return None, size, {}, str(e)
+
+async def verify_component_checksums(component_name: str, versions: List[Dict], manifest: Dict,
+                                     bandwidth: BandwidthLimiter) -> Dict[str, int]:
+    """Atualiza SHA-256 e tamanho de cada versão do componente no manifesto"""
+    entries = manifest['components'].setdefault(component_name, {})
+    stats = {'hashed': 0, 'unchanged': 0, 'changed': 0, 'failed': 0, 'unverified': 0}
+    if not versions:
+        return stats
+
+    print_colored(f"Verificando checksums de {len(versions)} artefatos...", "yellow")
+    progress_bar = create_progress_bar(len(versions), "Checksums")
+    downloads = asyncio.Semaphore(int(get_network_profile().values['download_concurrency']))
+
+    async def verify(version: Dict) -> None:
+        entry = entries.get(version['version'])
+        head = await test_url_valid_async(version['url'])
+        mark_unknown_if_host_down(head)
+        if head.is_unknown:
+            # Host fora do ar ou com circuito aberto: não gasta banda baixando o artefato
+            stats['unverified'] += 1
+            return
+        if head.is_valid and is_artifact_unchanged(entry, head):
+            stats['unchanged'] += 1
+            entry['verified'] = datetime.now().isoformat()
+            return
+        if head.status_code in (404, 410):
+            stats['failed'] += 1
+            print_colored(f"\n  ✗ {version['version']}: HTTP {head.status_code}", "red")
+            return
 
-    # Cria semaphore para limitar concorrência
-    semaphore = asyncio.Semaphore(MAX_WORKERS)
+        async with downloads:
+            sha256, size, validators, error = await hash_remote_artifact(version['url'], bandwidth)
 
-    async def check_single_url(url):
-        async with semaphore:
-            result = await test_url_valid_async(url)
+        if not sha256:
+            stats['failed'] += 1
+            print_colored(f"\n  ✗ {version['version']}: {error}", "red")
+            return
+
+        if entry and entry.get('url') == version['url'] and entry.get('sha256') and entry['sha256'] != sha256:
+            stats['changed'] += 1
+            print_colored(f"\n  ⚠ {version['version']}: SHA-256 diferente do registrado para a mesma URL ({entry['sha256'][:12]}… -> {sha256[:12]}…)", "bright_red")
+
+        entries[version['version']] = {
+            'url': version['url'],
+            'sha256': sha256,
+            'size': size,
+            'etag': validators.get('etag', ''),
+            'last_modified': validators.get('last_modified', ''),
+            'verified': datetime.now().isoformat()
+        }
+        stats['hashed'] += 1
+
+    async def verify_with_progress(version: Dict) -> None:
+        try:
+            await verify(version)
+        finally:
             progress_bar.update(1)
-            # Pequeno delay para não sobrecarregar servidores
-            await asyncio.sleep(random.uniform(0.1, 0.3))
-            return result
 
-    # Executa todas as verificações com limite de concorrência
-    results = await asyncio.gather(*[check_single_url(url) for url in urls], return_exceptions=True)
-
-    # Processa resultados e trata exceções
-    processed_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            # Se houve uma exceção, cria um resultado de erro
-            error_result = UrlCheckResult(urls[i])
-            error_result.is_valid = False
-            error_result.error_message = str(result)
-            processed_results.append(error_result)
+    await asyncio.gather(*[verify_with_progress(v) for v in versions])
+    progress_bar.close()
+    return stats
+
+async def verify_checksums(component_files: List[Tuple[str, Path]], bandwidth_limit_mbps: float) -> None:
+    """Modo --verify-checksums: gera/atualiza o manifesto de integridade"""
+    print_colored("\n=== Verificação de checksums (SHA-256) ===", "cyan")
+    manifest = load_checksum_manifest()
+    bandwidth = BandwidthLimiter(bandwidth_limit_mbps * 1024 * 1024)
+    if bandwidth_limit_mbps > 0:
+        print_colored(f"Limite de banda: {bandwidth_limit_mbps} MB/s", "gray")
+
+    for component_name, file_path in component_files:
+        print_colored(f"\n--- {component_name} ---", "yellow")
+        stats = await verify_component_checksums(component_name, parse_cs_versions(file_path), manifest, bandwidth)
+        save_checksum_manifest(manifest)
+        print_colored(f"Calculados: {stats['hashed']} | Inalterados: {stats['unchanged']} | Falhas: {stats['failed']}", "green")
+        if stats['unverified']:
+            print_colored(f"Não verificados: {stats['unverified']} (host indisponível ou circuito aberto)", "yellow")
+        if stats['changed']:
+            print_colored(f"ATENÇÃO: {stats['changed']} artefatos mudaram de conteúdo sem mudar de URL", "bright_red")
+
+    print_colored(f"\nManifesto salvo em: {CHECKSUM_MANIFEST_FILE}", "green")
+
+# Espelho local de artefatos endereçado por conteúdo
+class _RangeIgnored(Exception):
+    """O servidor respondeu 200 a uma requisição com Range (If-Range não conferiu)"""
+
+class ArtifactMirror:
+    """Espelho local de artefatos endereçado por conteúdo (SHA-256)
+
+    Estrutura do diretório:
+        objects/ab/abcdef...   conteúdo de cada artefato, nomeado pelo SHA-256
+        partial/<id>.part      downloads em andamento (retomáveis)
+        partial/<id>.json      blocos já concluídos de cada download parcial
+        index.json             URL original -> caminho local, hash e tamanho
+    """
+
+    def __init__(self, root: Path, bandwidth: BandwidthLimiter, chunk_size: int, chunk_concurrency: int):
+        self.root = root
+        self.objects_path = root / "objects"
+        self.partial_path = root / "partial"
+        self.index_file = root / "index.json"
+        self.bandwidth = bandwidth
+        self.chunk_size = max(HASH_CHUNK_SIZE, chunk_size)
+        self.chunk_concurrency = max(1, chunk_concurrency)
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+        self.partial_path.mkdir(parents=True, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f).get('artifacts', {})
+            except (OSError, ValueError) as e:
+                print_colored(f"Erro ao ler índice do espelho: {e}", "yellow")
+        return {}
+
+    def save_index(self) -> None:
+        """Salva o índice URL -> artefato local de forma atômica"""
+        temp_file = self.index_file.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'generated': datetime.now().isoformat(), 'artifacts': self.index},
+                      f, indent=2, ensure_ascii=False, sort_keys=True)
+        temp_file.replace(self.index_file)
+
+    def object_path(self, sha256: str) -> Path:
+        return self.objects_path / sha256[:2] / sha256
+
+    def is_current(self, url: str, head: UrlCheckResult) -> bool:
+        """Indica se a URL já está espelhada e não mudou desde então"""
+        entry = self.index.get(url)
+        if not entry or not (self.root / entry['path']).exists():
+            return False
+        if head.content_length and entry.get('size') != head.content_length:
+            return False
+        if head.etag:
+            return entry.get('etag') == head.etag
+        return True
+
+    async def mirror(self, url: str, component: str, version: str) -> Tuple[bool, str]:
+        """Espelha uma URL; retorna (sucesso, mensagem)"""
+        head = await test_url_valid_async(url)
+        if head.is_valid and self.is_current(url, head):
+            return True, "inalterado"
+        if not head.is_valid and head.status_code in (404, 410):
+            return False, f"HTTP {head.status_code}"
+
+        part_id = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        part_file = self.partial_path / f"{part_id}.part"
+        state_file = self.partial_path / f"{part_id}.json"
+
+        # Cada requisição (HEAD, bloco ou download inteiro) ocupa sua própria vaga do host
+        settings = get_network_profile().for_host(host_of(url))
+        timeout = aiohttp.ClientTimeout(total=None, connect=settings.connect_timeout, sock_read=settings.read_timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            try:
+                size, validators = await self._probe(session, url)
+                if size and validators['ranges']:
+                    try:
+                        await self._download_ranges(session, url, size, validators, part_file, state_file)
+                    except _RangeIgnored:
+                        # O artefato mudou durante o download (ou o servidor ignora Range): baixa inteiro
+                        state_file.unlink(missing_ok=True)
+                        await self._download_stream(session, url, part_file)
+                else:
+                    await self._download_stream(session, url, part_file)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as e:
+                return False, str(e) or e.__class__.__name__
+
+        sha256, size = await asyncio.get_running_loop().run_in_executor(None, self._hash_file, part_file)
+        target = self.object_path(sha256)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists():
+            part_file.unlink()
         else:
-            processed_results.append(result)
+            part_file.replace(target)
+        state_file.unlink(missing_ok=True)
+
+        self.index[url] = {
+            'path': target.relative_to(self.root).as_posix(),
+            'sha256': sha256,
+            'size': size,
+            'component': component,
+            'version': version,
+            'etag': validators.get('etag', ''),
+            'mirrored': datetime.now().isoformat()
+        }
+        return True, f"{size:,} bytes"
+
+    async def _probe(self, session: aiohttp.ClientSession, url: str) -> Tuple[int, Dict]:
+        """Descobre tamanho final, validadores e suporte a Range (seguindo redirecionamentos)"""
+        async with get_host_limiter().slot(url), session.head(url, allow_redirects=True) as response:
+            if response.status >= 400:
+                return 0, {'ranges': False, 'etag': '', 'url': url}
+            size = int(response.headers.get('Content-Length') or 0)
+            return size, {
+                'ranges': response.headers.get('Accept-Ranges', '').lower() == 'bytes',
+                'etag': response.headers.get('ETag', ''),
+                'url': str(response.url)
+            }
+
+    async def _download_ranges(self, session: aiohttp.ClientSession, url: str, size: int, validators: Dict,
+                               part_file: Path, state_file: Path) -> None:
+        """Baixa o artefato em blocos paralelos com Range, retomando blocos já concluídos"""
+        chunks = [(start, min(start + self.chunk_size, size) - 1) for start in range(0, size, self.chunk_size)]
+
+        done = set()
+        if state_file.exists() and part_file.exists():
+            try:
+                with open(state_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                if state.get('size') == size and state.get('etag') == validators['etag']:
+                    done = set(state.get('done', []))
+            except (OSError, ValueError):
+                done = set()
+        if not done or not part_file.exists():
+            with open(part_file, 'wb') as f:
+                f.truncate(size)
+            done = set()
+
+        state_lock = asyncio.Lock()
+        chunk_slots = asyncio.Semaphore(self.chunk_concurrency)
+        final_url = validators['url']
+
+        async def fetch_chunk(index: int, start: int, end: int) -> None:
+            headers = {'Range': f"bytes={start}-{end}"}
+            if validators['etag']:
+                headers['If-Range'] = validators['etag']
+            async with chunk_slots, get_host_limiter().slot(final_url):
+                async with session.get(final_url, headers=headers) as response:
+                    if response.status == 200:
+                        raise _RangeIgnored()
+                    if response.status != 206:
+                        raise ValueError(f"Servidor não respeitou Range (HTTP {response.status})")
+                    offset = start
+                    with open(part_file, 'r+b') as f:
+                        async for data in response.content.iter_chunked(HASH_CHUNK_SIZE):
+                            await self.bandwidth.consume(len(data))
+                            f.seek(offset)
+                            f.write(data)
+                            offset += len(data)
+                    if offset != end + 1:
+                        raise ValueError(f"Bloco incompleto ({offset - start} de {end - start + 1} bytes)")
+
+            async with state_lock:
+                done.add(index)
+                with open(state_file, 'w', encoding='utf-8') as f:
+                    json.dump({'url': url, 'size': size, 'etag': validators['etag'], 'done': sorted(done)}, f)
+
+        tasks = [
+            asyncio.ensure_future(fetch_chunk(index, start, end))
+            for index, (start, end) in enumerate(chunks)
+            if index not in done
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Um bloco falhou (ou o download foi cancelado): cancela os demais antes de sair
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _download_stream(self, session: aiohttp.ClientSession, url: str, part_file: Path) -> None:
+        """Baixa o artefato inteiro em streaming (servidor sem suporte a Range)"""
+        async with get_host_limiter().slot(url), session.get(url) as response:
+            if response.status >= 400:
+                raise ValueError(f"HTTP {response.status}")
+            with open(part_file, 'wb') as f:
+                async for data in response.content.iter_chunked(HASH_CHUNK_SIZE):
+                    await self.bandwidth.consume(len(data))
+                    f.write(data)
+
+    def _hash_file(self, path: Path) -> Tuple[str, int]:
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(block)
+                size += len(block)
+        return digest.hexdigest(), size
+
+async def mirror_artifacts(component_files: List[Tuple[str, Path]], mirror_dir: Path, version_filter: str,
+                           bandwidth_limit_mbps: float) -> None:
+    """Modo --mirror: pré-aquece o espelho local com os artefatos dos providers"""
+    print_colored(f"\n=== Espelho local de artefatos: {mirror_dir} ===", "cyan")
+    profile = get_network_profile()
+    mirror = ArtifactMirror(
+        mirror_dir,
+        BandwidthLimiter(bandwidth_limit_mbps * 1024 * 1024),
+        chunk_size=int(float(profile.values['mirror_chunk_size_mb']) * 1024 * 1024),
+        chunk_concurrency=int(profile.values['mirror_chunk_concurrency'])
+    )
+    pattern = re.compile(version_filter) if version_filter else None
+    downloads = asyncio.Semaphore(int(profile.values['download_concurrency']))
 
-    # Fecha barra de progresso
-    progress_bar.close()
+    for component_name, file_path in component_files:
+        versions = [v for v in parse_cs_versions(file_path) if not pattern or pattern.search(v['version'])]
+        if not versions:
+            continue
+
+        print_colored(f"\n--- {component_name} ({len(versions)} artefatos) ---", "yellow")
+        progress_bar = create_progress_bar(len(versions), "Espelhando")
+        stats = {'ok': 0, 'failed': 0}
 
-    return processed_results
+        async def mirror_one(version: Dict) -> None:
+            try:
+                async with downloads:
+                    ok, message = await mirror.mirror(version['url'], component_name, version['version'])
+                if ok:
+                    stats['ok'] += 1
+                else:
+                    stats['failed'] += 1
+                    print_colored(f"\n  ✗ {version['version']}: {message}", "red")
+            finally:
+                progress_bar.update(1)
+
+        await asyncio.gather(*[mirror_one(v) for v in versions])
+        progress_bar.close()
+        mirror.save_index()
+        print_colored(f"Espelhados: {stats['ok']} | Falhas: {stats['failed']}", "green")
+
+    print_colored(f"\nÍndice do espelho: {mirror.index_file}", "green")
 
 # Funções para buscar novas versões de diferentes componentes
-async def get_git_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do Git usando asyncio"""
-    try:
-        api_url = "https://api.github.com/repos/git-for-windows/git/releases"
-        content, error, status_code = fetch_github_releases(api_url)
+def iter_http_lines(url: str, timeout: Optional[float] = None, max_retries: Optional[int] = None) -> Iterator[str]:
+    """Baixa uma resposta HTTP linha a linha, para o parse começar antes do fim do download
 
-        if not content:
-            print_colored(f"Erro ao buscar versões do Git: {error}", "yellow")
-            return []
+    Falhas antes da primeira linha são repetidas como em make_http_request; uma falha
+    no meio da leitura é propagada (linhas já entregues não são repetidas).
+    """
+    max_retries = max_retries or get_network_profile().max_retries
+    for attempt in range(max_retries):
+        delivered = False
+        try:
+            with get_host_limiter().sync_slot(url) as host_settings:
+                with urlopen(Request(url), timeout=timeout or host_settings.read_timeout) as response:
+                    for line in response:
+                        delivered = True
+                        yield line.decode('utf-8', errors='replace')
+            return
+        except OSError:
+            if delivered or attempt == max_retries - 1:
+                raise
+        time.sleep(1)
+
+def iter_json_array(lines: Iterable[str]) -> Iterator[Any]:
+    """Interpreta um array JSON de objetos aos poucos, entregando cada elemento assim que termina"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    for line in lines:
+        buffer += line
+        position = 0
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,[":
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                element, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                break
+            yield element
+        buffer = buffer[position:]
+    if buffer.strip():
+        raise ValueError("JSON incompleto")
 
-        releases = json.loads(content.decode('utf-8'))
+def iter_github_releases(api_url: str) -> Iterator[Dict]:
+    """Releases publicadas (sem prerelease/draft) da API do GitHub, página a página
 
-        new_versions = []
+    Cada página só é baixada depois que a anterior foi consumida (a descoberta
+    valida as primeiras versões enquanto as seguintes ainda não chegaram), com o
+    discovery_delay do perfil de rede entre as páginas.
+    """
+    profile = get_network_profile()
+    for page in range(1, GITHUB_RELEASES_MAX_PAGES + 1):
+        if page > 1:
+            time.sleep(random.uniform(*profile.discovery_delay))
+        content, error, status_code = fetch_github_releases(f"{api_url}?per_page={GITHUB_RELEASES_PER_PAGE}&page={page}")
+        if not content:
+            if page == 1:
+                raise ValueError(error)
+            print_colored(f"  Página {page} de {api_url} indisponível: {error}", "gray")
+            return
 
+        releases = json.loads(content.decode('utf-8'))
         for release in releases:
             if release.get('prerelease') or release.get('draft'):
                 continue
+            yield release
+        if len(releases) < GITHUB_RELEASES_PER_PAGE:
+            return
 
+def iter_git_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do Git (versão + URL de download)"""
+    try:
+        api_url = "https://api.github.com/repos/git-for-windows/git/releases"
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "git")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
             # Procura o asset MinGit
             asset = next(
                 (a for a in release.get('assets', [])
@@ -1320,59 +4230,37 @@ async def get_git_new_versions_async(existing_versions: List[Dict]) -> List[Dict
                 None
             )
             if asset:
-                new_versions.append({
+                yield {
                     'version': version,
                     'url': asset['browser_download_url']
-                })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return await test_new_version_urls_async(new_versions, "git")
+                }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do Git: {e}", "yellow")
-        return []
 
-async def get_node_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do Node.js usando asyncio"""
+def iter_node_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do Node.js (versão + URL de download)"""
     try:
         api_url = "https://nodejs.org/dist/index.json"
-        content, error, status_code = make_http_request(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do Node.js: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
+        # O índice tem centenas de releases: cada uma é entregue assim que chega
+        for release in iter_json_array(iter_http_lines(api_url)):
             version = normalize_version(release['version'], "node")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://nodejs.org/dist/{release['version']}/node-{release['version']}-win-x64.zip"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return await test_new_version_urls_async(new_versions, "node")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do Node.js: {e}", "yellow")
-        return []
 
-async def get_php_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do PHP usando asyncio"""
+def iter_php_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do PHP (versão + URL de download)"""
     try:
         base_url = "https://windows.php.net"
         release_url = base_url + "/downloads/releases"
         archive_url = release_url + "/archives/"
 
-        new_versions = []
-
         for url in [release_url, archive_url]:
             try:
                 content, error, status_code = make_http_request(url)
@@ -1397,158 +4285,42 @@ async def get_php_new_versions_async(existing_versions: List[Dict]) -> List[Dict
 
                                 if not version:
                                     continue
-                                if any(v['version'] == version for v in existing_versions):
-                                    continue
-
                                 download_url = href if href.startswith('http') else base_url + href
 
-                                new_versions.append({
+                                yield {
                                     'version': version,
                                     'url': download_url
-                                })
+                                }
                 except ImportError:
                     print_colored("BeautifulSoup não disponível, pulando busca de PHP", "yellow")
 
             except Exception as e:
                 print_colored(f"Erro ao buscar de {url}: {e}", "yellow")
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return await test_new_version_urls_async(new_versions, "php")
     except Exception as e:
         print_colored(f"Erro ao buscar versões do PHP: {e}", "yellow")
-        return []
 
-async def get_python_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do Python usando asyncio"""
+def iter_python_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do Python (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/python/cpython/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do Python: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "python")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://www.python.org/ftp/python/{version}/python-{version}-amd64.zip"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return await test_new_version_urls_async(new_versions, "python")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do Python: {e}", "yellow")
-        return []
-
-# Async wrappers for remaining functions
-async def get_mysql_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for MySQL version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_mysql_new_versions, existing_versions)
-
-async def get_go_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for Go version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_go_new_versions, existing_versions)
 
-async def get_mongodb_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for MongoDB version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_mongodb_new_versions, existing_versions)
-
-async def get_nginx_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for Nginx version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_nginx_new_versions, existing_versions)
-
-async def get_elasticsearch_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for Elasticsearch version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_elasticsearch_new_versions, existing_versions)
-
-async def get_composer_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for Composer version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_composer_new_versions, existing_versions)
-
-async def get_adminer_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for Adminer version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_adminer_new_versions, existing_versions)
-
-async def get_dbeaver_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for DBeaver version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_dbeaver_new_versions, existing_versions)
-
-async def get_openssl_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for OpenSSL version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_openssl_new_versions, existing_versions)
-
-async def get_pgsql_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for PostgreSQL version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_pgsql_new_versions, existing_versions)
-
-async def get_phpcsfixer_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for PHP CS Fixer version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_phpcsfixer_new_versions, existing_versions)
-
-async def get_phpmyadmin_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for phpMyAdmin version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_phpmyadmin_new_versions, existing_versions)
-
-async def get_wpcli_new_versions_async(existing_versions: List[Dict]) -> List[Dict]:
-    """Async wrapper for WP-CLI version fetching"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, get_wpcli_new_versions, existing_versions)
-
-def run_async_test_new_versions(new_versions: List[Dict], component_name: str) -> List[Dict]:
-    """Helper function to run async test_new_version_urls from sync context"""
-    import asyncio
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(test_new_version_urls_async(new_versions, component_name))
-    finally:
-        loop.close()
-
-def get_mysql_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do MySQL usando urllib com anti-detecção"""
+def iter_mysql_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do MySQL (versão + URL de download)"""
     try:
         # Busca releases do GitHub oficial do MySQL
         api_url = "https://api.github.com/repos/mysql/mysql-server/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do MySQL: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             # Extrai versão do tag (ex: mysql-8.4.5 -> 8.4.5)
             match = re.match(r'^mysql-(\d+\.\d+\.\d+)$', release['tag_name'])
             if match:
@@ -1559,9 +4331,6 @@ def get_mysql_new_versions(existing_versions: List[Dict]) -> List[Dict]:
                 if not version:
                     continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
             # Constrói URL baseada no padrão do MySQL
             # Extrai versão principal (ex: 8.4.5 -> 8.4)
             match = re.match(r'^(\d+)\.(\d+)\.(\d+)', version)
@@ -1569,109 +4338,52 @@ def get_mysql_new_versions(existing_versions: List[Dict]) -> List[Dict]:
                 major_minor = f"{match.group(1)}.{match.group(2)}"
                 download_url = f"https://dev.mysql.com/get/Downloads/MySQL-{major_minor}/mysql-{version}-winx64.zip"
 
-                new_versions.append({
+                yield {
                     'version': version,
                     'url': download_url
-                })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "mysql")
+                }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do MySQL: {e}", "yellow")
-        return []
 
-def get_go_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do Go usando urllib com anti-detecção"""
+def iter_go_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do Go (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/golang/go/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do Go: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "go")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://go.dev/dl/go{version}.windows-amd64.zip"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "go")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do Go: {e}", "yellow")
-        return []
 
-def get_mongodb_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do MongoDB usando urllib com anti-detecção"""
+def iter_mongodb_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do MongoDB (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/mongodb/mongo/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do MongoDB: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "mongodb")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://fastdl.mongodb.org/windows/mongodb-windows-x86_64-{version}.zip"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "mongodb")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do MongoDB: {e}", "yellow")
-        return []
 
-def get_nginx_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do Nginx usando urllib com anti-detecção"""
+def iter_nginx_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do Nginx (versão + URL de download)"""
     try:
         base_url = "https://nginx.org/download/"
-        content, error, status_code = make_http_request(base_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do Nginx: {error}", "yellow")
-            return []
-
-        # Usa BeautifulSoup para parsing HTML
-        try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(content.decode('utf-8'), 'html.parser')
-            links = soup.find_all('a', href=True)
-
-            new_versions = []
-
-            for link in links:
-                href = link['href']
+        # Listagem de diretório: um link por linha, interpretada à medida que é baixada
+        for line in iter_http_lines(base_url):
+            for href in re.findall(r'href="([^"]+)"', line):
                 match = re.search(r'nginx-(\d+\.\d+\.\d+)\.zip$', href)
                 if match:
                     version_string = match.group(1)
@@ -1679,225 +4391,106 @@ def get_nginx_new_versions(existing_versions: List[Dict]) -> List[Dict]:
 
                     if not version:
                         continue
-                    if any(v['version'] == version for v in existing_versions):
-                        continue
-
-                    new_versions.append({
+                    yield {
                         'version': version,
                         'url': f"https://nginx.org/download/{href}"
-                    })
-
-            # Verifica URLs em paralelo e retorna apenas as válidas
-            return run_async_test_new_versions(new_versions, "nginx")
-        except ImportError:
-            print_colored("BeautifulSoup não disponível, pulando busca de Nginx", "yellow")
-            return []
+                    }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do Nginx: {e}", "yellow")
-        return []
 
-def get_elasticsearch_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do Elasticsearch usando urllib com anti-detecção"""
+def iter_elasticsearch_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do Elasticsearch (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/elastic/elasticsearch/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do Elasticsearch: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "elasticsearch")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://artifacts.elastic.co/downloads/elasticsearch/elasticsearch-{version}-windows-x86_64.zip"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "elasticsearch")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do Elasticsearch: {e}", "yellow")
-        return []
 
-def get_composer_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do Composer usando urllib com anti-detecção"""
+def iter_composer_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do Composer (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/composer/composer/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do Composer: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "composer")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://getcomposer.org/download/{version}/composer.phar"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "composer")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do Composer: {e}", "yellow")
-        return []
 
-def get_adminer_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do Adminer usando urllib com anti-detecção"""
+def iter_adminer_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do Adminer (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/vrana/adminer/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do Adminer: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "adminer")
-            if not version:
-                continue
-
-            if any(v['version'] == version for v in existing_versions):
+            if not version:
                 continue
 
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://github.com/vrana/adminer/releases/download/v{version}/adminer-{version}.php"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "adminer")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do Adminer: {e}", "yellow")
-        return []
 
-def get_dbeaver_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do DBeaver usando urllib com anti-detecção"""
+def iter_dbeaver_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do DBeaver (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/dbeaver/dbeaver/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do DBeaver: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "dbeaver")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://dbeaver.io/files/{version}/dbeaver-ce-{version}-win32.win32.x86_64.zip"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "dbeaver")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do DBeaver: {e}", "yellow")
-        return []
 
-def get_openssl_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do OpenSSL usando urllib com anti-detecção"""
+def iter_openssl_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do OpenSSL (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/openssl/openssl/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do OpenSSL: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "openssl")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
             # Converte versão para formato do Shining Light (ex: 3.1.0 -> 3_1_0)
             version_formatted = version.replace('.', '_')
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://slproweb.com/download/Win64OpenSSL-{version_formatted}.exe"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "openssl")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do OpenSSL: {e}", "yellow")
-        return []
 
-def get_pgsql_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do PostgreSQL usando urllib com anti-detecção"""
+def iter_pgsql_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do PostgreSQL (versão + URL de download)"""
     try:
-        new_versions = []
-
         # Busca informações da página de download oficial da EnterpriseDB
         download_page_url = "https://www.enterprisedb.com/download-postgresql-binaries"
-        content, error, status_code = make_http_request(download_page_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do PostgreSQL: {error}", "yellow")
-            return []
 
         # Extrai informações das versões disponíveis
         # Padrão: Version X.Y [Windows x86-64](https://sbp.enterprisedb.com/getfile.jsp?fileid=XXXXXX)
-        content_str = content.decode('utf-8')
-
-        # Busca por padrões de versão e URLs
-        version_pattern = r'Version\s+(\d+\.\d+(?:\.\d+)?)\s+.*?Windows\s+x86-64.*?fileid=(\d+)'
-        matches = re.findall(version_pattern, content_str, re.IGNORECASE)
+        # O padrão não atravessa linhas, então a página é interpretada linha a linha
+        version_pattern = re.compile(r'Version\s+(\d+\.\d+(?:\.\d+)?)\s+.*?Windows\s+x86-64.*?fileid=(\d+)', re.IGNORECASE)
+        matches = (match for line in iter_http_lines(download_page_url) for match in version_pattern.findall(line))
 
         for match in matches:
             version_string = match[0]
@@ -1909,180 +4502,458 @@ def get_pgsql_new_versions(existing_versions: List[Dict]) -> List[Dict]:
             else:
                 version = version_string
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
             download_url = f"https://sbp.enterprisedb.com/getfile.jsp?fileid={file_id}"
 
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': download_url
-            })
-
-            print_colored(f"  Encontrada versão: {version} (FileID: {file_id})", "green")
-
-        if new_versions:
-            print_colored(f"  Total de novas versões encontradas: {len(new_versions)}", "yellow")
-        else:
-            print_colored("  Nenhuma nova versão encontrada", "gray")
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "pgsql")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do PostgreSQL: {e}", "yellow")
-        return []
 
-def get_phpcsfixer_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do PHP CS Fixer usando urllib com anti-detecção"""
+def iter_phpcsfixer_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do PHP CS Fixer (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/PHP-CS-Fixer/PHP-CS-Fixer/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do PHP CS Fixer: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "phpcsfixer")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://github.com/PHP-CS-Fixer/PHP-CS-Fixer/releases/download/v{version}/php-cs-fixer.phar"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "phpcsfixer")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do PHP CS Fixer: {e}", "yellow")
-        return []
 
-def get_phpmyadmin_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do phpMyAdmin usando urllib com anti-detecção"""
+def iter_phpmyadmin_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do phpMyAdmin (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/phpmyadmin/phpmyadmin/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do phpMyAdmin: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "phpmyadmin")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://files.phpmyadmin.net/phpMyAdmin/{version}/phpMyAdmin-{version}-all-languages.zip"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "phpmyadmin")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do phpMyAdmin: {e}", "yellow")
-        return []
 
-def get_wpcli_new_versions(existing_versions: List[Dict]) -> List[Dict]:
-    """Busca novas versões do WP-CLI usando urllib com anti-detecção"""
+def iter_wpcli_versions() -> Iterator[Dict]:
+    """Lista as versões publicadas do WP-CLI (versão + URL de download)"""
     try:
         api_url = "https://api.github.com/repos/wp-cli/wp-cli/releases"
-        content, error, status_code = fetch_github_releases(api_url)
-
-        if not content:
-            print_colored(f"Erro ao buscar versões do WP-CLI: {error}", "yellow")
-            return []
-
-        releases = json.loads(content.decode('utf-8'))
-
-        new_versions = []
-
-        for release in releases:
-            if release.get('prerelease') or release.get('draft'):
-                continue
-
+        for release in iter_github_releases(api_url):
             version = normalize_version(release['tag_name'], "wpcli")
             if not version:
                 continue
 
-            if any(v['version'] == version for v in existing_versions):
-                continue
-
-            new_versions.append({
+            yield {
                 'version': version,
                 'url': f"https://github.com/wp-cli/wp-cli/releases/download/v{version}/wp-cli-{version}.phar"
-            })
-
-        # Verifica URLs em paralelo e retorna apenas as válidas
-        return run_async_test_new_versions(new_versions, "wpcli")
+            }
     except Exception as e:
         print_colored(f"Erro ao buscar versões do WP-CLI: {e}", "yellow")
-        return []
+
+# Modelos de URL fixos: permitem descobrir versões sem consultar a API do GitHub
+SPECULATIVE_URL_TEMPLATES = {
+    "python": lambda v: f"https://www.python.org/ftp/python/{v}/python-{v}-amd64.zip",
+    "go": lambda v: f"https://go.dev/dl/go{v}.windows-amd64.zip",
+    "mongodb": lambda v: f"https://fastdl.mongodb.org/windows/mongodb-windows-x86_64-{v}.zip",
+    "mysql": lambda v: f"https://dev.mysql.com/get/Downloads/MySQL-{'.'.join(v.split('.')[:2])}/mysql-{v}-winx64.zip"
+}
+SPECULATIVE_LINES = 3  # Linhas major.minor mais recentes sondadas com patch+1
+
+_speculative_discovery = False
+
+def set_speculative_discovery(enabled: bool) -> None:
+    """Ativa a descoberta especulativa para os componentes com modelo de URL"""
+    global _speculative_discovery
+    _speculative_discovery = enabled
+
+def speculative_probe(loop: asyncio.AbstractEventLoop, component_name: str) -> Callable[[str], UrlCheckResult]:
+    """Sonda usada pela thread produtora: passa pelo caminho assíncrono validado
+
+    URLs no cache de falhas não são sondadas de novo e hosts com o circuito aberto
+    não recebem requisições; o resto usa test_url_valid_async (circuito, AIMD e
+    single-flight), então a validação seguinte da mesma URL não repete o HEAD.
+    """
+    failed_urls = {entry['Url'] for entry in get_failed_versions_cache(component_name)}
+
+    def probe(url: str) -> UrlCheckResult:
+        if url in failed_urls:
+            result = UrlCheckResult(url)
+            result.error_message = "URL no cache de falhas"
+            return result
+        if get_host_limiter().breaker.is_open(host_of(url)):
+            return circuit_open_result(url)
+        return asyncio.run_coroutine_threadsafe(test_url_valid_async(url), loop).result()
+
+    return probe
+
+def iter_speculative_versions(component_name: str, existing_versions: List[Dict],
+                              probe: Callable[[str], UrlCheckResult]) -> Iterator[Dict]:
+    """Sonda com HEAD as próximas versões prováveis (patch+1, minor+1.0) a partir das conhecidas
+
+    Cada sequência para na primeira versão inexistente e a sondagem toda para quando
+    o host fica indisponível; só versões confirmadas são entregues ao pipeline, então
+    as sondagens sem sucesso não entram no cache de falhas.
+    """
+    template = SPECULATIVE_URL_TEMPLATES[component_name]
+    known = sorted({
+        tuple(int(part) for part in match.groups())
+        for match in (re.match(r'^(\d+)\.(\d+)\.(\d+)$', v['version']) for v in existing_versions)
+        if match
+    })
+    if not known:
+        print_colored(f"  Nenhuma versão conhecida de {component_name} para a descoberta especulativa", "yellow")
+        return
+
+    newest_per_line = {}
+    for version in known:
+        newest_per_line[version[:2]] = version
+    starts = [newest_per_line[line] for line in sorted(newest_per_line)[-SPECULATIVE_LINES:]]
+    major, minor, _ = known[-1]
+    starts.append((major, minor + 1, -1))
+
+    probes = 0
+    found = 0
+    unavailable = None
+    for major, minor, patch in starts:
+        while unavailable is None:
+            patch += 1
+            version = f"{major}.{minor}.{patch}"
+            probes += 1
+            result = probe(template(version))
+            if result.is_unknown:
+                unavailable = result
+            elif not result.is_valid:
+                break
+            else:
+                found += 1
+                yield {'version': version, 'url': template(version)}
+
+    if unavailable:
+        print_colored(f"  Descoberta especulativa interrompida: {unavailable.error_message}", "yellow")
+    print_colored(f"  Descoberta especulativa: {probes} sondagens, {found} versões encontradas", "gray")
+
+# Descoberta de versões de cada componente (parse + normalização, sem validação)
+DISCOVERY_ITERATORS: Dict[str, Callable[[], Iterator[Dict]]] = {
+    "git": iter_git_versions,
+    "node": iter_node_versions,
+    "php": iter_php_versions,
+    "python": iter_python_versions,
+    "mysql": iter_mysql_versions,
+    "go": iter_go_versions,
+    "mongodb": iter_mongodb_versions,
+    "nginx": iter_nginx_versions,
+    "elasticsearch": iter_elasticsearch_versions,
+    "composer": iter_composer_versions,
+    "adminer": iter_adminer_versions,
+    "dbeaver": iter_dbeaver_versions,
+    "openssl": iter_openssl_versions,
+    "pgsql": iter_pgsql_versions,
+    "phpcsfixer": iter_phpcsfixer_versions,
+    "phpmyadmin": iter_phpmyadmin_versions,
+    "wpcli": iter_wpcli_versions
+}
 
 async def get_new_versions_for_component_async(component_name: str, existing_versions: List[Dict]) -> List[Dict]:
     """Função genérica para buscar novas versões de forma assíncrona"""
-    component_functions = {
-        "git": get_git_new_versions_async,
-        "node": get_node_new_versions_async,
-        "php": get_php_new_versions_async,
-        "python": get_python_new_versions_async,
-        "mysql": get_mysql_new_versions_async,
-        "go": get_go_new_versions_async,
-        "mongodb": get_mongodb_new_versions_async,
-        "nginx": get_nginx_new_versions_async,
-        "elasticsearch": get_elasticsearch_new_versions_async,
-        "composer": get_composer_new_versions_async,
-        "adminer": get_adminer_new_versions_async,
-        "dbeaver": get_dbeaver_new_versions_async,
-        "openssl": get_openssl_new_versions_async,
-        "pgsql": get_pgsql_new_versions_async,
-        "phpcsfixer": get_phpcsfixer_new_versions_async,
-        "phpmyadmin": get_phpmyadmin_new_versions_async,
-        "wpcli": get_wpcli_new_versions_async
-    }
-
-    func = component_functions.get(component_name.lower())
-    if func:
-        return await func(existing_versions)
+    if _snapshot_catalog:
+        return _snapshot_catalog.new_versions(component_name.lower(), existing_versions)
+
+    iter_versions = DISCOVERY_ITERATORS.get(component_name.lower())
+    if _speculative_discovery and component_name.lower() in SPECULATIVE_URL_TEMPLATES:
+        probe = speculative_probe(asyncio.get_event_loop(), component_name.lower())
+        iter_versions = lambda: iter_speculative_versions(component_name.lower(), existing_versions, probe)
+    if iter_versions and _quick_versions:
+        upstream_versions = iter_versions
+        iter_versions = lambda: iter_quick_candidates(upstream_versions, existing_versions, _quick_versions * QUICK_CANDIDATE_FACTOR)
+    if iter_versions:
+        return await discover_new_versions(iter_versions, existing_versions, component_name.lower())
     else:
         print_colored(f"Busca de novas versões não implementada para: {component_name}", "yellow")
         return []
 
+def version_sort_key(version_dict: Dict) -> int:
+    """Chave numérica de ordenação de uma versão (major.minor.patch.build)"""
+    parts = version_dict['version'].split('.')
+    major = int(re.sub(r'\D', '', parts[0]) or 0) if parts else 0
+    minor = int(re.sub(r'\D', '', parts[1]) or 0) if len(parts) > 1 else 0
+    patch = int(re.sub(r'\D', '', parts[2]) or 0) if len(parts) > 2 else 0
+    build = int(re.sub(r'\D', '', parts[3]) or 0) if len(parts) > 3 else 0
+
+    # Cria um número para ordenação
+    return (major * 1000000) + (minor * 10000) + (patch * 100) + build
+
 def sort_versions(versions: List[Dict]) -> List[Dict]:
     """Ordena versões"""
-    def version_key(version_dict):
-        version = version_dict['version']
-        parts = version.split('.')
-        major = int(re.sub(r'\D', '', parts[0])) if parts else 0
-        minor = int(re.sub(r'\D', '', parts[1])) if len(parts) > 1 else 0
-        patch = int(re.sub(r'\D', '', parts[2])) if len(parts) > 2 else 0
-        build = int(re.sub(r'\D', '', parts[3])) if len(parts) > 3 else 0
+    return sorted(versions, key=version_sort_key)
+
+def version_series(version: str, depth: int = 2) -> str:
+    """Série de uma versão: major.minor (ou só major, com depth=1 ou sem minor)"""
+    return '.'.join(version.split('.')[:depth])
+
+def select_quick_versions(versions: List[Dict], newest_per_series: int) -> List[Dict]:
+    """Modo rápido: as versões mais novas de cada série major(.minor), em ordem crescente
+
+    Componentes com muitas séries major.minor (ex: Node.js) são agrupados por major,
+    e no máximo QUICK_MAX_SERIES séries (as mais novas) entram, limitando o total.
+    """
+    for depth in (2, 1):
+        by_series: Dict[str, List[Dict]] = {}
+        for version in versions:
+            by_series.setdefault(version_series(version['version'], depth), []).append(version)
+        if len(by_series) <= QUICK_MAX_SERIES:
+            break
+
+    newest_series = sorted(by_series.values(), key=lambda series: max(map(version_sort_key, series)))[-QUICK_MAX_SERIES:]
+    selected = []
+    for series_versions in newest_series:
+        selected.extend(sort_versions(series_versions)[-newest_per_series:])
+    return sort_versions(selected)
+
+def iter_quick_candidates(iter_versions: Callable[[], Iterator[Dict]], existing_versions: List[Dict],
+                          limit: int) -> Iterator[Dict]:
+    """Modo rápido: só versões mais novas que as do provider na mesma série, parando após limit candidatas
+
+    Séries que o provider não tem só entram se forem mais novas que a versão mais nova
+    do provider. Ao parar, o iterador do componente é fechado e não busca mais páginas.
+    """
+    newest: Dict[str, int] = {}
+    for version in existing_versions:
+        series = version_series(version['version'])
+        newest[series] = max(newest.get(series, 0), version_sort_key(version))
+    overall_newest = max(newest.values(), default=0)
+
+    seen = set()
+    upstream = iter_versions()
+    try:
+        for version in upstream:
+            if version['version'] in seen:
+                continue
+            key = version_sort_key(version)
+            if key <= newest.get(version_series(version['version']), overall_newest):
+                continue
+            seen.add(version['version'])
+            yield version
+            if len(seen) >= limit:
+                print_colored(f"  Modo rápido: descoberta encerrada após {limit} candidatas", "gray")
+                return
+    finally:
+        upstream.close()
+
+_quick_versions = 0
+
+def set_quick_mode(newest_per_series: int) -> None:
+    """Ativa o modo rápido (--quick K); 0 desativa"""
+    global _quick_versions
+    _quick_versions = newest_per_series
+
+def versions_to_check(cs_content: List[Dict]) -> List[Dict]:
+    """Versões do provider cujas URLs serão verificadas (todas, ou as K mais novas por série no modo rápido)"""
+    if _quick_versions:
+        return select_quick_versions(cs_content, _quick_versions)
+    return cs_content
+
+class SnapshotCatalog:
+    """Catálogo offline (snapshot) com as versões upstream e as verificações de URL de todos os componentes
+
+    Formato (JSON compactado com gzip):
+    {"format": 1, "created": ..., "components": {nome: {"fetched": ..., "versions": [...]}},
+     "urls": {url: {"valid", "status", "size", "sha256", "etag", "last_modified", "checked"}}}
+    """
+    def __init__(self, data: Dict, path: Optional[Path] = None):
+        self.data = data
+        self.path = path
+        self.components: Dict[str, Dict] = data.get('components', {})
+        self.urls: Dict[str, Dict] = data.get('urls', {})
+
+    @classmethod
+    def load(cls, path: Path) -> 'SnapshotCatalog':
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Snapshot inválido ({path}): {e}")
+        if data.get('format') != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Formato de snapshot não suportado ({path}): {data.get('format')}")
+        return cls(data, path)
+
+    def save(self, path: Path) -> None:
+        """Grava o snapshot de forma atômica"""
+        if not path.parent.exists():
+            path.parent.mkdir(parents=True)
+        temp_file = path.with_name(path.name + '.tmp')
+        with gzip.open(temp_file, 'wt', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        temp_file.replace(path)
+        self.path = path
+
+    def versions(self, component_name: str) -> List[Dict]:
+        return self.components.get(component_name, {}).get('versions', [])
+
+    def result_for(self, url: str) -> UrlCheckResult:
+        """Resultado da verificação registrada no snapshot (URL ausente = desconhecida)"""
+        result = UrlCheckResult(url)
+        result.source = "snapshot"
+        check = self.urls.get(url)
+        if check is None:
+            result.is_unknown = True
+            result.error_message = "URL fora do snapshot"
+            return result
+        result.is_valid = check.get('valid', False)
+        result.status_code = check.get('status', 0)
+        result.content_length = check.get('size', 0)
+        result.sha256 = check.get('sha256', '')
+        result.etag = check.get('etag', '')
+        result.last_modified = check.get('last_modified', '')
+        result.error_class = check.get('error_class', '')
+        result.is_unknown = check.get('unknown', False)
+        return result
 
-        # Cria um número para ordenação
-        return (major * 1000000) + (minor * 10000) + (patch * 100) + build
+    def new_versions(self, component_name: str, existing_versions: List[Dict]) -> List[Dict]:
+        """Versões do snapshot (com URL válida) que ainda não estão no provider"""
+        existing = {v['version'] for v in existing_versions}
+        fetched = self.components.get(component_name, {}).get('fetched', '?')
+        print_colored(f"  Usando snapshot ({fetched}): sem acesso à rede", "gray")
+        new_versions = []
+        for version in self.versions(component_name):
+            if version['version'] in existing or not self.urls.get(version['url'], {}).get('valid'):
+                continue
+            existing.add(version['version'])
+            new_versions.append({'version': version['version'], 'url': version['url']})
+        return new_versions
+
+def snapshot_check(result: UrlCheckResult, checksums: Dict[str, str]) -> Dict[str, Any]:
+    """Registro compacto de uma verificação de URL para o snapshot"""
+    check = {'valid': result.is_valid, 'status': result.status_code, 'checked': datetime.now().isoformat(timespec='seconds')}
+    if result.is_unknown:
+        check['unknown'] = True
+    if result.error_class:
+        check['error_class'] = result.error_class
+    if result.content_length:
+        check['size'] = result.content_length
+    sha256 = result.sha256 or checksums.get(result.url, '')
+    if sha256:
+        check['sha256'] = sha256
+    if result.etag:
+        check['etag'] = result.etag
+    if result.last_modified:
+        check['last_modified'] = result.last_modified
+    return check
+
+async def build_snapshot(component_files: List[Tuple[str, Path]], snapshot_file: Path) -> None:
+    """Busca a descoberta de todos os componentes em paralelo e grava um snapshot único do catálogo"""
+    loop = asyncio.get_event_loop()
+    names = [name for name, _ in component_files if name in DISCOVERY_ITERATORS]
+    print_colored(f"\nBuscando versões upstream de {len(names)} componentes em paralelo...", "yellow")
 
-    return sorted(versions, key=version_key)
+    def collect(name: str) -> Tuple[str, List[Dict], str]:
+        seen = set()
+        versions = []
+        try:
+            for version in DISCOVERY_ITERATORS[name]():
+                if version['version'] not in seen:
+                    seen.add(version['version'])
+                    versions.append(version)
+            error = ""
+        except Exception as e:
+            error = str(e)
+            print_colored(f"  Erro na descoberta de {name}: {e}", "red")
+        return datetime.now().isoformat(timespec='seconds'), versions, error
+
+    collected = await asyncio.gather(*[loop.run_in_executor(None, collect, name) for name in names])
+
+    components: Dict[str, Dict] = {}
+    urls_by_component: Dict[str, List[str]] = {}
+    for name, (fetched, versions, error) in zip(names, collected):
+        components[name] = {'fetched': fetched, 'versions': versions}
+        if error:
+            components[name]['error'] = error
+        urls_by_component[name] = [version['url'] for version in versions]
+        print_colored(f"  {name}: {len(versions)} versões", "gray")
+    for name, file_path in component_files:
+        if file_path.exists():
+            urls_by_component.setdefault(name, []).extend(item['url'] for item in parse_cs_versions(file_path))
+
+    # Hashes já conhecidos (manifesto de checksums) complementam os manifestos em lote
+    checksums = {entry['url']: entry['sha256']
+                 for versions in load_checksum_manifest()['components'].values()
+                 for entry in versions.values() if entry.get('url') and entry.get('sha256')}
+
+    checks: Dict[str, Dict] = {}
+    pending_urls: List[str] = []
+    for name, urls in urls_by_component.items():
+        bulk_results, remaining = await resolve_with_bulk_sources(list(dict.fromkeys(urls)), name)
+        for url, result in bulk_results.items():
+            checks[url] = snapshot_check(result, checksums)
+        pending_urls.extend(remaining)
+    pending_urls = [url for url in dict.fromkeys(pending_urls) if url not in checks]
+
+    print_colored(f"Verificando {len(pending_urls)} URLs ({len(checks)} confirmadas por manifestos em lote)...", "yellow")
+    progress_bar = create_progress_bar(len(pending_urls), "Snapshot")
+    await get_run_deadline().run(validate_urls_stream(
+        pending_urls, lambda result: checks.__setitem__(result.url, snapshot_check(result, checksums)), progress_bar=progress_bar))
+    progress_bar.close()
+    for url in pending_urls:
+        if url not in checks:
+            checks[url] = snapshot_check(deadline_result(url), checksums)
+
+    catalog = SnapshotCatalog({
+        'format': SNAPSHOT_FORMAT_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'components': components,
+        'urls': checks
+    })
+    catalog.save(snapshot_file)
+    size_kb = snapshot_file.stat().st_size / 1024
+    valid = sum(1 for check in checks.values() if check['valid'])
+    print_colored(f"Snapshot gravado em {snapshot_file} ({size_kb:.0f} KB): "
+                  f"{sum(len(c['versions']) for c in components.values())} versões, {valid}/{len(checks)} URLs válidas", "green")
+
+def diff_snapshots(old: SnapshotCatalog, new: SnapshotCatalog) -> None:
+    """Mostra versões adicionadas, removidas e alteradas entre dois snapshots"""
+    print_colored(f"\n=== Diferenças: {old.data.get('created')} → {new.data.get('created')} ===", "cyan")
+    changes = 0
+    for component_name in sorted(set(old.components) | set(new.components)):
+        old_versions = {v['version']: v for v in old.versions(component_name)}
+        new_versions = {v['version']: v for v in new.versions(component_name)}
+        lines = []
+        for version in sorted(new_versions.keys() - old_versions.keys()):
+            lines.append((f"  + {version}: {new_versions[version]['url']}", "green"))
+        for version in sorted(old_versions.keys() - new_versions.keys()):
+            lines.append((f"  - {version}: {old_versions[version]['url']}", "red"))
+        for version in sorted(old_versions.keys() & new_versions.keys()):
+            old_url, new_url = old_versions[version]['url'], new_versions[version]['url']
+            old_check, new_check = old.urls.get(old_url, {}), new.urls.get(new_url, {})
+            details = []
+            if old_url != new_url:
+                details.append(f"URL {old_url} → {new_url}")
+            for key, label in (('valid', 'válida'), ('size', 'tamanho'), ('sha256', 'sha256')):
+                if old_check.get(key) != new_check.get(key):
+                    details.append(f"{label} {old_check.get(key, '-')} → {new_check.get(key, '-')}")
+            if details:
+                lines.append((f"  ~ {version}: {'; '.join(details)}", "yellow"))
+        if lines:
+            print_colored(f"\n{component_name}:", "cyan")
+            for line, color in lines:
+                print_colored(line, color)
+            changes += len(lines)
+    if not changes:
+        print_colored("Nenhuma diferença entre os snapshots", "green")
+
+_snapshot_catalog: Optional[SnapshotCatalog] = None
+
+def set_snapshot_catalog(catalog: Optional[SnapshotCatalog]) -> None:
+    """Faz a verificação e a descoberta usarem o snapshot em vez da rede"""
+    global _snapshot_catalog
+    _snapshot_catalog = catalog
 
 async def process_component(component_name: str, file_path: Path, check_only: bool = False) -> None:
     """Processa um componente de forma assíncrona"""
@@ -2092,6 +4963,8 @@ async def process_component(component_name: str, file_path: Path, check_only: bo
         print_colored(f"Arquivo não encontrado: {file_path}", "yellow")
         return
 
+    saved_before = get_single_flight().saved
+    get_run_deadline().begin_component(component_name)
     try:
         # Lê versões do arquivo CS
         cs_content = parse_cs_versions(file_path)
@@ -2099,26 +4972,43 @@ async def process_component(component_name: str, file_path: Path, check_only: bo
         print_colored(f"Carregadas {len(cs_content)} versões existentes", "green")
 
         # Verifica URLs existentes
-        urls = [item['url'] for item in cs_content]
-        results = await test_urls_parallel_async(urls)
-
-        valid_urls = len([r for r in results if r.is_valid])
-        invalid_urls = len([r for r in results if not r.is_valid])
+        checked_versions = versions_to_check(cs_content)
+        if len(checked_versions) < len(cs_content):
+            print_colored(f"Modo rápido: verificando {len(checked_versions)} de {len(cs_content)} versões "
+                          f"({_quick_versions} mais novas por série)", "gray")
+        urls = [item['url'] for item in checked_versions]
+        results = await test_urls_parallel_async(urls, component_name)
+
+        invalid_urls_set = invalid_result_urls(results)
+        valid_urls = sum(1 for r in results.values() if r.is_valid)
+        invalid_urls = len(invalid_urls_set)
+        unknown_urls = sum(1 for r in results.values() if r.is_unknown)
+
+        # Só remove URLs que falharam em várias execuções seguidas (histórico)
+        failed_runs = {url: get_validation_history().failed_runs(url) for url in invalid_urls_set}
+        removable_urls_set = {url for url, runs in failed_runs.items() if runs >= REMOVAL_MIN_FAILED_RUNS}
 
         print_colored(f"URLs válidas: {valid_urls}", "green")
         print_colored(f"URLs inválidas: {invalid_urls}", "red")
+        if unknown_urls > 0:
+            print_colored(f"URLs com status desconhecido (host indisponível, mantidas): {unknown_urls}", "yellow")
 
         if invalid_urls > 0:
             print_colored("\nURLs inválidas encontradas:", "yellow")
-            for result in results:
-                if not result.is_valid:
+            for result in results.values():
+                if result.url in invalid_urls_set:
                     error_msg = f"  - {result.url} (Status: {result.status_code})"
                     if result.error_message:
                         error_msg += f" - Erro: {result.error_message}"
                     if result.content_error:
                         error_msg += f" - Conteúdo: {result.content_error}"
+                    error_msg += f" [falhou em {failed_runs[result.url]} execuções seguidas]"
                     print_colored(error_msg, "red")
 
+            kept = invalid_urls - len(removable_urls_set)
+            if kept > 0:
+                print_colored(f"{kept} URLs inválidas mantidas até falharem em {REMOVAL_MIN_FAILED_RUNS} execuções seguidas", "yellow")
+
         # Busca novas versões (tanto para CheckOnly quanto para atualização)
         print_colored("\nBuscando novas versões...", "yellow")
         new_versions = await get_new_versions_for_component_async(component_name, cs_content)
@@ -2133,12 +5023,13 @@ async def process_component(component_name: str, file_path: Path, check_only: bo
 
         if check_only:
             print_colored("\n[MODO VERIFICAÇÃO] - Nenhuma alteração foi salva", "magenta")
+            note_component_completed(component_name)
             return
 
-        # Remove URLs inválidas
+        # Remove URLs que falharam de forma consistente
+        invalid_urls = len(removable_urls_set)
         if invalid_urls > 0:
-            invalid_urls_list = [r.url for r in results if not r.is_valid]
-            valid_entries = [item for item in cs_content if item['url'] not in invalid_urls_list]
+            valid_entries = remove_entries(cs_content, removable_urls_set)
 
             if len(valid_entries) < len(cs_content):
                 print_colored(f"Removendo {len(cs_content) - len(valid_entries)} entradas com URLs inválidas...", "yellow")
@@ -2151,30 +5042,329 @@ async def process_component(component_name: str, file_path: Path, check_only: bo
             # Ordena em ordem crescente
             sorted_versions = sort_versions(all_versions)
 
-            # Cria backup
-            create_backup(file_path)
-
-            # Extrai informações do componente
-            comp_name, comp_id = get_cs_component_info(file_path)
-
-            # Salva arquivo atualizado
-            write_cs_versions(file_path, sorted_versions, comp_name, comp_id)
-
-            print_colored(f"Arquivo atualizado com {len(all_versions)} versões (ordem crescente)", "green")
+            # Salva arquivo atualizado (com backup), só se o conteúdo mudou
+            if update_cs_versions(file_path, sorted_versions):
+                print_colored(f"Arquivo atualizado com {len(all_versions)} versões (ordem crescente)", "green")
         else:
             if invalid_urls > 0:
                 # Mesmo sem novas versões, salva se removeu URLs inválidas
                 sorted_versions = sort_versions(cs_content)
-                create_backup(file_path)
-                
-                # Extrai informações do componente
-                comp_name, comp_id = get_cs_component_info(file_path)
-                
-                write_cs_versions(file_path, sorted_versions, comp_name, comp_id)
-                print_colored("Arquivo atualizado (removidas URLs inválidas, ordem crescente)", "green")
+                if update_cs_versions(file_path, sorted_versions):
+                    print_colored("Arquivo atualizado (removidas URLs inválidas, ordem crescente)", "green")
+
+        note_component_completed(component_name)
 
     except Exception as e:
         print_colored(f"Erro ao processar {component_name}: {e}", "red")
+    finally:
+        get_run_deadline().end_component()
+        saved = get_single_flight().saved - saved_before
+        if saved > 0:
+            print_colored(f"Requisições duplicadas evitadas (coalescência): {saved}", "gray")
+
+async def prevalidate_components(component_files: List[Tuple[str, Path]]) -> None:
+    """Verifica de uma vez as URLs de vários componentes, com fila justa entre hosts
+
+    Os resultados definitivos ficam na memória de requisições da execução
+    (single-flight), e o processamento de cada componente os reaproveita em
+    vez de esperar, componente a componente, atrás dos hosts mais lentos. As
+    falhas seguem direto para a confirmação do componente, sem repetir o HEAD.
+    """
+    if _snapshot_catalog:
+        return
+
+    _prevalidation_failures.clear()
+    pending_urls: List[str] = []
+    for component_name, file_path in component_files:
+        if not file_path.exists():
+            continue
+        urls = list(dict.fromkeys(item['url'] for item in versions_to_check(parse_cs_versions(file_path))))
+        if _run_journal:
+            urls = [url for url in urls if url not in _run_journal.results]
+        _, remaining = await resolve_with_bulk_sources(urls, component_name)
+        pending_urls.extend(remaining)
+
+    pending_urls = list(dict.fromkeys(pending_urls))
+    if not pending_urls:
+        return
+
+    hosts = len({host_of(url) for url in pending_urls})
+    print_colored(f"\nPré-verificando {len(pending_urls)} URLs de {len(component_files)} componentes em {hosts} hosts (fila justa por host)...", "yellow")
+    progress_bar = create_progress_bar(len(pending_urls), "Pré-verificação")
+    # Com prazo definido, a pré-verificação usa no máximo metade do tempo restante
+    deadline = get_run_deadline()
+    remaining = deadline.remaining()
+    # Só as válidas vão para o diário: as falhas são confirmadas no processamento do componente
+    def on_result(result: UrlCheckResult) -> None:
+        if not result.is_valid and not result.is_unknown:
+            _prevalidation_failures[result.url] = result
+        elif _run_journal:
+            _run_journal.record_result(result)
+
+    completed, stats = await deadline.run(validate_urls_stream(pending_urls, on_result, progress_bar=progress_bar),
+                                          limit=remaining / 2 if remaining is not None else None)
+    progress_bar.close()
+    if completed:
+        print_colored(f"Pré-verificação concluída: {stats['valid']} válidas, {stats['invalid']} com falha", "gray")
+
+def run_journal_mode(check_only: bool) -> str:
+    """Modo gravado no diário: só uma execução do mesmo modo (mesmo K no --quick, mesmo snapshot) o retoma"""
+    mode = f"quick-{_quick_versions}" if _quick_versions else "check-only" if check_only else "update-all"
+    if _snapshot_catalog:
+        mode += f"@snapshot-{_snapshot_catalog.data.get('created')}"
+    return mode
+
+def resume_conflict(args: argparse.Namespace) -> str:
+    """Motivo pelo qual --resume não se aplica aos argumentos ("" quando se aplica)"""
+    if args.component:
+        return "--resume não se aplica a --component: o diário cobre apenas varreduras de todos os componentes"
+    if not (args.update_all or args.check_only):
+        return "--resume exige --update-all, --check-only ou --quick"
+    return ""
+
+def open_run_journal(mode: str, resume: bool) -> None:
+    """Abre o diário da varredura (retomando a execução interrompida com --resume)"""
+    journal = RunJournal(RUN_JOURNAL_FILE)
+    journal.open(mode, resume)
+    set_run_journal(journal)
+
+async def process_components(cs_files: List[Path], check_only: bool) -> None:
+    """Pré-verifica e processa todos os componentes, parando quando o prazo da execução acaba"""
+    deadline = get_run_deadline()
+    component_files = get_component_files(cs_files)
+    if _run_journal:
+        component_files = [(name, file) for name, file in component_files if name not in _run_journal.completed]
+    await prevalidate_components(component_files)
+    for file in cs_files:
+        component_name = file.stem.replace("VersionProvider", "").lower()
+        if _run_journal and component_name in _run_journal.completed:
+            print_colored(f"\n=== {component_name}: já concluído na execução interrompida ===", "gray")
+            continue
+        if deadline.run_expired():
+            deadline.skipped.append(component_name)
+            continue
+        await process_component(component_name, file, check_only)
+
+class CatalogService:
+    """Serviço HTTP local com os providers e os últimos resultados de verificação e descoberta
+
+    Um único processo consulta os upstreams em intervalos (reaproveitando a
+    verificação e a descoberta do script) e as estações de trabalho consultam
+    este serviço. As respostas levam ETag; If-None-Match devolve 304 sem corpo.
+    """
+    def __init__(self, component_files: List[Tuple[str, Path]], refresh_minutes: float):
+        self.component_files = dict(component_files)
+        self.refresh_seconds = max(1.0, refresh_minutes * 60)
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.last_refresh = ""
+        self.refreshing = False
+        self.validation: Dict[str, Dict] = {}
+        self.discovery: Dict[str, Dict] = {}
+        self._providers: Dict[str, Tuple[float, List[Dict]]] = {}
+
+    def provider_versions(self, component_name: str) -> List[Dict]:
+        """Versões do provider, relidas só quando o arquivo muda"""
+        file_path = self.component_files[component_name]
+        mtime = file_path.stat().st_mtime if file_path.exists() else 0.0
+        cached = self._providers.get(component_name)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, parse_cs_versions(file_path) if mtime else [])
+            self._providers[component_name] = cached
+        return cached[1]
+
+    def _json(self, request: web.Request, payload: Any, status: int = 200) -> web.Response:
+        body = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        headers = {'ETag': etag, 'Cache-Control': f"max-age={SERVE_MAX_AGE_SECONDS}"}
+        if status == 200 and etag in request.headers.get('If-None-Match', ''):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, status=status, content_type='application/json', headers=headers)
+
+    def _component(self, request: web.Request) -> Optional[str]:
+        component_name = request.match_info['component'].lower()
+        return component_name if component_name in self.component_files else None
+
+    async def handle_index(self, request: web.Request) -> web.Response:
+        return self._json(request, {
+            'components': sorted(self.component_files),
+            'endpoints': ['/status', '/providers', '/providers/{component}', '/validation/{component}', '/discovery/{component}']
+        })
+
+    async def handle_status(self, request: web.Request) -> web.Response:
+        return self._json(request, {
+            'started': self.started,
+            'last_refresh': self.last_refresh,
+            'refreshing': self.refreshing,
+            'refresh_minutes': self.refresh_seconds / 60,
+            'components': {name: {'validated': self.validation.get(name, {}).get('checked', ''),
+                                  'discovered': self.discovery.get(name, {}).get('checked', '')}
+                           for name in sorted(self.component_files)}
+        })
+
+    async def handle_providers(self, request: web.Request) -> web.Response:
+        return self._json(request, {name: {'file': file_path.name, 'versions': len(self.provider_versions(name))}
+                                    for name, file_path in sorted(self.component_files.items())})
+
+    async def handle_provider(self, request: web.Request) -> web.Response:
+        component_name = self._component(request)
+        if not component_name:
+            return self._json(request, {'error': f"Componente '{request.match_info['component']}' não encontrado"}, 404)
+        return self._json(request, {'component': component_name, 'versions': self.provider_versions(component_name)})
+
+    async def handle_validation(self, request: web.Request) -> web.Response:
+        component_name = self._component(request)
+        if not component_name:
+            return self._json(request, {'error': f"Componente '{request.match_info['component']}' não encontrado"}, 404)
+        return self._json(request, {'component': component_name, **self.validation.get(component_name, {'checked': '', 'results': []})})
+
+    async def handle_discovery(self, request: web.Request) -> web.Response:
+        component_name = self._component(request)
+        if not component_name:
+            return self._json(request, {'error': f"Componente '{request.match_info['component']}' não encontrado"}, 404)
+        return self._json(request, {'component': component_name, **self.discovery.get(component_name, {'checked': '', 'new_versions': []})})
+
+    async def refresh(self) -> None:
+        """Verifica os providers e busca novas versões de todos os componentes"""
+        self.refreshing = True
+        get_single_flight().reset()
+        get_run_deadline().restart()
+        try:
+            await prevalidate_components(list(self.component_files.items()))
+            for component_name in sorted(self.component_files):
+                print_colored(f"\n=== Atualizando catálogo: {component_name} ===", "cyan")
+                try:
+                    cs_content = self.provider_versions(component_name)
+                    results = await test_urls_parallel_async([item['url'] for item in cs_content], component_name)
+                    self.validation[component_name] = {
+                        'checked': datetime.now().isoformat(timespec='seconds'),
+                        'valid': sum(1 for r in results.values() if r.is_valid),
+                        'invalid': sum(1 for r in results.values() if not r.is_valid and not r.is_unknown),
+                        'unknown': sum(1 for r in results.values() if r.is_unknown),
+                        'results': [result.to_dict() for result in results.values()]
+                    }
+                    new_versions = await get_new_versions_for_component_async(component_name, cs_content)
+                    self.discovery[component_name] = {
+                        'checked': datetime.now().isoformat(timespec='seconds'),
+                        'new_versions': new_versions
+                    }
+                except Exception as e:
+                    print_colored(f"Erro ao atualizar {component_name}: {e}", "red")
+        finally:
+            self.refreshing = False
+            self.last_refresh = datetime.now().isoformat(timespec='seconds')
+            get_validation_history().flush()
+
+    async def refresher(self) -> None:
+        while True:
+            await self.refresh()
+            print_colored(f"\nCatálogo atualizado; próxima atualização em {self.refresh_seconds / 60:.0f} min", "gray")
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def serve(self, host: str, port: int) -> None:
+        """Atende as requisições até o Ctrl+C, atualizando o catálogo em segundo plano"""
+        app = web.Application()
+        app.router.add_get('/', self.handle_index)
+        app.router.add_get('/status', self.handle_status)
+        app.router.add_get('/providers', self.handle_providers)
+        app.router.add_get('/providers/{component}', self.handle_provider)
+        app.router.add_get('/validation/{component}', self.handle_validation)
+        app.router.add_get('/discovery/{component}', self.handle_discovery)
+
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        print_colored(f"Serviço de catálogo em http://{host}:{port}/ (Ctrl+C para encerrar)", "green")
+
+        refresher = asyncio.ensure_future(self.refresher())
+        try:
+            await get_run_deadline().wait_interrupted()
+        finally:
+            refresher.cancel()
+            await asyncio.gather(refresher, return_exceptions=True)
+            await runner.cleanup()
+
+class ComponentScheduler:
+    """Modo daemon: verifica cada componente no seu próprio intervalo, em um único processo
+
+    O event loop, a sessão HTTP, o controle por host e os caches em memória
+    (redirecionamentos, listagens, histórico) sobrevivem entre os ciclos, então
+    cada ciclo sai bem mais barato do que iniciar o script a frio pelo cron.
+    """
+    def __init__(self, component_files: List[Tuple[str, Path]], intervals: Dict[str, float]):
+        self.component_files = dict(component_files)
+        self.intervals = {name: intervals.get(name, DAEMON_INTERVAL_MINUTES.get(name, DAEMON_DEFAULT_INTERVAL_MINUTES)) * 60
+                          for name in self.component_files}
+        self.next_run = {name: 0.0 for name in self.component_files}
+
+    def due(self) -> List[str]:
+        now = time.monotonic()
+        return sorted((name for name, when in self.next_run.items() if when <= now), key=lambda name: self.next_run[name])
+
+    def seconds_until_next(self) -> Tuple[str, float]:
+        name = min(self.next_run, key=self.next_run.get)
+        return name, max(0.0, self.next_run[name] - time.monotonic())
+
+    async def run(self, check_only: bool) -> None:
+        """Executa os ciclos até o Ctrl+C"""
+        deadline = get_run_deadline()
+        session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0, ttl_dns_cache=300, keepalive_timeout=60))
+        set_shared_session(session)
+        for name in sorted(self.component_files):
+            print_colored(f"  {name}: a cada {self.intervals[name] / 60:.0f} min", "gray")
+        try:
+            while not deadline.interrupted:
+                deadline.restart()
+                for component_name in self.due():
+                    if deadline.interrupted:
+                        break
+                    # Cada ciclo é uma nova execução: resultados memorizados não valem mais
+                    get_single_flight().reset()
+                    get_validation_history().new_run()
+                    await process_component(component_name, self.component_files[component_name], check_only)
+                    self.next_run[component_name] = time.monotonic() + self.intervals[component_name]
+                    get_redirect_cache().save()
+                    get_validation_history().flush()
+
+                if deadline.interrupted:
+                    break
+                next_name, wait = self.seconds_until_next()
+                next_time = (datetime.now() + timedelta(seconds=wait)).strftime('%H:%M:%S')
+                print_colored(f"\nPróxima verificação: {next_name} às {next_time}", "gray")
+                try:
+                    await asyncio.wait_for(deadline.wait_interrupted(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            set_shared_session(None)
+            await session.close()
+
+def parse_daemon_intervals(values: List[str]) -> Dict[str, float]:
+    """Converte argumentos COMPONENTE=MINUTOS em intervalos do daemon"""
+    intervals = {}
+    for value in values:
+        name, _, minutes = value.partition('=')
+        try:
+            interval = float(minutes)
+        except ValueError:
+            interval = 0.0
+        # Intervalo zero, negativo ou infinito faria o daemon consultar o upstream sem parar (ou nunca)
+        if not name.strip() or not 0 < interval < float('inf'):
+            raise ValueError(f"Intervalo inválido: '{value}' (use COMPONENTE=MINUTOS, com MINUTOS > 0)")
+        intervals[name.strip().lower()] = interval
+    return intervals
+
+def get_component_files(cs_files: List[Path], component: Optional[str] = None) -> List[Tuple[str, Path]]:
+    """Lista (componente, arquivo) dos providers, opcionalmente filtrando por componente"""
+    component_files = [(file.stem.replace("VersionProvider", "").lower(), file) for file in cs_files]
+    if component:
+        component_files = [(name, file) for name, file in component_files if name == component.lower()]
+    return component_files
+
+def get_bandwidth_limit(args, network_profile: NetworkProfile) -> float:
+    """Limite de banda em MB/s (argumento de linha de comando ou perfil de rede)"""
+    if args.bandwidth_limit is not None:
+        return args.bandwidth_limit
+    return float(network_profile.values['bandwidth_limit_mbps'])
 
 async def main():
     """Função principal assíncrona"""
@@ -2192,6 +5382,22 @@ Exemplos:
   python update_versions.py --clear-backups
   python update_versions.py --component php --clear-backups
   python update_versions.py --show-backups
+  python update_versions.py --reconcile-backups
+  python update_versions.py --update-all --network-profile polite
+  python update_versions.py --verify-checksums --bandwidth-limit 20
+  python update_versions.py --mirror D:\\mirror --component php --mirror-filter "^8\\."
+  python update_versions.py --check-only --results-file resultados.jsonl
+  python update_versions.py --check-only --hedge
+  python update_versions.py --component python --speculative
+  python update_versions.py --show-history
+  python update_versions.py --check-only --deadline 600 --component-deadline 120
+  python update_versions.py --update-all --resume
+  python update_versions.py --snapshot catalogo.json.gz
+  python update_versions.py --check-only --from-snapshot catalogo.json.gz
+  python update_versions.py --diff-snapshots antigo.json.gz novo.json.gz
+  python update_versions.py --serve --serve-port 8780 --refresh-interval 60
+  python update_versions.py --daemon --interval node=60 --interval phpmyadmin=1440
+  python update_versions.py --quick 2
         """
     )
 
@@ -2199,159 +5405,337 @@ Exemplos:
     parser.add_argument('--check-only', action='store_true', help='Apenas verifica URLs existentes sem atualizar')
     parser.add_argument('--update-all', action='store_true', help='Atualiza todos os componentes automaticamente')
     parser.add_argument('--clear-cache', action='store_true', help='Limpa o cache de versões falhadas')
+    parser.add_argument('--retry-transient', action='store_true', help='Libera falhas transitórias (5xx, timeout, bloqueio) do cache para nova verificação')
     parser.add_argument('--clear-backups', action='store_true', help='Limpa backups antigos (mais de 30 dias)')
     parser.add_argument('--show-backups', action='store_true', help='Mostra informações dos backups')
+    parser.add_argument('--reconcile-backups', action='store_true', help='Reconcilia o catálogo de backups com a pasta de backups')
+    parser.add_argument('--network-profile', metavar='NOME', help='Perfil de rede de network_profiles.json (ex: default, ci, polite, aggressive)')
+    parser.add_argument('--verify-checksums', action='store_true', help='Calcula SHA-256 e tamanho dos artefatos e atualiza checksums.json')
+    parser.add_argument('--bandwidth-limit', type=float, metavar='MBPS', help='Limite total de banda dos downloads em MB/s (0 = sem limite)')
+    parser.add_argument('--mirror', metavar='DIR', help='Baixa os artefatos para um espelho local endereçado por conteúdo')
+    parser.add_argument('--mirror-filter', metavar='REGEX', help='Espelha apenas as versões que casam com a expressão regular')
+    parser.add_argument('--results-file', metavar='ARQUIVO', help='Grava todos os resultados de verificação em JSON Lines')
+    parser.add_argument('--hedge', action='store_true', help='Duplica requisições que passam do p95 de latência do host (limitado por hedge_max_rate)')
+    parser.add_argument('--speculative', action='store_true', help='Descobre novas versões sondando modelos de URL em vez da API do GitHub (python, go, mongodb, mysql)')
+    parser.add_argument('--show-history', action='store_true', help='Mostra URLs instáveis e latência por host do histórico de validações')
+    parser.add_argument('--deadline', type=float, metavar='SEGUNDOS', help='Tempo máximo da execução; o que não terminar fica como desconhecido')
+    parser.add_argument('--component-deadline', type=float, metavar='SEGUNDOS', help='Tempo máximo de cada componente')
+    parser.add_argument('--resume', action='store_true', help='Retoma a varredura (--update-all/--check-only/--quick) interrompida do mesmo modo, reaproveitando o que já foi verificado')
+    parser.add_argument('--snapshot', nargs='?', const=str(SNAPSHOT_FILE), metavar='ARQUIVO', help='Grava um snapshot compactado com as versões upstream e verificações de todos os componentes')
+    parser.add_argument('--from-snapshot', metavar='ARQUIVO', help='Verifica usando um snapshot, sem acesso à rede (implica --check-only)')
+    parser.add_argument('--diff-snapshots', nargs=2, metavar=('ANTIGO', 'NOVO'), help='Mostra as diferenças entre dois snapshots')
+    parser.add_argument('--serve', action='store_true', help='Serviço HTTP local com providers, verificações e novas versões em JSON')
+    parser.add_argument('--serve-host', default=SERVE_DEFAULT_HOST, metavar='HOST', help=f'Endereço do serviço (padrão: {SERVE_DEFAULT_HOST})')
+    parser.add_argument('--serve-port', type=int, default=SERVE_DEFAULT_PORT, metavar='PORTA', help=f'Porta do serviço (padrão: {SERVE_DEFAULT_PORT})')
+    parser.add_argument('--quick', type=int, metavar='K', help=f'Verificação rápida (CI): só as K versões mais novas de cada série, com descoberta limitada e prazo de {QUICK_DEADLINE_SECONDS}s')
+    parser.add_argument('--daemon', action='store_true', help='Processo contínuo: verifica e atualiza cada componente no seu intervalo')
+    parser.add_argument('--interval', action='append', default=[], metavar='COMPONENTE=MINUTOS', help='Intervalo do daemon para um componente (pode repetir)')
+    parser.add_argument('--refresh-interval', type=float, default=SERVE_REFRESH_MINUTES, metavar='MINUTOS', help=f'Intervalo de atualização do serviço (padrão: {SERVE_REFRESH_MINUTES})')
 
     args = parser.parse_args()
 
     print_colored("=== DevStack Version Manager ===", "cyan")
     print_colored(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", "gray")
 
-    # Verifica se a pasta existe
-    if not AVAILABLE_VERSIONS_PATH.exists():
-        print_colored(f"Pasta não encontrada: {AVAILABLE_VERSIONS_PATH}", "red")
+    if args.quick is not None and args.quick < 1:
+        print_colored("--quick exige K >= 1", "red")
         return
+    if args.quick:
+        # Verificação rápida: apenas relatório, de todos os componentes (ou do escolhido), com prazo fixo
+        set_quick_mode(args.quick)
+        args.check_only = True
+        if not args.network_profile:
+            args.network_profile = QUICK_NETWORK_PROFILE
+        if not args.deadline:
+            args.deadline = QUICK_DEADLINE_SECONDS
 
-    # Obtém lista de componentes (arquivos CS)
-    cs_files = list(AVAILABLE_VERSIONS_PATH.glob("*VersionProvider.cs"))
-    cs_files = [f for f in cs_files if f.name not in ["IVersionProvider.cs", "VersionRegistry.cs"]]
-
-    if not cs_files:
-        print_colored(f"Nenhum arquivo CS de provider encontrado em: {AVAILABLE_VERSIONS_PATH}", "yellow")
+    try:
+        network_profile = apply_network_profile(args.network_profile or "")
+    except ValueError as e:
+        print_colored(str(e), "red")
         return
-
-    print_colored("Componentes disponíveis:", "gray")
-    for file in cs_files:
-        # Extrai o nome do componente (ex: PhpVersionProvider -> php)
-        component_name = file.stem.replace("VersionProvider", "").lower()
-        print_colored(f"  - {component_name}", "gray")
-
-    # Processa argumentos
-    if args.clear_cache:
-        # Limpeza de cache
-        if args.component:
-            # Cache de componente específico
-            cache_file = CACHE_PATH / f"{args.component}-failed.json"
-            if cache_file.exists():
-                cache_file.unlink()
-                print_colored(f"Cache de '{args.component}' removido com sucesso", "green")
-            else:
-                print_colored(f"Cache de '{args.component}' não encontrado", "yellow")
-        else:
-            # Todo o cache
-            if CACHE_PATH.exists():
-                cache_files = list(CACHE_PATH.glob("*-failed.json"))
-                if cache_files:
-                    for file in cache_files:
-                        file.unlink()
-                    print_colored(f"Todo o cache foi removido ({len(cache_files)} arquivos)", "green")
-                else:
-                    print_colored("Nenhum cache encontrado para remover", "gray")
-            else:
-                print_colored("Pasta de cache não existe", "gray")
+    if args.hedge:
+        network_profile.values['hedge'] = True
+    set_speculative_discovery(args.speculative)
+    print_colored(f"Perfil de rede: {network_profile.name} (máx. {network_profile.max_workers} requisições simultâneas)", "gray")
+    if args.quick:
+        print_colored(f"Modo rápido: {args.quick} versões mais novas por série, prazo de {args.deadline:.0f}s", "gray")
+
+    run_deadline = RunDeadline(args.deadline or 0, args.component_deadline or 0)
+    set_run_deadline(run_deadline)
+    if args.deadline or args.component_deadline:
+        print_colored(f"Prazo: {args.deadline or '-'}s por execução, {args.component_deadline or '-'}s por componente", "gray")
+    if args.component or args.update_all or args.check_only or args.serve or args.daemon:
+        # Ctrl+C cancela as verificações pendentes e ainda grava caches e relatório
+        run_deadline.install_signal_handler()
+
+    if args.from_snapshot:
+        try:
+            catalog = SnapshotCatalog.load(Path(args.from_snapshot))
+        except ValueError as e:
+            print_colored(str(e), "red")
+            return
+        set_snapshot_catalog(catalog)
+        # Um snapshot é uma fotografia: serve para verificar e relatar, não para alterar providers
+        args.check_only = True
+        print_colored(f"Usando snapshot de {catalog.data.get('created')} ({args.from_snapshot}): sem acesso à rede", "gray")
+
+    conflict = resume_conflict(args) if args.resume else ""
+    if conflict:
+        print_colored(conflict, "red")
         return
 
-    elif args.clear_backups:
-        # Limpeza de backups
-        clear_old_backups_manual(args.component, 30)
-        return
+    if args.results_file:
+        set_results_sink(JsonlResultSink(Path(args.results_file)))
+        print_colored(f"Resultados de verificação serão gravados em: {args.results_file}", "gray")
 
-    elif args.show_backups:
-        # Mostrar backups
-        show_backup_info(args.component)
-        return
+    try:
+        # Verifica se a pasta existe
+        if not AVAILABLE_VERSIONS_PATH.exists():
+            print_colored(f"Pasta não encontrada: {AVAILABLE_VERSIONS_PATH}", "red")
+            return
 
-    elif args.component:
-        # Componente específico
-        file = next((f for f in cs_files if f.stem.replace("VersionProvider", "").lower() == args.component.lower()), None)
-        if file:
-            component_name = file.stem.replace("VersionProvider", "").lower()
-            await process_component(component_name, file, args.check_only)
-        else:
-            print_colored(f"Componente '{args.component}' não encontrado", "yellow")
+        # Obtém lista de componentes (arquivos CS)
+        cs_files = list(AVAILABLE_VERSIONS_PATH.glob("*VersionProvider.cs"))
+        cs_files = [f for f in cs_files if f.name not in ["IVersionProvider.cs", "VersionRegistry.cs"]]
 
-    elif args.update_all:
-        # Todos os componentes automaticamente
-        for file in cs_files:
-            component_name = file.stem.replace("VersionProvider", "").lower()
-            await process_component(component_name, file, args.check_only)
+        if not cs_files:
+            print_colored(f"Nenhum arquivo CS de provider encontrado em: {AVAILABLE_VERSIONS_PATH}", "yellow")
+            return
 
-    elif args.check_only:
-        # Apenas verificação de todos os componentes
+        print_colored("Componentes disponíveis:", "gray")
         for file in cs_files:
+            # Extrai o nome do componente (ex: PhpVersionProvider -> php)
             component_name = file.stem.replace("VersionProvider", "").lower()
-            await process_component(component_name, file, True)
+            print_colored(f"  - {component_name}", "gray")
+
+        # Processa argumentos
+        if args.clear_cache:
+            # Limpeza de cache
+            if args.component:
+                # Cache de componente específico
+                cache_file = CACHE_PATH / f"{args.component}-failed.json"
+                if cache_file.exists():
+                    cache_file.unlink()
+                    print_colored(f"Cache de '{args.component}' removido com sucesso", "green")
+                else:
+                    print_colored(f"Cache de '{args.component}' não encontrado", "yellow")
+            else:
+                # Todo o cache
+                if CACHE_PATH.exists():
+                    cache_files = list(CACHE_PATH.glob("*-failed.json"))
+                    if cache_files:
+                        for file in cache_files:
+                            file.unlink()
+                        print_colored(f"Todo o cache foi removido ({len(cache_files)} arquivos)", "green")
+                    else:
+                        print_colored("Nenhum cache encontrado para remover", "gray")
+                else:
+                    print_colored("Pasta de cache não existe", "gray")
+            return
 
-    else:
-        # Menu interativo
-        while True:
-            print_colored("\n=== Menu Principal ===", "cyan")
-            print_colored("1. Verificar todos os componentes (apenas verificação)")
-            print_colored("2. Verificar um componente específico (apenas verificação)")
-            print_colored("3. Atualizar um componente específico")
-            print_colored("4. Atualizar todos os componentes")
-            print_colored("5. Gerenciar cache e backups")
-            print_colored("6. Sair")
+        elif args.retry_transient:
+            # Falhas transitórias voltam a ser verificadas
+            retry_transient_failures(args.component or "")
+            return
+
+        elif args.clear_backups:
+            # Limpeza de backups
+            clear_old_backups_manual(args.component, 30)
+            return
+
+        elif args.show_backups:
+            # Mostrar backups
+            show_backup_info(args.component)
+            return
+
+        elif args.show_history:
+            # Histórico de validações
+            show_validation_history((args.component or "").lower())
+            return
+
+        elif args.reconcile_backups:
+            # Reconciliação do catálogo de backups
+            get_backup_catalog().reconcile()
+            return
+
+        elif args.diff_snapshots:
+            # Diferenças entre snapshots do catálogo
+            try:
+                old, new = (SnapshotCatalog.load(Path(path)) for path in args.diff_snapshots)
+            except ValueError as e:
+                print_colored(str(e), "red")
+                return
+            diff_snapshots(old, new)
+            return
 
+        elif args.daemon:
+            # Verificação contínua por componente
+            component_files = get_component_files(cs_files, args.component)
+            if not component_files:
+                print_colored(f"Componente '{args.component}' não encontrado", "yellow")
+                return
             try:
-                choice = input("\nEscolha uma opção (1-6): ").strip()
-            except KeyboardInterrupt:
-                print_colored("\nSaindo...", "green")
+                intervals = parse_daemon_intervals(args.interval)
+            except ValueError as e:
+                print_colored(str(e), "red")
                 return
+            print_colored(f"\nModo daemon com {len(component_files)} componentes (Ctrl+C para encerrar):", "cyan")
+            await ComponentScheduler(component_files, intervals).run(args.check_only)
+            # Ctrl+C é o encerramento normal do daemon, não uma execução parcial
+            if _validation_history:
+                _validation_history.close()
+            print_colored("\nDaemon encerrado", "green")
+            return
 
-            if choice == "1":
-                for file in cs_files:
-                    component_name = file.stem.replace("VersionProvider", "").lower()
-                    await process_component(component_name, file, True)
-            elif choice == "2":
-                print_colored("\nComponentes disponíveis:")
-                for i, file in enumerate(cs_files):
-                    component_name = file.stem.replace("VersionProvider", "").lower()
-                    print_colored(f"{i + 1}. {component_name}")
+        elif args.serve:
+            # Serviço local de catálogo
+            component_files = get_component_files(cs_files, args.component)
+            if not component_files:
+                print_colored(f"Componente '{args.component}' não encontrado", "yellow")
+                return
+            try:
+                await CatalogService(component_files, args.refresh_interval).serve(args.serve_host, args.serve_port)
+            except OSError as e:
+                print_colored(f"Não foi possível iniciar o serviço em {args.serve_host}:{args.serve_port}: {e}", "red")
+            # Ctrl+C é o encerramento normal do serviço, não uma execução parcial
+            if _validation_history:
+                _validation_history.close()
+            print_colored("\nServiço encerrado", "green")
+            return
 
-                try:
-                    component_choice = int(input(f"\nEscolha o componente (1-{len(cs_files)}): ")) - 1
-                except ValueError:
-                    print_colored("Escolha inválida", "red")
-                    continue
+        elif args.snapshot:
+            # Snapshot consolidado do catálogo upstream
+            component_files = get_component_files(cs_files, args.component)
+            if not component_files:
+                print_colored(f"Componente '{args.component}' não encontrado", "yellow")
+                return
+            await build_snapshot(component_files, Path(args.snapshot))
 
-                if 0 <= component_choice < len(cs_files):
-                    selected_file = cs_files[component_choice]
-                    component_name = selected_file.stem.replace("VersionProvider", "").lower()
-                    await process_component(component_name, selected_file, True)
-                else:
-                    print_colored("Escolha inválida", "red")
-            elif choice == "3":
-                print_colored("\nComponentes disponíveis:")
-                for i, file in enumerate(cs_files):
-                    component_name = file.stem.replace("VersionProvider", "").lower()
-                    print_colored(f"{i + 1}. {component_name}")
+        elif args.verify_checksums:
+            # Manifesto de integridade dos artefatos
+            component_files = get_component_files(cs_files, args.component)
+            if not component_files:
+                print_colored(f"Componente '{args.component}' não encontrado", "yellow")
+                return
+            await verify_checksums(component_files, get_bandwidth_limit(args, network_profile))
+
+        elif args.mirror:
+            # Espelho local de artefatos
+            component_files = get_component_files(cs_files, args.component)
+            if not component_files:
+                print_colored(f"Componente '{args.component}' não encontrado", "yellow")
+                return
+            try:
+                await mirror_artifacts(component_files, Path(args.mirror), args.mirror_filter or "", get_bandwidth_limit(args, network_profile))
+            except re.error as e:
+                print_colored(f"Filtro de versões inválido: {e}", "red")
+                return
+
+        elif args.component:
+            # Componente específico
+            file = next((f for f in cs_files if f.stem.replace("VersionProvider", "").lower() == args.component.lower()), None)
+            if file:
+                component_name = file.stem.replace("VersionProvider", "").lower()
+                await process_component(component_name, file, args.check_only)
+            else:
+                print_colored(f"Componente '{args.component}' não encontrado", "yellow")
+
+        elif args.update_all:
+            # Todos os componentes automaticamente
+            open_run_journal(run_journal_mode(args.check_only), args.resume)
+            await process_components(cs_files, args.check_only)
+
+        elif args.check_only:
+            # Apenas verificação de todos os componentes
+            open_run_journal(run_journal_mode(True), args.resume)
+            await process_components(cs_files, True)
+
+        else:
+            # Menu interativo
+            while True:
+                print_colored("\n=== Menu Principal ===", "cyan")
+                print_colored("1. Verificar todos os componentes (apenas verificação)")
+                print_colored("2. Verificar um componente específico (apenas verificação)")
+                print_colored("3. Atualizar um componente específico")
+                print_colored("4. Atualizar todos os componentes")
+                print_colored("5. Gerenciar cache e backups")
+                print_colored("6. Sair")
 
                 try:
-                    component_choice = int(input(f"\nEscolha o componente (1-{len(cs_files)}): ")) - 1
-                except ValueError:
-                    print_colored("Escolha inválida", "red")
-                    continue
+                    choice = input("\nEscolha uma opção (1-6): ").strip()
+                except KeyboardInterrupt:
+                    print_colored("\nSaindo...", "green")
+                    return
+
+                if choice == "1":
+                    await process_components(cs_files, True)
+                elif choice == "2":
+                    print_colored("\nComponentes disponíveis:")
+                    for i, file in enumerate(cs_files):
+                        component_name = file.stem.replace("VersionProvider", "").lower()
+                        print_colored(f"{i + 1}. {component_name}")
 
-                if 0 <= component_choice < len(cs_files):
-                    selected_file = cs_files[component_choice]
-                    component_name = selected_file.stem.replace("VersionProvider", "").lower()
-                    await process_component(component_name, selected_file, False)
-                else:
-                    print_colored("Escolha inválida", "red")
-            elif choice == "4":
-                confirm = input("\nTem certeza que deseja atualizar TODOS os componentes? (s/N): ").strip().lower()
-                if confirm == "s":
-                    for file in cs_files:
+                    try:
+                        component_choice = int(input(f"\nEscolha o componente (1-{len(cs_files)}): ")) - 1
+                    except ValueError:
+                        print_colored("Escolha inválida", "red")
+                        continue
+
+                    if 0 <= component_choice < len(cs_files):
+                        selected_file = cs_files[component_choice]
+                        component_name = selected_file.stem.replace("VersionProvider", "").lower()
+                        await process_component(component_name, selected_file, True)
+                    else:
+                        print_colored("Escolha inválida", "red")
+                elif choice == "3":
+                    print_colored("\nComponentes disponíveis:")
+                    for i, file in enumerate(cs_files):
                         component_name = file.stem.replace("VersionProvider", "").lower()
-                        await process_component(component_name, file, False)
-            elif choice == "5":
-                show_cache_management_menu()
-            elif choice == "6":
-                print_colored("Saindo...", "green")
-                return
-            else:
-                print_colored("Opção inválida", "yellow")
+                        print_colored(f"{i + 1}. {component_name}")
+
+                    try:
+                        component_choice = int(input(f"\nEscolha o componente (1-{len(cs_files)}): ")) - 1
+                    except ValueError:
+                        print_colored("Escolha inválida", "red")
+                        continue
+
+                    if 0 <= component_choice < len(cs_files):
+                        selected_file = cs_files[component_choice]
+                        component_name = selected_file.stem.replace("VersionProvider", "").lower()
+                        await process_component(component_name, selected_file, False)
+                    else:
+                        print_colored("Escolha inválida", "red")
+                elif choice == "4":
+                    confirm = input("\nTem certeza que deseja atualizar TODOS os componentes? (s/N): ").strip().lower()
+                    if confirm == "s":
+                        await process_components(cs_files, False)
+                elif choice == "5":
+                    show_cache_management_menu()
+                elif choice == "6":
+                    print_colored("Saindo...", "green")
+                    return
+                else:
+                    print_colored("Opção inválida", "yellow")
+    finally:
+        # Fecha o arquivo de resultados também nas saídas antecipadas (menu, --serve, --daemon)
+        if _results_sink:
+            _results_sink.close()
+
+    if _results_sink:
+        print_colored(f"{_results_sink.count} resultados gravados em {_results_sink.path}", "gray")
+    if _validation_history:
+        _validation_history.close()
+    run_deadline.report()
+    if _run_journal:
+        partial = run_deadline.interrupted or bool(run_deadline.exceeded or run_deadline.skipped)
+        _run_journal.close(finished=not partial)
+        if partial:
+            print_colored("Progresso salvo: use --resume para continuar de onde parou", "yellow")
+
+    single_flight = get_single_flight()
+    if single_flight.saved > 0:
+        print_colored(f"Requisições duplicadas evitadas na execução: {single_flight.saved} de {single_flight.requests}", "gray")
 
     print_colored("\n=== Processamento concluído ===", "green")
 